@@ -0,0 +1,63 @@
+""" Measures per-call latency of small reads with a fresh CloudInterface per call
+    (new session/client for every request, the old behaviour) and with one persistent CloudInterface
+
+    Usage:
+        python benchmarks/client_pool.py s3://bucket-name/benchmark --count 10000
+"""
+import argparse
+import os
+import time
+
+from cloudstorageio import CloudInterface
+
+
+def prepare_files(ci: CloudInterface, folder_path: str, count: int, size: int) -> list:
+    """Writes `count` small files into given folder if they do not exist yet"""
+    content = os.urandom(size)
+    file_paths = [os.path.join(folder_path, f'small_{idx}.bin') for idx in range(count)]
+    existing = set()
+    if ci.isdir(folder_path):
+        existing = set(ci.listdir(folder_path))
+    for file_path in file_paths:
+        if os.path.basename(file_path) not in existing:
+            ci.save(file_path, content)
+    return file_paths
+
+
+def fresh_interface_reads(file_paths: list) -> float:
+    """Reads each file with a newly created CloudInterface, returns seconds per call"""
+    start_time = time.time()
+    for file_path in file_paths:
+        CloudInterface().fetch(file_path)
+    return (time.time() - start_time) / len(file_paths)
+
+
+def persistent_interface_reads(file_paths: list) -> float:
+    """Reads each file with one shared CloudInterface, returns seconds per call"""
+    ci = CloudInterface()
+    start_time = time.time()
+    for file_path in file_paths:
+        ci.fetch(file_path)
+    return (time.time() - start_time) / len(file_paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder_path', help='remote folder for benchmark files (with prefix)')
+    parser.add_argument('--count', type=int, default=10000, help='amount of small reads')
+    parser.add_argument('--size', type=int, default=1024, help='size of each file in bytes')
+    args = parser.parse_args()
+
+    file_paths = prepare_files(CloudInterface(), args.folder_path, args.count, args.size)
+
+    fresh = fresh_interface_reads(file_paths)
+    persistent = persistent_interface_reads(file_paths)
+
+    print(f'{args.count} reads of {args.size} bytes from {args.folder_path}')
+    print(f'fresh CloudInterface per call: {fresh * 1000:.2f} ms/call')
+    print(f'persistent CloudInterface:     {persistent * 1000:.2f} ms/call')
+    print(f'speedup: {fresh / persistent:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
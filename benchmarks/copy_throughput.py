@@ -0,0 +1,49 @@
+""" Measures copy_dir throughput (objects/sec) of many small files for different max_workers values
+
+    Usage:
+        python benchmarks/copy_throughput.py s3://bucket-name/benchmark/src gs://bucket-name/benchmark/dst --count 1000
+"""
+import argparse
+import os
+import time
+
+from cloudstorageio import CloudInterface
+
+
+def prepare_files(ci: CloudInterface, folder_path: str, count: int, size: int):
+    """Writes `count` small files into given folder if they do not exist yet"""
+    content = os.urandom(size)
+    existing = set(ci.listdir(folder_path)) if ci.isdir(folder_path) else set()
+    for idx in range(count):
+        if f'small_{idx}.bin' not in existing:
+            ci.save(os.path.join(folder_path, f'small_{idx}.bin'), content)
+
+
+def copy_dir_rate(source_dir: str, dest_dir: str, count: int, max_workers: int) -> float:
+    """Copies source_dir into a fresh dest_dir subfolder, returns copied objects per second"""
+    ci = CloudInterface(max_workers=max_workers)
+    dest_dir = os.path.join(dest_dir, f'workers_{max_workers}')
+    start_time = time.time()
+    ci.copy_dir(source_dir, dest_dir)
+    return count / (time.time() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source_dir', help='folder of benchmark files (with prefix)')
+    parser.add_argument('dest_dir', help='folder to copy into (with prefix)')
+    parser.add_argument('--count', type=int, default=1000, help='amount of small files')
+    parser.add_argument('--size', type=int, default=1024, help='size of each file in bytes')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 16, 64], help='max_workers values')
+    args = parser.parse_args()
+
+    prepare_files(CloudInterface(), args.source_dir, args.count, args.size)
+
+    print(f'copy_dir of {args.count} files of {args.size} bytes from {args.source_dir} to {args.dest_dir}')
+    for max_workers in args.workers:
+        rate = copy_dir_rate(args.source_dir, args.dest_dir, args.count, max_workers)
+        print(f'max_workers={max_workers}: {rate:.0f} objects/sec')
+
+
+if __name__ == '__main__':
+    main()
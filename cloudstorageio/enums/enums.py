@@ -6,3 +6,8 @@ class PrefixEnums(enum.Enum):
     GOOGLE_CLOUD = 'gs://'
     DROPBOX = 'dbx://'
     GOOGLE_DRIVE = 'gdrive://'
+
+
+class ObjectTypeEnums(enum.Enum):
+    FILE = 'file'
+    FOLDER = 'folder'
@@ -2,3 +2,12 @@ class CaseInsensitivityError(Exception):
     """cloudstorageio's CloudInterface is case sensitive, and uses CaseInsensitivityError exception to prevent
      conflicts and overwriting """
     pass
+
+
+class BatchOperationError(Exception):
+    """Raised when some objects of a batch operation (e.g. folder removal) failed, while others succeeded.
+    failures maps full path of each failed object to its error message"""
+
+    def __init__(self, message: str, failures: dict):
+        super().__init__(f'{message} ({len(failures)} failed)')
+        self.failures = failures
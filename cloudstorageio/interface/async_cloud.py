@@ -1,23 +1,31 @@
+import asyncio
 import functools
-import itertools
-import multiprocessing
 import os
-import queue
-from multiprocessing.pool import Pool
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
-from typing import Optional
-from threading import Thread
+from typing import Optional, AsyncIterator, Callable
+from cloudstorageio.exceptions import BatchOperationError
 from cloudstorageio.interface.cloud_interface import CloudInterface
-from cloudstorageio.tools.decorators import timer
+from cloudstorageio.tools.concurrency import run_concurrently
 from cloudstorageio.tools.logger import logger
 
 
 class AsyncCloudInterface:
+    """Awaitable counterpart of CloudInterface for asyncio applications
+    Storage clients are blocking, so each storage call runs in a worker thread of a pool of max_concurrency threads
+    and the event loop is never blocked. Amount of simultaneous calls is therefore bounded by the thread count,
+    the semaphore only makes further calls wait in the event loop instead of the pool's queue.
+    The instance could be used in several event loops (each one has its own semaphore),
+    its worker threads are stopped by close (or at the end of `async with` block)
+    """
+    DEFAULT_MAX_CONCURRENCY = 64
 
     def __init__(self, aws_region_name: Optional[str] = None, aws_access_key_id: Optional[str] = None,
                  aws_secret_access_key: Optional[str] = None, dropbox_token: Optional[str] = None,
                  dropbox_root: Optional[bool] = False, google_cloud_credentials_path: Optional[str] = None,
-                 google_drive_credentials_path: Optional[str] = None, **kwargs):
+                 google_drive_credentials_path: Optional[str] = None,
+                 max_concurrency: Optional[int] = DEFAULT_MAX_CONCURRENCY, **kwargs):
 
         """Initializes AsyncCloudInterface instance
         :param aws_region_name: region name for S3 storage
@@ -26,6 +34,7 @@ class AsyncCloudInterface:
         :param dropbox_token: generated token for dropbox app access
         :param google_cloud_credentials_path: local path of google cloud credentials file (json)
         :param google_drive_credentials_path: local path of google drive secret credentials file (json)
+        :param max_concurrency: amount of storage calls running at the same time (amount of worker threads)
         :param kwargs:
         """
 
@@ -38,116 +47,135 @@ class AsyncCloudInterface:
         self.google_cloud_credentials_path = google_cloud_credentials_path
         self.google_drive_credentials_path = google_drive_credentials_path
 
-    def read_files(self, file_path_list: list, q: queue.Queue, from_folder_path: str):
-        """Reads given files and put content in given queue
-        :param file_path_list: list of files' path
-        :param q: queue which contains file path and file content
-        :param from_folder_path: folder path of files to read
-        :return:
-        """
-        ci = CloudInterface(aws_region_name=self.aws_region_name, aws_access_key_id=self.aws_access_key_id,
-                            aws_secret_access_key=self.aws_secret_access_key, dropbox_token=self.dropbox_token,
-                            dropbox_root=self.dropbox_root,
-                            google_cloud_credentials_path=self.google_cloud_credentials_path,
-                            google_drive_credentials_path=self.google_drive_credentials_path)
-
-        for file_path in file_path_list:
-            q.put((file_path, ci.fetch(os.path.join(from_folder_path, file_path))))
-
-        q.put(('', ''))
-
-    def write_files(self, q: queue.Queue, from_folder_path: str, to_folder_path: str):
-        """Writes given file contents to new files
-        :param q: queue which contains file path and file content
-        :param from_folder_path:folder path of already read files
-        :param to_folder_path: folder path of files to write
-        :return:
+        # CloudInterface is stateless and thread safe, all reader/writer threads share its clients
+        self._ci = CloudInterface(aws_region_name=self.aws_region_name, aws_access_key_id=self.aws_access_key_id,
+                                  aws_secret_access_key=self.aws_secret_access_key, dropbox_token=self.dropbox_token,
+                                  dropbox_root=self.dropbox_root,
+                                  google_cloud_credentials_path=self.google_cloud_credentials_path,
+                                  google_drive_credentials_path=self.google_drive_credentials_path,
+                                  max_workers=max_concurrency, **kwargs)
+
+        self._max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphores = weakref.WeakKeyDictionary()  # event loop -> semaphore created inside it
+
+    def close(self):
+        """Stops worker threads, waits for running calls to finish"""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def _run(self, func: Callable, *args, **kwargs):
+        """Runs given blocking function in a worker thread, when one of max_concurrency slots is free"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        async with semaphore:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def fetch(self, path: str) -> bytes:
+        """Fetch data of given file"""
+        return await self._run(self._ci.fetch, path)
+
+    async def save(self, path: str, content):
+        """Save content to given file"""
+        await self._run(self._ci.save, path, content)
+
+    async def isfile(self, path: str) -> bool:
+        """Checks file existence for given path"""
+        return await self._run(self._ci.isfile, path)
+
+    async def isdir(self, path: str) -> bool:
+        """Checks dictionary existence for given path"""
+        return await self._run(self._ci.isdir, path)
+
+    async def stat(self, path: str):
+        """Returns size, modification time, ETag and type of given file/folder"""
+        return await self._run(self._ci.stat, path)
+
+    async def listdir(self, path: str, recursive: Optional[bool] = False,
+                      exclude_folders: Optional[bool] = False) -> list:
+        """Lists content for given folder path"""
+        return await self._run(self._ci.listdir, path, recursive=recursive, exclude_folders=exclude_folders)
+
+    async def iterdir(self, path: str, recursive: Optional[bool] = False,
+                      exclude_folders: Optional[bool] = False) -> AsyncIterator[str]:
+        """Async iterator over content of given folder path
+        Each listing page is fetched in a worker thread only when the names of the previous one are consumed
+        (see CloudInterface.iterdir_pages)
         """
+        pages = self._ci.iterdir_pages(path, recursive=recursive, exclude_folders=exclude_folders)
         while True:
-            ci = CloudInterface(aws_region_name=self.aws_region_name, aws_access_key_id=self.aws_access_key_id,
-                                aws_secret_access_key=self.aws_secret_access_key, dropbox_token=self.dropbox_token,
-                                dropbox_root=self.dropbox_root,
-                                google_cloud_credentials_path=self.google_cloud_credentials_path,
-                                google_drive_credentials_path=self.google_drive_credentials_path)
-
-            file_path, content = q.get(block=True)
-            # Use Enum for identifying queue progress
-            if not file_path:
+            page = await self._run(next, pages, None)
+            if page is None:
                 break
+            for name in page:
+                yield name
 
-            to_file_path = os.path.join(to_folder_path, file_path)
-            ci.save(to_file_path, content)
-            logger.info(f"Copied file {os.path.join(from_folder_path, file_path)} to {to_file_path}")
-            q.task_done()
-
-    @staticmethod
-    def get_chunk(seq: list, n_chunks: int) -> list:
-        """
-        Divides given sequence to n chunks
+    async def iter_content(self, path: str, chunk_size: Optional[int] = 1024 * 1024) -> AsyncIterator[bytes]:
+        """Async iterator over content of given file, read chunk by chunk from a streaming reader
+        :param path: full path of the file
+        :param chunk_size: size of each chunk in bytes
         """
-        seq_size = len(seq)
-        result_list = list()
-        if n_chunks > seq_size:
-            raise ValueError(f"The number of chunks ({n_chunks}) exceeds the"
-                             f" length of the sequence ({seq_size})")
-
-        [result_list.append([]) for _ in range(n_chunks)]
-        for idx, chunk in enumerate(itertools.cycle(result_list)):
-            if idx == seq_size:
-                break
-            chunk.append(seq[idx])
-
-        return result_list
-
-    def copy_batch(self, from_path: str, to_path: str, continue_copy: Optional[bool] = False,
-                   process_amount: int = 10):
+        f = await self._run(self._ci.open, path, 'rb')
+        try:
+            while True:
+                chunk = await self._run(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await self._run(f.close)
+
+    async def remove(self, path: str):
+        """Deletes file/folder"""
+        await self._run(self._ci.remove, path)
+
+    async def copy(self, from_path: str, to_path: str):
+        """Copies given file to new destination"""
+        await self._run(self._ci.copy, from_path, to_path)
+
+    async def move(self, from_path: str, to_path: str):
+        """Moves given file to new destination"""
+        await self._run(self._ci.move, from_path, to_path)
+
+    def _copy_file(self, from_file_path: str, to_file_path: str):
+        """Copies single file of copy_batch (streaming, so memory does not depend on file size)"""
+        self._ci.copy(from_file_path, to_file_path)
+        logger.info(f"Copied file {from_file_path} to {to_file_path}")
+
+    async def copy_batch(self, from_path: str, to_path: str, continue_copy: Optional[bool] = False,
+                         process_amount: int = 10):
         """ Asynchronous copy entire batch(folder) to new destination
+        The batch runs in a worker thread, so the event loop is not blocked while it is copied.
+        Files are taken from a shared queue by process_amount threads, so an idle thread takes the next file
+        instead of waiting for others. Each file is streamed from reader to writer, so memory of each thread is
+        bounded by chunk counts rather than file size: DEFAULT_COPY_BUFFERS queued chunks, reader's blocks
+        (readahead + 2 for S3/Google Cloud Storage) and writer's chunks in flight (max_concurrency parts for S3).
+        Google Drive destinations keep at most two chunks in memory and send full ones to a resumable upload session
         :param from_path: folder/bucket to copy from
         :param to_path: name of folder to copy files
-        :param continue_copy:
-        :param process_amount:
+        :param continue_copy: if True, will ignore the same files existing in both dirs and copy only new or changed
+                              ones (see CloudInterface.changed_files)
+        :param process_amount: amount of threads copying files
+        :raises BatchOperationError: if some of the files failed to be copied
         :return:
         """
+        await self._run(self._copy_batch, from_path, to_path, continue_copy, process_amount)
 
-        ci = CloudInterface(aws_region_name=self.aws_region_name, aws_access_key_id=self.aws_access_key_id,
-                            aws_secret_access_key=self.aws_secret_access_key, dropbox_token=self.dropbox_token,
-                            dropbox_root=self.dropbox_root,
-                            google_cloud_credentials_path=self.google_cloud_credentials_path,
-                            google_drive_credentials_path=self.google_drive_credentials_path)
+    def _copy_batch(self, from_path: str, to_path: str, continue_copy: bool, process_amount: int):
         if continue_copy:
-            from_path_list = ci.listdir(from_path, recursive=True)
-            try:
-                to_path_list = ci.listdir(to_path, recursive=True)
-            except FileNotFoundError:
-                to_path_list = []
-
-            full_path_list = list(set(from_path_list) - set(to_path_list))
+            full_path_list = self._ci.changed_files(from_path, to_path)
         else:
-            full_path_list = ci.listdir(from_path, recursive=True)
-
-        if process_amount > len(full_path_list):
-            process_amount = len(full_path_list)
-
-        chunks = self.get_chunk(full_path_list, process_amount)
-
-        read_threads = []
-        write_threads = []
-
-        for chunk in chunks:
-            q = queue.Queue()
-
-            read_thread = Thread(target=self.read_files,
-                                 args=(chunk, q, from_path))
-
-            read_threads.append(read_thread)
-
-            write_thread = Thread(target=self.write_files, args=(q, from_path, to_path))
-            write_threads.append(write_thread)
-
-            read_thread.start()
-            write_thread.start()
+            full_path_list = self._ci.listdir(from_path, recursive=True, exclude_folders=True)
 
-        # join all opened threads
-        for r, w in zip(read_threads, write_threads):
-            r.join()
-            w.join()
+        pairs = ((os.path.join(from_path, p), os.path.join(to_path, p)) for p in full_path_list)
+        failures = run_concurrently(lambda pair: self._copy_file(*pair), pairs, max_workers=process_amount)
+        if failures:
+            raise BatchOperationError('Failed to copy files',
+                                      {from_file_path: str(error) for (from_file_path, _), error in failures.items()})
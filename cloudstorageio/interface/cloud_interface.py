@@ -4,17 +4,26 @@
     Class CloudInterface contains
                                 open method, for opening/creating given file object
                                 isfile and isdir methods for checking object status (file, folder)
+                                stat method for getting object metadata (type, size, mtime, ETag)
                                 listdir method for listing folder's content
+                                scandir method for listing folder's files with their metadata
                                 remove method for removing file/folder
+                                remove_batch method for removing many files/folders
                                 copy method for copying file from one storage to another
+                                sync method for copying only new or changed files of a folder
+
+    Results of isfile, isdir, stat and listdir could be kept in an in-memory metadata cache (metadata_cache=True),
+        entries are dropped when this CloudInterface writes, copies or removes the paths
+    Content of remote files read by open/fetch could be kept in a local disk cache (read_cache=True),
+        keyed by path and ETag, so repeated reads are served from memory mapped local files
 """
-import functools
-import multiprocessing
 import os
-from multiprocessing.pool import Pool
-from typing import Optional, Callable
+import shutil
+import threading
+from typing import Optional, Callable, Iterable, Iterator, Tuple
 
-from cloudstorageio.enums import PrefixEnums
+from cloudstorageio.enums import PrefixEnums, ObjectTypeEnums
+from cloudstorageio.exceptions import BatchOperationError
 from cloudstorageio.interface import GoogleStorageInterface
 from cloudstorageio.interface import LocalStorageInterface
 from cloudstorageio.interface import S3Interface
@@ -22,8 +31,12 @@ from cloudstorageio.interface import DropBoxInterface
 from cloudstorageio.interface import GoogleDriveInterface
 
 from cloudstorageio.tools.decorators import timer, storage_cache_factory
-from cloudstorageio.tools.ci_collections import path_formatter
+from cloudstorageio.tools.ci_collections import path_formatter, ObjectStat
+from cloudstorageio.tools.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 from cloudstorageio.tools.logger import logger
+from cloudstorageio.tools.metadata_cache import MetadataCache, ClosingWriter
+from cloudstorageio.tools.read_cache import ReadCache, DEFAULT_READ_CACHE_SIZE, DEFAULT_VALIDATION_TTL
+from cloudstorageio.tools.streams import copy_stream, open_reader, MmapReader, DEFAULT_CHUNK_SIZE
 
 
 class CloudInterface:
@@ -31,7 +44,11 @@ class CloudInterface:
     def __init__(self, aws_region_name: Optional[str] = None, aws_access_key_id: Optional[str] = None,
                  aws_secret_access_key: Optional[str] = None, dropbox_token: Optional[str] = None,
                  dropbox_root: Optional[bool] = None, google_cloud_credentials_path: Optional[str] = None,
-                 google_drive_credentials_path: Optional[str] = None, **kwargs):
+                 google_drive_credentials_path: Optional[str] = None, max_workers: Optional[int] = DEFAULT_MAX_WORKERS,
+                 metadata_cache: Optional[bool] = False, metadata_cache_ttl: Optional[dict] = None,
+                 metadata_cache_size: Optional[int] = MetadataCache.DEFAULT_MAX_ENTRIES,
+                 read_cache: Optional[bool] = False, read_cache_size: Optional[int] = DEFAULT_READ_CACHE_SIZE,
+                 read_cache_ttl: Optional[float] = DEFAULT_VALIDATION_TTL, **kwargs):
 
         """Initializes CloudInterface instance
         :param aws_region_name: region name for S3 storage
@@ -41,7 +58,22 @@ class CloudInterface:
         :param dropbox_root: namespace id starts from root
         :param google_cloud_credentials_path: local path of google cloud credentials file (json)
         :param google_drive_credentials_path: local path of google drive secret credentials file (json)
-        :param kwargs:
+        :param max_workers: amount of threads for batch operations (copy_dir, copy_batch),
+                            connection pools of storage clients are sized to it and to the threads of its streams
+                            (readahead of readers and parallel part uploads of S3 writers)
+        :param metadata_cache: keep results of isfile, isdir, stat and listdir in memory (by default no)
+        :param metadata_cache_ttl: storage prefix (e.g. 's3://') -> seconds the results are kept
+                                   (see metadata_cache.DEFAULT_TTL, local paths are not cached by default)
+        :param metadata_cache_size: maximum amount of cached results, least recently used ones are dropped
+        :param read_cache: keep content of remote files read by open/fetch on local disk (by default no),
+                           in `objects` folder of cache_dir keyword argument (see get_cache_dir)
+        :param read_cache_size: maximum total size of the read cache in bytes, least recently used files are evicted
+        :param read_cache_ttl: seconds the ETag of a cached file is trusted without requests (by default 0,
+                               each read checks the ETag with one metadata request)
+        :param kwargs: cache_dir - parent folder of local caches (see get_cache_dir),
+                       local_hash_index - keep md5/crc32c/dropBox content hash of local files in a SQLite index
+                       (in cache_dir), so sync/changed_files compare local files by digest without reading
+                       unchanged ones again (by default no)
         """
 
         self._kwargs = kwargs
@@ -52,66 +84,72 @@ class CloudInterface:
         self._kwargs['dropbox_root'] = dropbox_root
         self._kwargs['google_cloud_credentials_path'] = google_cloud_credentials_path
         self._kwargs['google_drive_credentials_path'] = google_drive_credentials_path
-
-        self._filename = None
-        self._mode = None
+        self._kwargs['max_pool_connections'] = max_workers
+        self._max_workers = max_workers
+        self._metadata_cache = MetadataCache(max_entries=metadata_cache_size, ttl=metadata_cache_ttl) \
+            if metadata_cache else None
+        self._read_cache = ReadCache(cache_dir=kwargs.get('cache_dir'), max_size=read_cache_size,
+                                     validation_ttl=read_cache_ttl) if read_cache else None
+
+        # interface instances (with their sessions and connection pools) live as long as CloudInterface,
+        # they keep no path specific state, so CloudInterface can be shared between threads
         self._s3 = None
         self._gs = None
         self._local = None
         self._dbx = None
         self._dr = None
-        self._current_storage = None
-        self._path = None
+        self._storage_lock = threading.Lock()
+
+    def _get_storage(self, attr_name: str, interface_class: type):
+        """Returns interface instance kept in given attribute, creates it only on first use"""
+        storage = getattr(self, attr_name)
+        if storage is None:
+            with self._storage_lock:
+                storage = getattr(self, attr_name)
+                if storage is None:
+                    storage = interface_class(**self._kwargs)
+                    setattr(self, attr_name, storage)
+        return storage
 
     def identify_path_type(self, path: str):
-        """Identifies "type" of given path and create class instance
+        """Identifies "type" of given path and returns class instance of its storage
         :param path: full path of file/folder
-        :return: None
+        :return: storage interface instance
         """
 
-        self._path = path_formatter(path)
+        formatted_path = path_formatter(path)
 
-        if self.is_local_path(self._path):
-            if self._local is None:
-                self._local = LocalStorageInterface()
-            self._current_storage = self._local
+        if self.is_local_path(formatted_path):
+            return self._get_storage('_local', LocalStorageInterface)
 
-        elif self.is_s3_path(self._path):
-            if self._s3 is None:
-                self._s3 = S3Interface(**self._kwargs)
-            self._current_storage = self._s3
+        elif self.is_s3_path(formatted_path):
+            return self._get_storage('_s3', S3Interface)
 
-        elif self.is_google_storage_path(self._path):
-            if self._gs is None:
-                self._gs = GoogleStorageInterface(**self._kwargs)
-            self._current_storage = self._gs
+        elif self.is_google_storage_path(formatted_path):
+            return self._get_storage('_gs', GoogleStorageInterface)
 
-        elif self.is_dropbox_path(self._path):
-            if self._dbx is None:
-                self._dbx = DropBoxInterface(**self._kwargs)
-            self._current_storage = self._dbx
+        elif self.is_dropbox_path(formatted_path):
+            return self._get_storage('_dbx', DropBoxInterface)
 
-        elif self.is_drive_path(self._path):
-            if self._dr is None:
-                self._dr = GoogleDriveInterface(**self._kwargs)
-            self._current_storage = self._dr
+        elif self.is_drive_path(formatted_path):
+            return self._get_storage('_dr', GoogleDriveInterface)
         else:
             raise ValueError(f"`{path}` is invalid. Please use {PrefixEnums.DROPBOX.value} prefix for dropBox,"
                              f" {PrefixEnums.S3.value} for S3 storage, "
                              f" {PrefixEnums.GOOGLE_CLOUD.value} for Google Cloud Storage,"
                              f"{PrefixEnums.GOOGLE_DRIVE.value} for Google Drive, or VALID local path")
 
-    def _reset_fields(self):
-        """Set all instance attributes to none"""
-        self._filename = None
-        self._mode = None
-        self._s3 = None
-        self._gs = None
-        self._local = None
-        self._dbx = None
-        self._dr = None
-        self._current_storage = None
-        self._path = None
+    def __getstate__(self):
+        """Interface instances and locks are not picklable, each process creates its own ones"""
+        state = self.__dict__.copy()
+        for attr_name in ('_s3', '_gs', '_local', '_dbx', '_dr'):
+            state[attr_name] = None
+        del state['_storage_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._storage_lock = threading.Lock()
 
     @staticmethod
     def is_local_path(path: str) -> bool:
@@ -143,12 +181,119 @@ class CloudInterface:
         """Checks if the given path is for google drive"""
         return path.strip().startswith(PrefixEnums.GOOGLE_DRIVE.value)
 
+    def _invalidate(self, path: str, recursive: Optional[bool] = False):
+        """Drops metadata cache entries of given path and its parent folders (see MetadataCache.invalidate)
+        and validated ETag of the path in the read cache
+        """
+        if self._metadata_cache is not None:
+            self._metadata_cache.invalidate(path, recursive=recursive)
+        if self._read_cache is not None:
+            self._read_cache.forget(path)
+
+    def invalidate_cache(self, path: Optional[str] = None):
+        """Drops cached metadata of given path (with paths under it and its parent folders) or the whole cache
+        Should be called if the path is changed by other processes before the TTL passes
+        """
+        if self._metadata_cache is None:
+            return
+        if path is None:
+            self._metadata_cache.clear()
+        else:
+            self._metadata_cache.invalidate(path, recursive=True)
+
+    def _cached_call(self, name: str, path: str, *args):
+        """Calls given method of path's storage, result (or missing path error) is taken from the metadata cache
+        if it is enabled and kept there for next calls
+        """
+        storage = self.identify_path_type(path)
+        if self._metadata_cache is None:
+            return getattr(storage, name)(path, *args)
+        try:
+            return self._metadata_cache.get(path, name, args)
+        except KeyError:
+            pass
+        try:
+            value = getattr(storage, name)(path, *args)
+        except (FileNotFoundError, NotADirectoryError) as e:
+            self._metadata_cache.set(path, name, e, args)
+            raise
+        self._metadata_cache.set(path, name, value, args)
+        return value
+
+    def _exists_in_cached_listing(self, path: str, name_suffix: str) -> Optional[bool]:
+        """Checks given path in the cached (non recursive) listing of its parent folder
+        :param name_suffix: '' for files, '/' for folders
+        :return: True if the path is listed, False if the parent folder is missing, None if it is unknown
+        """
+        if self._metadata_cache is None:
+            return None
+        parent, name = os.path.split(path.strip().rstrip('/'))
+        try:
+            listing = self._metadata_cache.get(parent, 'listdir', (False, False))
+        except KeyError:
+            return None
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        # names could be case insensitive (dropBox), so only listed paths are answered from the listing
+        return True if name + name_suffix in listing else None
+
+    def _read_cache_file(self, path: str, *args, **kwargs) -> Optional[str]:
+        """Returns local file of the read cache keeping current content of given remote file, downloads it on a miss
+        The ETag is validated with one stat call (none within read_cache_ttl)
+        :return: local file path, None if the file is not cached (local path, storage without ETags, too big file)
+        """
+        if self._read_cache is None or self.is_local_path(path):
+            return None
+        storage = self.identify_path_type(path)
+        if not hasattr(storage, 'stat'):
+            return None
+
+        etag = self._read_cache.get_validated_etag(path)
+        if etag is not None:
+            file_path = self._read_cache.get_file_path(path, etag)
+            if file_path is not None:
+                return file_path
+
+        obj = self.stat(path)
+        if obj.type != ObjectTypeEnums.FILE or not obj.etag or obj.size > self._read_cache.max_size:
+            return None
+        file_path = self._read_cache.get_file_path(path, obj.etag)
+        if file_path is None:
+            tmp_path = self._read_cache.create_temp_file()
+            try:
+                with storage.open(path, 'rb', *args, **kwargs) as reader, open(tmp_path, 'wb') as f:
+                    shutil.copyfileobj(reader, f, DEFAULT_CHUNK_SIZE)
+                # the file could be overwritten while it was downloaded, then its content is not cached
+                if storage.stat(path).etag != obj.etag:
+                    os.remove(tmp_path)
+                    return None
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            file_path = self._read_cache.add_file(path, obj.etag, tmp_path)
+        if file_path is not None:
+            self._read_cache.set_validated_etag(path, obj.etag)
+        return file_path
+
     def open(self, file_path: str, mode: Optional[str] = 'rt', *args, **kwargs) -> Callable:
-        """Identifies given file path and return "open" method for detected current storage"""
-        self.identify_path_type(file_path)
-        res = self._current_storage.open(path=file_path, mode=mode, *args, **kwargs)
-        self._reset_fields()
-        return res
+        """Identifies given file path and returns independent file object opened by detected storage
+        (or memory mapped file of the read cache if it is enabled)
+        """
+        if mode is not None and set(mode) & set('wax'):
+            self._invalidate(file_path)
+            writer = self.identify_path_type(file_path).open(file_path, mode, *args, **kwargs)
+            if self._metadata_cache is None and self._read_cache is None:
+                return writer
+            # results cached while the file is written (e.g. by other threads) are dropped once it is closed
+            return ClosingWriter(writer, on_close=lambda: self._invalidate(file_path))
+        elif self._read_cache is not None:
+            cached_path = self._read_cache_file(file_path, *args, **kwargs)
+            if cached_path is not None:
+                try:
+                    return open_reader(MmapReader(cached_path), mode=mode)
+                except FileNotFoundError:  # evicted by another process meanwhile
+                    logger.info(f'Cached content of {file_path} is evicted, reading from storage')
+        return self.identify_path_type(file_path).open(file_path, mode, *args, **kwargs)
 
     def save(self, path: str, content):
         """Save content to given file"""
@@ -163,24 +308,56 @@ class CloudInterface:
 
     def isfile(self, path: str) -> Callable:
         """Checks file existence for given path"""
-        self.identify_path_type(path)
-        res = self._current_storage.isfile(path)
-        self._reset_fields()
-        return res
+        listed = self._exists_in_cached_listing(path, '')
+        return listed if listed is not None else self._cached_call('isfile', path)
 
     def isdir(self, path: str) -> Callable:
         """Checks dictionary existence for given path"""
-        self.identify_path_type(path)
-        res = self._current_storage.isdir(path)
-        self._reset_fields()
-        return res
+        listed = self._exists_in_cached_listing(path, '/')
+        return listed if listed is not None else self._cached_call('isdir', path)
+
+    def stat(self, path: str) -> ObjectStat:
+        """Returns size, modification time, ETag and type of given file/folder"""
+        return self._cached_call('stat', path)
 
     def remove(self, path: str) -> Callable:
         """Deletes file/folder"""
-        self.identify_path_type(path)
-        res = self._current_storage.remove(path)
-        self._reset_fields()
-        return res
+        try:
+            return self.identify_path_type(path).remove(path)
+        finally:
+            self._invalidate(path, recursive=True)
+
+    def remove_batch(self, paths: list):
+        """Deletes given files/folders, with batch requests if the storage supports it (Dropbox)
+        :param paths: full paths of files/folders to delete
+        :raises BatchOperationError: if some of the paths (or objects under them) failed to be deleted
+        """
+        storage_paths = dict()
+        for path in paths:
+            storage_paths.setdefault(self.identify_path_type(path), []).append(path)
+
+        failures = dict()
+        try:
+            for storage, paths_of_storage in storage_paths.items():
+                if hasattr(storage, 'remove_batch'):
+                    try:
+                        storage.remove_batch(paths_of_storage)
+                    except BatchOperationError as e:
+                        failures.update(e.failures)
+                    continue
+                for path in paths_of_storage:
+                    try:
+                        storage.remove(path)
+                    except BatchOperationError as e:
+                        failures.update(e.failures)
+                    except Exception as e:
+                        failures[path] = str(e)
+        finally:
+            for path in paths:
+                self._invalidate(path, recursive=True)
+
+        if failures:
+            raise BatchOperationError('Failed to delete paths', failures)
 
     def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False) -> list:
         """ Lists all files/folders containing in given folder path
@@ -189,27 +366,106 @@ class CloudInterface:
         :param exclude_folders: exclude folders from list (by default no, lists folders too)
         :return: list of folder's content (file/folder names)
         """
-        self.identify_path_type(path)
-        res = self._current_storage.listdir(path=path, recursive=recursive, exclude_folders=exclude_folders)
-        self._reset_fields()
-        return res
+        return list(self._cached_call('listdir', path, bool(recursive), bool(exclude_folders)))
+
+    def iterdir_pages(self, path: str, recursive: Optional[bool] = False,
+                      exclude_folders: Optional[bool] = False) -> Iterator[list]:
+        """ Yields content of given folder path page by page, each page is fetched only when the previous one is used
+        Storages without paged listing (local, Google Drive) yield the whole listdir as one page
+        :param path: the full path of folder (with prefix)
+        :param recursive: list folder recursively, (by default no)
+        :param exclude_folders: exclude folders from list (by default no, lists folders too)
+        :return: iterator of lists of file/folder names
+        """
+        storage = self.identify_path_type(path)
+        if hasattr(storage, 'iterdir_pages'):
+            yield from storage.iterdir_pages(path, recursive=recursive, exclude_folders=exclude_folders)
+        else:
+            yield self.listdir(path, recursive=recursive, exclude_folders=exclude_folders)
+
+    def scandir(self, path: str) -> Iterator[ObjectStat]:
+        """ Yields metadata (size, modification time, ETag, md5) of each file under given folder path recursively,
+        taken from the listing responses without per-file requests
+        :param path: the full path of folder (with prefix)
+        :return: iterator of ObjectStats, with paths relative to the folder
+        """
+        return self.identify_path_type(path).scandir(path)
+
+    @staticmethod
+    def _is_changed(source: ObjectStat, destination: Optional[ObjectStat], same_storage: bool) -> bool:
+        """Detects if source file should be copied over destination file (None if it does not exist)
+        Digests (md5, crc32c, dropBox content hash) are compared when both are known,
+        then same storage ETags and modification times
+        """
+        if destination is None or source.size != destination.size:
+            return True
+        for digest in ('md5', 'crc32c', 'content_hash'):
+            if getattr(source, digest) and getattr(destination, digest):
+                return getattr(source, digest) != getattr(destination, digest)
+        if same_storage and source.etag and source.etag == destination.etag:
+            return False
+        if source.mtime and destination.mtime:
+            return source.mtime > destination.mtime
+        return False
+
+    def changed_files(self, source_dir: str, dest_dir: str) -> list:
+        """ Lists files of source folder, which are missing or differ in destination folder
+        Compares size, digests/ETag and modification time taken from both listings (see scandir)
+        :param source_dir: folder/bucket to copy from
+        :param dest_dir: folder/bucket to copy to
+        :return: list of relative paths of new or changed files
+        """
+        same_storage = self.identify_path_type(source_dir) is self.identify_path_type(dest_dir)
+        try:
+            destination = {obj.path: obj for obj in self.scandir(dest_dir)}
+        except FileNotFoundError:
+            destination = dict()
+        return [obj.path for obj in self.scandir(source_dir)
+                if self._is_changed(obj, destination.get(obj.path), same_storage)]
+
+    def sync(self, source_dir: str, dest_dir: str, multiprocess: Optional[bool] = True) -> list:
+        """ Copies only new or changed files of source folder to destination folder (see changed_files)
+        :param source_dir: folder/bucket to copy from
+        :param dest_dir: folder/bucket to copy to (dest_dir does not need to exist)
+        :param multiprocess: indicator of copying files in parallel threads (max_workers of CloudInterface)
+        :raises BatchOperationError: if some of the files failed to be copied
+        :return: list of relative paths of copied files
+        """
+        changed = self.changed_files(source_dir, dest_dir)
+        pairs = ((os.path.join(source_dir, p), os.path.join(dest_dir, p)) for p in changed)
+        self._copy_pairs(pairs, parallel=multiprocess)
+        return changed
 
     @storage_cache_factory()
     def cache_listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False):
-        """Cache the listed output of the first call, then use the already cached output (when called again)"""
+        """Cache the listed output of the first call on the local disk, then use the already cached output
+        (when called again, in any process) till it expires (see storage_cache_factory)"""
         return self.listdir(path=path, recursive=recursive, exclude_folders=exclude_folders)
 
     def copy(self, from_path: str, to_path: str):
         """Copies given file to new destination"""
+        try:
+            self._copy(from_path, to_path)
+        finally:
+            self._invalidate(to_path)
+
+    def _copy(self, from_path: str, to_path: str):
+        # copying on server side if both paths are on the same storage
+        storage = self.identify_path_type(from_path)
+        if hasattr(storage, 'copy') and storage is self.identify_path_type(to_path):
+            storage.copy(from_path, to_path)
+            return
+
         # calling the upload method with multipart configs if a local file is copied to S3
         if self.is_local_path(from_path) and self.is_s3_path(to_path):
-            self.identify_path_type(to_path)  # setting up s3 storage
             with self.open(to_path, 'wb') as f:
                 f.upload(from_path)
                 return
 
-        content = self.fetch(path=from_path)
-        self.save(path=to_path, content=content)
+        # streaming chunks from the source reader into the destination writer
+        with self.open(from_path, 'rb') as reader:
+            with self.open(to_path, 'wb') as writer:
+                copy_stream(reader, writer)
 
     def move(self, from_path: str, to_path: str):
         """Moves given file to new destination"""
@@ -217,14 +473,17 @@ class CloudInterface:
         self.copy(from_path=from_path, to_path=to_path)
         self.remove(path=from_path)
 
-    def _call_copy(self, p, from_path, to_path):
-        """Calls copy with full paths"""
-        try:
-            full_from_path = os.path.join(from_path, p)
-            full_to_path = os.path.join(to_path, p)
-            self.copy(from_path=full_from_path, to_path=full_to_path)
-        except Exception as e:
-            logger.error(f'Failed to copy {p} file : {e}')
+    def _copy_pairs(self, pairs: Iterable[Tuple[str, str]], parallel: bool):
+        """Copies each (from_path, to_path) pair in the pool of max_workers threads (or one by one)
+        :raises BatchOperationError: with each failed source path, after all other pairs are copied
+        """
+        failures = run_concurrently(lambda pair: self.copy(*pair), pairs,
+                                    max_workers=self._max_workers if parallel else 1)
+        if failures:
+            for (from_path, _), error in failures.items():
+                logger.error(f'Failed to copy {from_path} file : {error}')
+            raise BatchOperationError('Failed to copy files',
+                                      {from_path: str(error) for (from_path, _), error in failures.items()})
 
     @timer
     def copy_dir(self, source_dir: str, dest_dir: str, multiprocess: Optional[bool] = True,
@@ -232,48 +491,37 @@ class CloudInterface:
         """ Recursively copy a directory
         :param source_dir: folder/bucket to copy from
         :param dest_dir: folder/bucket to copy to (dest_dir does not need to exist)
-        :param multiprocess: indicator of multiprocessing
-        :param continue_copy: if True, will ignore the same files existing in both dirs and copy only differing ones
+        :param multiprocess: indicator of copying files in parallel threads (max_workers of CloudInterface)
+        :param continue_copy: if True, will ignore the same files existing in both dirs and copy only new or changed
+                              ones (compared by size, md5/ETag and modification time, see changed_files)
+        :raises BatchOperationError: if some of the files failed to be copied
         :return:
         """
         if continue_copy:
-            from_path_list = self.listdir(source_dir, recursive=True, exclude_folders=True)
-
-            try:
-                to_path_list = self.listdir(dest_dir, recursive=True, exclude_folders=True)
-            except FileNotFoundError:
-                to_path_list = []
-
-            full_path_list = list(set(from_path_list) - set(to_path_list))
+            full_path_list = self.changed_files(source_dir, dest_dir)
         else:
             full_path_list = self.listdir(source_dir, recursive=True, exclude_folders=True)
 
-        if multiprocess:
-            p = Pool(multiprocessing.cpu_count())
-            # for each call from_path & to_path are constants
-            partial_func = functools.partial(self._call_copy, from_path=source_dir, to_path=dest_dir)
-            p.map(partial_func, full_path_list)
-        else:
-            for f in full_path_list:
-                self._call_copy(f, source_dir, dest_dir)
-
-    def _call_copy_zip(self, from_to_zip: zip):
-        try:
-            self.copy(from_to_zip[0], from_to_zip[1])
-        except Exception as e:
-            logger.error(f'Failed to copy {from_to_zip[0]} file : {e}')
+        pairs = ((os.path.join(source_dir, p), os.path.join(dest_dir, p)) for p in full_path_list)
+        self._copy_pairs(pairs, parallel=multiprocess)
 
     def copy_batch(self, from_batch: list, to_batch: list, multiprocess: Optional[bool] = True):
         """ Copy entire batch (list)
         :param from_batch: folder/file path list to copy from
         :param to_batch: folder/file path list to copy to
-        :param multiprocess: indicator of doing process with multiprocessing
+        :param multiprocess: indicator of copying files in parallel threads (max_workers of CloudInterface)
+        :raises BatchOperationError: if some of the files failed to be copied
         :return:
         """
-        if multiprocess:
-            p = Pool(multiprocessing.cpu_count())
-            partial_func = functools.partial(self._call_copy_zip)
-            p.map(partial_func, zip(from_batch, to_batch))
-        else:
-            for from_file, to_file in zip(from_batch, to_batch):
-                self.copy(from_path=from_file, to_path=to_file)
+        # copying the whole batch with batch requests if the storage supports it
+        storage = self.identify_path_type(from_batch[0]) if from_batch else None
+        if hasattr(storage, 'copy_batch') and \
+                all(self.identify_path_type(p) is storage for p in list(from_batch) + list(to_batch)):
+            try:
+                storage.copy_batch(from_batch, to_batch)
+            finally:
+                for to_path in to_batch:
+                    self._invalidate(to_path)
+            return
+
+        self._copy_pairs(zip(from_batch, to_batch), parallel=multiprocess)
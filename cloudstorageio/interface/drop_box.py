@@ -1,32 +1,223 @@
 """ Class DropBoxInterface handles with DropBoxInterface workspace files/folders
 
     Class DropBoxInterface has
-                                    read and write methods (can be accessed by open method)
+                                    open method, which returns DropBoxReader (reading) or DropBoxWriter (writing) stream
                                     isfile and isdir methods for checking object status (file, folder)
                                     listdir method for listing folder's content
                                     remove method for removing file/folder
+
+    DropBoxInterface keeps no path specific state, one instance (and its dbx client) can be shared between threads
 """
 
+import io
 import os
 import re
+import time
+from datetime import timezone
 
 import dropbox
-from typing import Union, Optional
+from typing import Union, Optional, Iterator
 
 from dropbox.common import PathRoot
-from dropbox.files import FileMetadata, FolderMetadata, WriteMode
+from dropbox.files import FileMetadata, FolderMetadata, WriteMode, Metadata, UploadSessionCursor, CommitInfo, \
+    RelocationPath, DeleteArg
 from dropbox.exceptions import ApiError
 from dropbox.stone_validators import ValidationError
 
 from cloudstorageio.configs import CloudInterfaceConfig
-from cloudstorageio.enums.enums import PrefixEnums
-from cloudstorageio.exceptions import CaseInsensitivityError
+from cloudstorageio.enums.enums import PrefixEnums, ObjectTypeEnums
+from cloudstorageio.exceptions import CaseInsensitivityError, BatchOperationError
 from cloudstorageio.tools.logger import logger
-from cloudstorageio.tools.ci_collections import add_slash, str2bool
+from cloudstorageio.tools.ci_collections import add_slash, str2bool, ObjectStat
+from cloudstorageio.tools.streams import ChunkedWriter, DEFAULT_CHUNK_SIZE, open_reader
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class DropBoxReader(io.RawIOBase):
+    """Readable raw stream of dropBox file, returned by DropBoxInterface.open for reading
+    Content is streamed from the download response chunk by chunk, so only one chunk is kept in memory.
+    Seeking drops the response, the next read downloads the file from the new position with a Range header
+    """
+
+    def __init__(self, interface: 'DropBoxInterface', path: str, metadata: FileMetadata,
+                 chunk_size: Optional[int] = DEFAULT_DOWNLOAD_CHUNK_SIZE):
+        """Initializes DropBoxReader instance
+        :param interface: DropBoxInterface instance, which dbx client is used for requests
+        :param path: dropBox path of the file (without prefix)
+        :param metadata: metadata of the file, its revision is downloaded even if the file is changed meanwhile
+        :param chunk_size: size of each chunk read from the download response in bytes
+        """
+        super().__init__()
+        if chunk_size <= 0:
+            raise ValueError('chunk_size should be positive')
+
+        self.name = f'{DropBoxInterface.PREFIX}{path.lstrip("/")}'
+        self.path = path
+        self.metadata = metadata
+        self._interface = interface
+        self._dbx = interface.dbx
+        self._chunk_size = chunk_size
+        self._position = 0
+        self._response = None
+        self._chunks = None
+        self._pending = memoryview(b'')  # received, but not yet read part of the last chunk
+
+    @property
+    def size(self) -> int:
+        return self.metadata.size
+
+    def _open_response(self):
+        """Starts downloading the file from current position"""
+        dbx = self._dbx
+        if self._position:
+            dbx = self._interface.clone_dbx(headers={'Range': f'bytes={self._position}-'})
+        _, self._response = dbx.files_download(path=self.path, rev=self.metadata.rev)
+        self._chunks = self._response.iter_content(chunk_size=self._chunk_size)
+
+    def _close_response(self):
+        if self._response is not None:
+            self._response.close()
+        self._response = None
+        self._chunks = None
+        self._pending = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f'Invalid whence ({whence})')
+        if position < 0:
+            raise ValueError(f'Negative seek position {position}')
+
+        if position != self._position:
+            self._close_response()
+            self._position = position
+        return self._position
+
+    def readinto(self, b: Union[bytearray, memoryview]) -> int:
+        self._checkClosed()
+        view = memoryview(b).cast('B')
+        written = 0
+        while written < len(view) and self._position < self.size:
+            if not self._pending:
+                if self._chunks is None:
+                    self._open_response()
+                try:
+                    self._pending = memoryview(next(self._chunks))
+                except StopIteration:
+                    self._close_response()
+                    break
+            n = min(len(view) - written, len(self._pending))
+            view[written:written + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            written += n
+            self._position += n
+        return written
+
+    def readall(self) -> bytes:
+        self._checkClosed()
+        res = bytearray(max(self.size - self._position, 0))
+        n = self.readinto(res)
+        return bytes(res[:n])
+
+    def close(self):
+        if not self.closed:
+            self._close_response()
+        super().close()
+
+
+class DropBoxWriter(ChunkedWriter):
+    """Writable raw stream of dropBox file, returned by DropBoxInterface.open for writing
+    Content is sent chunk by chunk to an upload session, which is committed on close.
+    Content smaller than one chunk is uploaded with a single files_upload request
+    """
+    CHUNK_ALIGNMENT = 4 * 1024 * 1024  # upload session chunks should be multiple of 4 MB
+    MAX_CHUNK_SIZE = 148 * 1024 * 1024  # dropBox accepts at most 150 MB per request
+
+    def __init__(self, interface: 'DropBoxInterface', path: str, metadata: Optional[Metadata] = None,
+                 chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE):
+        """Initializes DropBoxWriter instance
+        :param interface: DropBoxInterface instance, which dbx client is used for requests
+        :param path: dropBox path of the file (without prefix)
+        :param metadata: metadata of the path, None if it does not exist
+        :param chunk_size: size of each uploaded chunk in bytes (rounded up to a multiple of 4 MB)
+        """
+        chunk_size = max(-(-chunk_size // self.CHUNK_ALIGNMENT), 1) * self.CHUNK_ALIGNMENT
+        super().__init__(chunk_size=min(chunk_size, self.MAX_CHUNK_SIZE),
+                         name=f'{DropBoxInterface.PREFIX}{path.lstrip("/")}', encoding=interface.encoding)
+        self._dbx = interface.dbx
+        self.path = path
+        self.metadata = metadata
+        self._session_id = None
+        self._offset = 0  # amount of bytes sent to the session
+
+    @property
+    def _write_mode(self) -> Optional[WriteMode]:
+        if isinstance(self.metadata, FileMetadata):
+            return WriteMode.overwrite
+        return None
+
+    def write(self, content: Union[str, bytes, io.IOBase], metadata: Optional[dict] = None) -> int:
+        """Writes content to file on dropBox, full chunks are sent to the upload session
+        :param content: The content that should be written to a file
+        :param metadata:
+        :return: amount of written bytes
+        """
+        return super().write(content)
+
+    def _upload_chunk(self, chunk: bytes):
+        try:
+            if self._session_id is None:
+                self._session_id = self._dbx.files_upload_session_start(chunk).session_id
+            else:
+                cursor = UploadSessionCursor(session_id=self._session_id, offset=self._offset)
+                self._dbx.files_upload_session_append_v2(chunk, cursor)
+        except ApiError as e:
+            logger.error(f'Failed to upload {self.path} to dropbox: {e}')
+            raise IOError(f'Failed to upload {self.name}: {e}') from e
+        self._offset += len(chunk)
+
+    def _complete(self, last_chunk: bytes):
+        try:
+            if self._session_id is None:
+                res = self._dbx.files_upload(f=last_chunk, path=self.path, mode=self._write_mode)
+            else:
+                cursor = UploadSessionCursor(session_id=self._session_id, offset=self._offset)
+                commit = CommitInfo(path=self.path, mode=self._write_mode or WriteMode.add)
+                res = self._dbx.files_upload_session_finish(last_chunk, cursor, commit)
+            if res.path_display != self.path and res.path_lower == self.path.lower():
+                self._dbx.files_delete_v2(self.path)
+                raise CaseInsensitivityError(f'DropBox case-insensitivity conflict: The given  {self.path} is'
+                                             f' the same file(folder) as {res.path_display}')
+        except ApiError as e:
+            logger.error(f'Failed to upload {self.path} to dropbox: {e}')
+            raise IOError(f'Failed to upload {self.name}: {e}') from e
+
+    def _abort(self):
+        # not finished upload sessions are dropped by dropBox, nothing is committed to the path
+        self._session_id = None
 
 
 class DropBoxInterface:
     PREFIX = PrefixEnums.DROPBOX.value
+    BATCH_SIZE = 1000
+    DEFAULT_POOL_CONNECTIONS = 8
 
     def __init__(self, **kwargs):
         """Initializes DropBoxInterface instance, creates dbx instance
@@ -47,201 +238,251 @@ class DropBoxInterface:
             raise ValueError('Please specify dropbox app access key')
 
         self._encoding = 'utf8'
-        self._mode = None
-        self._current_path = None
-        self._write_mode = None
-        self.metadata = None
-        self.path = None
-        self.list_recursive = False
-        self.include_folders = False
 
-        self.dbx = dropbox.Dropbox(self.token)
+        # connection pool is sized to the amount of threads using the client
+        max_pool_connections = kwargs.pop('max_pool_connections', None) or self.DEFAULT_POOL_CONNECTIONS
+        self._user_dbx = dropbox.Dropbox(self.token,
+                                         session=dropbox.create_session(max_connections=max_pool_connections))
+        self.dbx = self._user_dbx
+        self._path_root = None
 
         # namespace id starts from root
         if self.root:
             root_namespace_id = self.dbx.users_get_current_account().root_info.root_namespace_id
-            self.dbx = self.dbx.with_path_root(PathRoot.namespace_id(root_namespace_id))
+            self._path_root = PathRoot.namespace_id(root_namespace_id)
+            self.dbx = self.dbx.with_path_root(self._path_root)
 
     @property
-    def path(self):
-        if self._current_path is None:
-            raise ValueError("Path name is not set")
-        return self._current_path
-
-    @path.setter
-    def path(self, value):
-
-        if value is None:
-            self._current_path = None
-        else:
-            value = value.split(self.PREFIX, 1)[-1]
-
-            if value in ('.', ''):
-                self._current_path = ''
-            else:
-                self._current_path = value if value.startswith('/') else f'/{value}'
-                self._current_path = self._current_path[:-1] if self._current_path.endswith('/') else self._current_path
+    def encoding(self) -> str:
+        return self._encoding
 
-    def _detect_path_type(self):
-        """Detects whether given path is file, folder or does not exists"""
-        if self.path == '':
-            self._isdir = True
+    def clone_dbx(self, headers: dict) -> dropbox.Dropbox:
+        """Creates dbx client sharing the session of this interface, which sends the given headers with each request
+        :param headers: additional HTTP headers (e.g. Range), the path root header is kept
+        :return: dropbox.Dropbox instance
+        """
+        dbx = self._user_dbx.clone(headers=headers)
+        if self._path_root is not None:
+            dbx = dbx.with_path_root(self._path_root)
+        return dbx
+
+    @classmethod
+    def _format_path(cls, path: str) -> str:
+        """Returns dropBox api path of given full path ('' for root)"""
+        path = path.split(cls.PREFIX, 1)[-1]
+
+        if path in ('.', ''):
+            return ''
+        path = path if path.startswith('/') else f'/{path}'
+        return path[:-1] if path.endswith('/') else path
+
+    def _get_metadata(self, path: str) -> Optional[Metadata]:
+        """Returns metadata of given dropBox path (None if it does not exists), checks case conflicts"""
+        if path == '':
+            return None
         try:
-            self.metadata = self.dbx.files_get_metadata(self.path)
+            metadata = self.dbx.files_get_metadata(path)
         except (ApiError, ValidationError):
-            self.metadata = None
-
-        if isinstance(self.metadata, FileMetadata):
-            self._isfile = True
-        if isinstance(self.metadata, FolderMetadata):
-            self._isdir = True
-
-        if self._isdir or self._isfile:
-            self._object_exists = True
-            if self.metadata:
-                if self.metadata.path_display != self.path and self.metadata.path_lower == self.path.lower():
-                    raise CaseInsensitivityError(f'DropBox case-insensitivity conflict: The given  {self.path} is'
-                                                 f' the same file(folder) as {self.metadata.path_display}')
-
-    def _populate_listdir(self):
-        """Appends each file.folder name to self._listdir"""
-
-        def __populate_metadata(metadata):
+            return None
+
+        if metadata.path_display != path and metadata.path_lower == path.lower():
+            raise CaseInsensitivityError(f'DropBox case-insensitivity conflict: The given  {path} is'
+                                         f' the same file(folder) as {metadata.path_display}')
+        return metadata
+
+    @staticmethod
+    def _wait_batch_job(launch, check_job):
+        """Returns result of launched batch job, polls the job if it is run asynchronously (None if it failed)"""
+        if not launch.is_async_job_id():
+            return launch.get_complete()
+
+        status = check_job(launch.get_async_job_id())
+        while status.is_in_progress():
+            time.sleep(1)
+            status = check_job(launch.get_async_job_id())
+        return status.get_complete() if status.is_complete() else None
+
+    def _iter_folder_pages(self, path: str, recursive: bool, include_folders: bool) -> Iterator[list]:
+        """Yields names of each file/folder in given folder, page by page"""
+
+        def __page_names(metadata) -> list:
+            names = list()
             for f in metadata.entries:
                 try:
-                    full_path = re.split(add_slash(self.path), f.path_display, flags=re.IGNORECASE, maxsplit=1)[1]
-                    if isinstance(f, FolderMetadata):
-                        if self.include_folders:
-                            self._listdir.append((add_slash(full_path)))
-                    else:
-                        self._listdir.append(full_path)
+                    full_path = re.split(add_slash(path), f.path_display, flags=re.IGNORECASE, maxsplit=1)[1]
                 except IndexError:
                     # failed to split path
                     continue
+                if not full_path:
+                    continue
+                if isinstance(f, FolderMetadata):
+                    if include_folders:
+                        names.append(add_slash(full_path))
+                else:
+                    names.append(full_path)
+            return names
 
-        folder_metadata = self.dbx.files_list_folder(self.path, recursive=self.list_recursive)
-
-        __populate_metadata(metadata=folder_metadata)
+        folder_metadata = self.dbx.files_list_folder(path, recursive=recursive)
+        yield __page_names(folder_metadata)
 
         while folder_metadata.has_more:
-            cur = folder_metadata.cursor
-            folder_metadata = self.dbx.files_list_folder_continue(cur)
-            __populate_metadata(metadata=folder_metadata)
-
-        try:
-            self._listdir.remove('')
-        except ValueError:
-            pass
-
-    def _analyse_path(self, path: str):
-        """From given path lists and detects object type (file/folder)"""
-
-        self._isfile = False
-        self._isdir = False
-        self._listdir = list()
-        self._object_exists = False
-        self._write_mode = None
-
-        self.path = path
+            folder_metadata = self.dbx.files_list_folder_continue(folder_metadata.cursor)
+            yield __page_names(folder_metadata)
 
-        self._detect_path_type()
+    def _list_folder(self, path: str, recursive: bool, include_folders: bool) -> list:
+        """Returns names of each file/folder in given folder"""
+        return [name for page in self._iter_folder_pages(path, recursive, include_folders) for name in page]
 
     def isfile(self, path: str):
         """Checks file existence for given path"""
-        self._analyse_path(path)
-        return self._isfile
+        return isinstance(self._get_metadata(self._format_path(path)), FileMetadata)
 
     def isdir(self, path: str):
         """Checks dictionary existence for given path"""
-        self._analyse_path(path)
-        return self._isdir
+        path = self._format_path(path)
+        return path == '' or isinstance(self._get_metadata(path), FolderMetadata)
+
+    def stat(self, path: str) -> ObjectStat:
+        """Returns size, modification time, content hash and type of given file/folder"""
+        dbx_path = self._format_path(path)
+        metadata = self._get_metadata(dbx_path)
+
+        if isinstance(metadata, FileMetadata):
+            return ObjectStat(path=path, type=ObjectTypeEnums.FILE, size=metadata.size,
+                              mtime=metadata.server_modified.replace(tzinfo=timezone.utc),
+                              etag=metadata.content_hash)
+        if dbx_path == '' or isinstance(metadata, FolderMetadata):
+            return ObjectStat(path=path, type=ObjectTypeEnums.FOLDER)
+        raise FileNotFoundError(f'No such file or dictionary: {path}')
 
     def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False):
         """Lists content for given folder path"""
-        self.list_recursive = recursive
-        self.include_folders = not exclude_folders
-        self._analyse_path(path)
-        if self._isdir:
-            self._populate_listdir()
+        dbx_path = self._format_path(path)
+        metadata = self._get_metadata(dbx_path)
 
-        if not self._object_exists:
+        if dbx_path != '' and metadata is None:
             raise FileNotFoundError(f'No such file or dictionary: {path}')
-        elif not self._isdir:
+        elif isinstance(metadata, FileMetadata):
             raise NotADirectoryError(f"Not a directory: {path}")
-        return self._listdir
-
-    def remove(self, path: str):
-        """Deletes file/folder"""
-        self._analyse_path(path)
-        if not self._object_exists:
-            raise FileNotFoundError(f"Object with path {path} does not exists")
+        return self._list_folder(dbx_path, recursive=recursive, include_folders=not exclude_folders)
 
-        self.dbx.files_delete_v2(self.path)
+    def iterdir_pages(self, path: str, recursive: Optional[bool] = False,
+                      exclude_folders: Optional[bool] = False) -> Iterator[list]:
+        """Yields content of given folder path page by page (one files_list_folder request each)"""
+        dbx_path = self._format_path(path)
+        metadata = self._get_metadata(dbx_path)
 
-    def open(self, path: str, mode: Optional[str] = None):
-        """Opens a file from dropBox and returns the DropBoxInterface object"""
-        self._mode = mode
-        self._analyse_path(path)
-
-        return self
+        if dbx_path != '' and metadata is None:
+            raise FileNotFoundError(f'No such file or dictionary: {path}')
+        elif isinstance(metadata, FileMetadata):
+            raise NotADirectoryError(f"Not a directory: {path}")
+        yield from self._iter_folder_pages(dbx_path, recursive=recursive, include_folders=not exclude_folders)
 
-    def write(self, content: Union[str, bytes], metadata: Optional[dict] = None):
-        """Writes content to file on dropBox
-        :param content: The content that should be written to a file
-        :param metadata:
-        :return: String content of the file specified in the file path argument
+    def scandir(self, path: str) -> Iterator[ObjectStat]:
+        """Yields metadata of each file under given folder (recursively), taken from the listing responses
+        Paths of yielded ObjectStats are relative to the folder, etag is dropBox content hash
         """
+        dbx_path = self._format_path(path)
+        try:
+            folder_metadata = self.dbx.files_list_folder(dbx_path, recursive=True)
+        except ApiError as e:
+            if e.error.is_path() and e.error.get_path().is_not_found():
+                raise FileNotFoundError(f'No such file or dictionary: {path}')
+            raise
+        while True:
+            for f in folder_metadata.entries:
+                if isinstance(f, FileMetadata):
+                    yield ObjectStat(path=f.path_display[len(dbx_path) + 1:], type=ObjectTypeEnums.FILE,
+                                     size=f.size, mtime=f.server_modified.replace(tzinfo=timezone.utc),
+                                     etag=f.content_hash, content_hash=f.content_hash)
+            if not folder_metadata.has_more:
+                break
+            folder_metadata = self.dbx.files_list_folder_continue(folder_metadata.cursor)
 
-        if self._isfile:
-            self._write_mode = WriteMode.overwrite
-            # logger.info('Overwriting {} file'.format(self.path))
+    def remove(self, path: str):
+        """Deletes file/folder"""
+        dbx_path = self._format_path(path)
+        if dbx_path != '' and self._get_metadata(dbx_path) is None:
+            raise FileNotFoundError(f"Object with path {path} does not exists")
 
-        if isinstance(content, str):
-            content = content.encode('utf8')
-        if not metadata:
-            metadata = {}
-        if self._mode is not None and ('w' not in self._mode and
-                                       'a' not in self._mode and
-                                       'x' not in self._mode and
-                                       '+' not in self._mode):
-            raise ValueError(f"Mode '{self._mode}' does not allow writing the file")
+        self.dbx.files_delete_v2(dbx_path)
 
+    def remove_batch(self, paths: list):
+        """Deletes files/folders with batch requests (up to 1000 paths each)
+        :raises BatchOperationError: if some of the paths failed to be deleted
+        """
+        entries = [DeleteArg(self._format_path(path)) for path in paths]
+        failures = dict()
+        for idx in range(0, len(entries), self.BATCH_SIZE):
+            batch = entries[idx:idx + self.BATCH_SIZE]
+            result = self._wait_batch_job(self.dbx.files_delete_batch(batch), self.dbx.files_delete_batch_check)
+            if result is None:
+                failures.update({f'{self.PREFIX}{entry.path.lstrip("/")}': 'Batch job failed' for entry in batch})
+                continue
+            for entry, res in zip(batch, result.entries):
+                if res.is_failure():
+                    failures[f'{self.PREFIX}{entry.path.lstrip("/")}'] = str(res.get_failure())
+        if failures:
+            raise BatchOperationError('Failed to delete dropBox paths', failures)
+
+    def copy(self, from_path: str, to_path: str):
+        """Copies file/folder on server side, existing destination file is overwritten"""
+        from_dbx_path = self._format_path(from_path)
+        to_dbx_path = self._format_path(to_path)
         try:
-            res = self.dbx.files_upload(f=content, path=self.path, mode=self._write_mode)
-            if res.path_display != self.path and res.path_lower == self.path.lower():
-                self.dbx.files_delete_v2(self.path)
-                raise CaseInsensitivityError(f'DropBox case-insensitivity conflict: The given  {self.path} is'
-                                             f' the same file(folder) as {res.path_display}')
-        except ApiError:
-            logger.info(f'Failed to upload {self.path} to dropbox')
-
-    def read(self) -> Union[str, bytes]:
-        """Reads dropBox file and returns the bytes
-        :return: String content of the file
+            self.dbx.files_copy_v2(from_dbx_path, to_dbx_path)
+        except ApiError as e:
+            if e.error.is_from_lookup() and e.error.get_from_lookup().is_not_found():
+                raise FileNotFoundError('No such file: {}'.format(from_path))
+            if not (e.error.is_to() and e.error.get_to().is_conflict() and
+                    e.error.get_to().get_conflict().is_file()):
+                raise
+            self.dbx.files_delete_v2(to_dbx_path)
+            self.dbx.files_copy_v2(from_dbx_path, to_dbx_path)
+
+    def copy_batch(self, from_paths: list, to_paths: list):
+        """Copies files/folders on server side with batch requests (up to 1000 paths each)
+        Failed entries (e.g. existing destination files) are copied one by one
+        :raises BatchOperationError: if some of the paths failed to be copied
         """
-        if not self._isfile:
-            raise FileNotFoundError('No such file: {}'.format(self.path))
-
-        metadata, response = self.dbx.files_download(path=self.path)
-        res = response.content
-        response.close()
-
-        if self._mode is not None and 'b' not in self._mode:
+        entries = [RelocationPath(self._format_path(from_path), self._format_path(to_path))
+                   for from_path, to_path in zip(from_paths, to_paths)]
+        failed = list()
+        for idx in range(0, len(entries), self.BATCH_SIZE):
+            batch = entries[idx:idx + self.BATCH_SIZE]
+            result = self._wait_batch_job(self.dbx.files_copy_batch_v2(batch), self.dbx.files_copy_batch_check_v2)
+            if result is None:
+                failed.extend(batch)
+                continue
+            failed.extend(entry for entry, res in zip(batch, result.entries) if not res.is_success())
+
+        failures = dict()
+        for entry in failed:
             try:
-                res = res.decode(self._encoding)
-            except UnicodeDecodeError:
-                raise ValueError(f"The content cannot be decoded into a string"
-                                 f" with encoding {self._encoding}."
-                                 f" Include 'b' on read mode to return the original bytes")
-        return res
-
-    def __enter__(self):
-        self._is_open = True
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._is_open = False
-        self.path = None
+                self.copy(entry.from_path, entry.to_path)
+            except Exception as e:
+                failures[f'{self.PREFIX}{entry.from_path.lstrip("/")}'] = str(e)
+        if failures:
+            raise BatchOperationError('Failed to copy dropBox paths', failures)
+
+    def open(self, path: str, mode: Optional[str] = None, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+             download_chunk_size: Optional[int] = DEFAULT_DOWNLOAD_CHUNK_SIZE, *args, **kwargs):
+        """Opens a file from dropBox
+        :param path: full path of the file
+        :param mode: open mode
+        :param chunk_size: size of each upload session chunk in bytes (for writing)
+        :param download_chunk_size: size of each chunk read from the download response in bytes (for reading)
+        :return: buffered (or text) DropBoxReader stream for reading, DropBoxWriter stream for writing
+        """
+        dbx_path = self._format_path(path)
+        metadata = self._get_metadata(dbx_path)
+        if mode is not None and set(mode) & set('wax'):
+            return DropBoxWriter(self, dbx_path, metadata=metadata, chunk_size=chunk_size)
+
+        if not isinstance(metadata, FileMetadata):
+            raise FileNotFoundError('No such file: {}'.format(path))
+        raw = DropBoxReader(self, dbx_path, metadata=metadata, chunk_size=download_chunk_size)
+        return open_reader(raw, mode=mode, encoding=self._encoding)
 
 
 if __name__ == '__main__':
@@ -1,26 +1,221 @@
-import os
-import shutil
-
-import cloudstorageio
+import io
 import logging
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 
-from typing import Optional, Union
+from typing import Optional, Union, Tuple, Iterator
+import httplib2
 from pydrive.drive import GoogleDrive
 from pydrive.auth import GoogleAuth
-from googleapiclient.errors import HttpError
+from googleapiclient.discovery import build
+from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload, MediaUpload
 
-from cloudstorageio.enums.enums import PrefixEnums
-from cloudstorageio.tools.ci_collections import add_slash
+from cloudstorageio.enums.enums import PrefixEnums, ObjectTypeEnums
+from cloudstorageio.tools.ci_collections import add_slash, ObjectStat
 from cloudstorageio.tools.logger import logger
 from cloudstorageio.tools.decorators import timer
+from cloudstorageio.tools.streams import DEFAULT_CHUNK_SIZE, ChunkedWriter, open_reader
 from cloudstorageio.configs import resources, CloudInterfaceConfig
 
 # avoiding dependencies' warning
 logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
 
 
+class DriveReader(io.RawIOBase):
+    """Readable raw stream of Google Drive file, returned by GoogleDriveInterface.open for reading
+    Content is downloaded chunk by chunk with MediaIoBaseDownload, so only one chunk is kept in memory
+    """
+
+    def __init__(self, interface: 'GoogleDriveInterface', file_id: str, mimetype: str,
+                 chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE, name: Optional[str] = None):
+        """Initializes DriveReader instance
+        :param interface: GoogleDriveInterface instance, which drive service is used for requests
+        :param file_id: id of the drive file
+        :param mimetype: mime type of the drive file, google docs are exported (see mimetypes_changes)
+        :param chunk_size: size of each downloaded chunk in bytes
+        :param name: name (full path) of the file
+        """
+        super().__init__()
+        self.name = name
+        self.id = file_id
+        self._chunk = io.BytesIO()
+        self._pending = memoryview(b'')  # downloaded, but not yet read part of the last chunk
+        self._done = False
+
+        files = interface.service.files()
+        if mimetype in GoogleDriveInterface.mimetypes_changes:
+            request = files.export_media(fileId=file_id, mimeType=GoogleDriveInterface.mimetypes_changes[mimetype])
+        else:
+            request = files.get_media(fileId=file_id)
+        self._downloader = MediaIoBaseDownload(self._chunk, request, chunksize=chunk_size)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Union[bytearray, memoryview]) -> int:
+        self._checkClosed()
+        view = memoryview(b).cast('B')
+        written = 0
+        while written < len(view):
+            if not self._pending:
+                if self._done:
+                    break
+                self._chunk.seek(0)
+                self._chunk.truncate()
+                _, self._done = self._downloader.next_chunk()
+                self._pending = memoryview(self._chunk.getvalue())
+            n = min(len(view) - written, len(self._pending))
+            view[written:written + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            written += n
+        return written
+
+    def close(self):
+        if not self.closed:
+            self._pending = memoryview(b'')
+            self._chunk = io.BytesIO()
+        super().close()
+
+
+class _ChunkMedia(MediaUpload):
+    """Resumable media of DriveWriter, content is appended while it is uploaded and its size is known at the end
+    Only content after the offset committed by the server is kept
+    """
+
+    def __init__(self, mimetype: str, chunk_size: int):
+        super().__init__()
+        self._mimetype = mimetype
+        self._chunk_size = chunk_size
+        self._data = bytearray()
+        self._start = 0  # offset of the first kept byte
+        self._size = None
+
+    def chunksize(self) -> int:
+        return self._chunk_size
+
+    def mimetype(self) -> str:
+        return self._mimetype
+
+    def size(self) -> Optional[int]:
+        return self._size
+
+    def resumable(self) -> bool:
+        return True
+
+    def has_stream(self) -> bool:
+        return False
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        offset = begin - self._start
+        return bytes(self._data[offset:offset + length])
+
+    def append(self, data: bytes):
+        self._data += data
+
+    def discard(self, offset: int):
+        """Drops content before given (committed) offset"""
+        del self._data[:offset - self._start]
+        self._start = offset
+
+    def pending(self, offset: int) -> int:
+        """Returns amount of content after given offset"""
+        return self._start + len(self._data) - offset
+
+    def finish(self):
+        """Marks appended content as complete, so the next request finishes the upload"""
+        self._size = self._start + len(self._data)
+
+
+class DriveWriter(ChunkedWriter):
+    """Writable raw stream of Google Drive file, returned by GoogleDriveInterface.open for writing
+    Each full chunk is sent to a resumable upload session as soon as it is written, so only one chunk
+    is kept in memory and nothing is written to local disk. Content smaller than one chunk is uploaded
+    with a single request on close
+    """
+    CHUNK_ALIGNMENT = 256 * 1024  # resumable upload chunks should be multiple of 256 KB
+
+    def __init__(self, interface: 'GoogleDriveInterface', path: str, file_id: Optional[str] = None,
+                 chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE, max_retries: Optional[int] = 5):
+        """Initializes DriveWriter instance
+        :param interface: GoogleDriveInterface instance, which drive service is used for requests
+        :param path: drive path of the file (without prefix)
+        :param file_id: id of the existing drive file (it is overwritten), None for a new file
+        :param chunk_size: size of each resumable upload chunk in bytes (rounded up to a multiple of 256 KB)
+        :param max_retries: amount of retries of each request
+        """
+        chunk_size = max(-(-chunk_size // self.CHUNK_ALIGNMENT), 1) * self.CHUNK_ALIGNMENT
+        super().__init__(chunk_size=chunk_size, name=f'{GoogleDriveInterface.PREFIX}{path}',
+                         encoding=interface.encoding)
+        self.path = path
+        self.id = file_id
+        self._interface = interface
+        self._max_retries = max_retries
+        self._title = path.rsplit('/')[-1]
+        self._mimetype = mimetypes.guess_type(self._title)[0] or 'application/octet-stream'
+        self._media = None
+        self._request = None
+
+    def _create_request(self, media: MediaUpload):
+        """Returns insert request of a new file (creating its folders) or update request of the existing one"""
+        files = self._interface.service.files()
+        if self.id:
+            return files.update(fileId=self.id, media_body=media)
+        parent = self.path.rsplit('/', 1)[0] if '/' in self.path else ''
+        folder_id = self._interface._create_folders(parent)
+        return files.insert(body={'title': self._title, 'parents': [{"id": folder_id}]}, media_body=media)
+
+    def _send(self, final: bool):
+        """Sends full chunks of appended content (all content if final), returns response of the last request
+        Not final content is sent only while more than one chunk is kept,
+        so the last request always has content to finish the upload with
+        """
+        response = None
+        while response is None:
+            if not final and self._media.pending(self._request.resumable_progress) <= self._chunk_size:
+                return None
+            _, response = self._request.next_chunk(num_retries=self._max_retries)
+            # the server could commit only a part of the chunk, the rest is sent with the next one
+            self._media.discard(self._request.resumable_progress)
+        return response
+
+    def _upload_chunk(self, chunk: bytes):
+        if self._request is None:
+            self._media = _ChunkMedia(self._mimetype, self._chunk_size)
+            self._request = self._create_request(self._media)
+        self._media.append(chunk)
+        self._send(final=False)
+
+    def _complete(self, last_chunk: bytes):
+        if self._request is None:
+            media = MediaIoBaseUpload(io.BytesIO(last_chunk), mimetype=self._mimetype, resumable=False)
+            response = self._create_request(media).execute(num_retries=self._max_retries)
+        else:
+            self._media.append(last_chunk)
+            self._media.finish()
+            response = self._send(final=True)
+        self.id = response['id']
+        self._interface._cache_set(self.path, self.id, response.get('mimeType', self._mimetype))
+
+    def _abort(self):
+        # not finished resumable session creates no file and expires on the server
+        self._media = None
+        self._request = None
+
+    def upload(self, stream: io.IOBase):
+        """Uploads content of given binary stream chunk by chunk (the file is finished on close)"""
+        self.write(stream)
+
+
 class GoogleDriveInterface:
     PREFIX = PrefixEnums.GOOGLE_DRIVE.value
+    FOLDER_MIMETYPE = 'application/vnd.google-apps.folder'
+    DEFAULT_CACHE_TTL = 60  # seconds
+    DEFAULT_CACHE_SIZE = 10000  # resolved paths
+    LIST_PAGE_SIZE = 1000
 
     mimetypes_changes = {
         'application/vnd.google-apps.document': 'text/plain',
@@ -38,21 +233,19 @@ class GoogleDriveInterface:
             raise ValueError("Please add GOOGLE_DRIVE_CREDENTIALS environment variable"
                              " or set google_drive_credentials_json_path")
 
-        self.tmp_folder = os.path.join(os.path.dirname(os.path.dirname(cloudstorageio.__file__)), 'gdrive_tmp')
-        if os.path.isdir(self.tmp_folder):
-            shutil.rmtree(self.tmp_folder)
-        os.mkdir(path=self.tmp_folder)
-
         self.credentials = self._setup()
         self.drive = GoogleDrive(self.credentials)
         self._encoding = 'utf8'
-        self._mode = None
-        self._current_path = None
-        self._write_mode = None
-        self.metadata = None
-        self.path = None
-        self.recursive = False
-        self.include_folders = False
+
+        # drive path -> (id, mimeType, expiration time) of resolved files/folders
+        # least recently used paths are dropped above google_drive_cache_size
+        self._cache_ttl = kwargs.pop('google_drive_cache_ttl', self.DEFAULT_CACHE_TTL)
+        self._cache_size = kwargs.pop('google_drive_cache_size', self.DEFAULT_CACHE_SIZE)
+        self._id_cache = OrderedDict()
+        self._id_cache_lock = threading.Lock()
+
+        # httplib2.Http is not thread safe, so each thread sends requests with its own service (see service)
+        self._thread_local = threading.local()
 
     def _setup(self):
 
@@ -80,44 +273,107 @@ class GoogleDriveInterface:
             f.write(yaml_string.encode())
 
     @property
-    def path(self):
-        if self._current_path is None:
-            raise ValueError("Path name is not set")
-        return self._current_path
-
-    @path.setter
-    def path(self, value):
-
-        if value is None:
-            self._current_path = None
-        else:
-            value = value.split(self.PREFIX)[-1]
+    def encoding(self) -> str:
+        return self._encoding
 
-            if value in ('.', ''):
-                self._current_path = ''
-            else:
-                self._current_path = value[:-1] if value.endswith('/') else value
-
-    def get_id_from_full_path(self, name: str):
-        """Get di from given file/folder full path"""
-
-        def _find_id(file_obj_list: list, n):
-            for i in file_obj_list:
-                if i['title'] == n:
-                    return i['id']
-            return None
-
-        file_id = None
-        split_name_list = (name.split(self.PREFIX)[-1]).split('/')
-        file_list = self.drive.ListFile({'q': "trashed=false"}).GetList()
-
-        for file_idx, name in enumerate(split_name_list):
-            file_id = _find_id(file_list, name)
-            if not file_id:
+    @property
+    def service(self):
+        """Drive v2 api resource of authorized credentials, built once per thread with its own http connection"""
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            http = self.credentials.credentials.authorize(httplib2.Http())
+            service = build('drive', 'v2', http=http, cache_discovery=False)
+            self._thread_local.service = service
+        return service
+
+    @classmethod
+    def _format_path(cls, path: str) -> str:
+        """Returns drive path of given full path ('' for root)"""
+        path = path.split(cls.PREFIX)[-1]
+
+        if path in ('.', ''):
+            return ''
+        return path[:-1] if path.endswith('/') else path
+
+    def _cache_get(self, path: str) -> Optional[Tuple[str, str]]:
+        """Returns cached (id, mimeType) of given drive path, None if it is not cached or expired"""
+        with self._id_cache_lock:
+            cached = self._id_cache.get(path)
+            if cached is None:
                 return None
-            file_list = self.drive.ListFile({'q': "'{}' in parents and trashed=false".format(file_id)}).GetList()
+            if cached[2] < time.monotonic():
+                del self._id_cache[path]
+                return None
+            self._id_cache.move_to_end(path)
+            return cached[0], cached[1]
+
+    def _cache_set(self, path: str, file_id: str, mimetype: str):
+        with self._id_cache_lock:
+            self._id_cache[path] = (file_id, mimetype, time.monotonic() + self._cache_ttl)
+            self._id_cache.move_to_end(path)
+            while len(self._id_cache) > self._cache_size:
+                self._id_cache.popitem(last=False)
+
+    def _invalidate(self, path: str):
+        """Drops given drive path and everything under it from the cache"""
+        with self._id_cache_lock:
+            for cached_path in list(self._id_cache):
+                if cached_path == path or cached_path.startswith(add_slash(path)):
+                    del self._id_cache[cached_path]
+
+    def _find_first(self, query: str) -> Optional[dict]:
+        """Returns id and mimeType of the first file/folder matching given query, None if nothing matches
+        Request errors (e.g. rate limits) are raised, so they are not mistaken for missing files
+        """
+        response = self.service.files().list(q=query, maxResults=1, fields='items(id,mimeType)').execute()
+        items = response.get('items', [])
+        return items[0] if items else None
+
+    @staticmethod
+    def _escape(title: str) -> str:
+        return title.replace('\\', '\\\\').replace("'", "\\'")
+
+    def _find_child(self, parent_id: str, title: str) -> Optional[dict]:
+        """Returns id and mimeType of not trashed file/folder with given title in given folder"""
+        return self._find_first(f"title = '{self._escape(title)}' and '{parent_id}' in parents and trashed = false")
+
+    def _find_shared(self, title: str) -> Optional[dict]:
+        """Returns id and mimeType of not trashed file/folder with given title shared with the user"""
+        return self._find_first(f"title = '{self._escape(title)}' and sharedWithMe and trashed = false")
+
+    def _resolve(self, path: str) -> Optional[Tuple[str, str]]:
+        """Returns (id, mimeType) of given drive path ('' for root), None if it does not exist
+        Starts from the deepest cached folder and sends one request per not cached path component,
+        the first component is searched in items shared with the user if it is missing in the root folder
+        """
+        if path == '':
+            return 'root', self.FOLDER_MIMETYPE
+
+        names = path.split('/')
+        resolved = ('root', self.FOLDER_MIMETYPE)
+        start = 0
+        for idx in range(len(names), 0, -1):
+            cached = self._cache_get('/'.join(names[:idx]))
+            if cached is not None:
+                resolved, start = cached, idx
+                break
+
+        for idx in range(start, len(names)):
+            if resolved[1] != self.FOLDER_MIMETYPE:
+                return None
+            child = self._find_child(resolved[0], names[idx])
+            if child is None and idx == 0:
+                child = self._find_shared(names[idx])
+            if child is None:
+                return None
+            resolved = (child['id'], child['mimeType'])
+            self._cache_set('/'.join(names[:idx + 1]), *resolved)
+        return resolved
 
-        return file_id
+    def get_id_from_full_path(self, name: str) -> Optional[str]:
+        """Get id from given file/folder full path"""
+        resolved = self._resolve(self._format_path(name))
+        return resolved[0] if resolved else None
 
     def get_full_path_from_id(self, file_id: str):
         """Get full path of given file(folder) id"""
@@ -138,156 +394,146 @@ class GoogleDriveInterface:
 
             file_id = parent_id
 
-    def _detect_path_type(self):
-        """Detects whether given path is file, folder or does not exists"""
-
-        if self.path == '':
-            self._isdir = True
-        if self._object_exists:
-            drive_file_obj = self.drive.CreateFile({'id': self.id})
-            if drive_file_obj['mimeType'] == 'application/vnd.google-apps.folder':
-                self._isdir = True
+    def _list_children(self, folder_id: str, fields: Optional[str] = 'id,title,mimeType'):
+        """Yields given fields (by default id, title and mimeType) of each not trashed file/folder in given folder,
+        page by page"""
+        request = self.service.files().list(q=f"'{folder_id}' in parents and trashed = false",
+                                            maxResults=self.LIST_PAGE_SIZE,
+                                            fields=f'nextPageToken, items({fields})')
+        while request is not None:
+            response = request.execute()
+            yield from response.get('items', [])
+            request = self.service.files().list_next(request, response)
+
+    def _populate_listdir(self, listdir: list, folder_id: str, recursive: bool, include_folders: bool,
+                          folder_path: str, parent: Optional[str] = ''):
+        """Appends each file.folder name to given listdir, caches ids of listed folders
+        Request errors are raised, so a failed page never results in a partial listing
+        """
+        for f in self._list_children(folder_id):
+            if f['mimeType'] == self.FOLDER_MIMETYPE:
+                p = parent + add_slash(f['title'])
+                self._cache_set(f"{add_slash(folder_path) if folder_path else ''}{p[:-1]}", f['id'], f['mimeType'])
+                if include_folders:
+                    listdir.append(p)
+                if recursive:
+                    self._populate_listdir(listdir, f['id'], recursive, include_folders, folder_path, parent=p)
             else:
-                self._isfile = True
-
-    def _populate_listdir(self, folder_id: str, parent: Optional[str] = ''):
-        """Appends each file.folder name to self._listdir"""
-        try:
-            file_list = self.drive.ListFile({'q': "'{}' in parents and trashed=false".format(folder_id)}).GetList()
-            for f in file_list:
-                if f['mimeType'] == 'application/vnd.google-apps.folder':
-                    p = parent + add_slash(f['title'])
-                    if self.include_folders:
-                        self._listdir.append(p)
-                    if self.recursive:
-                        self._populate_listdir(f['id'], parent=p)
-                else:
-                    full_path = os.path.join(parent, f['title'])
-                    self._listdir.append(full_path)
-
-        except HttpError:
-            pass
-
-    def _analyse_path(self, path: str):
-        """From given path lists and detects object type (file/folder)"""
-
-        self._isfile = False
-        self._isdir = False
-        self._listdir = list()
-        self._object_exists = False
+                full_path = os.path.join(parent, f['title'])
+                listdir.append(full_path)
 
-        self.path = path
-
-        self.id = self.get_id_from_full_path(self.path)
-        self._object_exists = True if self.id else False
-
-        self._detect_path_type()
-        self._populate_listdir(folder_id=self.id)
+    @staticmethod
+    def _parse_date(date: str) -> datetime:
+        """Returns timezone aware datetime of given drive api (RFC 3339) date"""
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc)
 
     def isfile(self, path: str):
         """Checks file existence for given path"""
-        self._analyse_path(path)
-        return self._isfile
+        resolved = self._resolve(self._format_path(path))
+        return resolved is not None and resolved[1] != self.FOLDER_MIMETYPE
 
     def isdir(self, path: str):
         """Checks dictionary existence for given path"""
-        self._analyse_path(path)
-        return self._isdir
+        resolved = self._resolve(self._format_path(path))
+        return resolved is not None and resolved[1] == self.FOLDER_MIMETYPE
+
+    def stat(self, path: str) -> ObjectStat:
+        """Returns size, modification time, md5 and type of given file/folder
+        Costs one metadata request for files (after path resolution), google docs have no size and md5
+        :param path: full path of file/folder
+        :return: ObjectStat of given path
+        """
+        resolved = self._resolve(self._format_path(path))
+        if resolved is None:
+            raise FileNotFoundError(f'No such file or dictionary: {path}')
+        if resolved[1] == self.FOLDER_MIMETYPE:
+            return ObjectStat(path=path, type=ObjectTypeEnums.FOLDER)
+
+        f = self.service.files().get(fileId=resolved[0],
+                                     fields='fileSize,modifiedDate,md5Checksum,mimeType').execute()
+        return ObjectStat(path=path, type=ObjectTypeEnums.FILE, size=int(f['fileSize']) if 'fileSize' in f else None,
+                          mtime=self._parse_date(f['modifiedDate']), etag=f.get('md5Checksum'),
+                          md5=f.get('md5Checksum'))
 
     def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False):
         """Lists content for given folder path"""
-        self.recursive = recursive
-        self.include_folders = not exclude_folders
-        self._analyse_path(path)
+        drive_path = self._format_path(path)
+        resolved = self._resolve(drive_path)
 
-        if not self._object_exists:
+        if resolved is None:
             raise FileNotFoundError(f'No such file or dictionary: {path}')
-        elif not self._isdir:
+        elif resolved[1] != self.FOLDER_MIMETYPE:
             raise NotADirectoryError(f"Not a directory: {path}")
 
-        return self._listdir
+        listdir = list()
+        self._populate_listdir(listdir, folder_id=resolved[0], recursive=recursive,
+                               include_folders=not exclude_folders, folder_path=drive_path)
+        return listdir
 
-    def remove(self, path: str):
-        self._analyse_path(path)
-        # TODO
-
-    def open(self, path: str, mode: Optional[str] = None):
-        """Opens a file from Google Drive and returns the GoogleDriveInterface object"""
-        self._mode = mode
-        self._analyse_path(path)
-        return self
-
-    def _create_folders(self, path: str):
-        pass
-
-    def write(self, content: Union[str, bytes], metadata: Optional[dict] = None):
-        """Writes content to file on google drive
-        :param content: The content that should be written to a file
-        :param metadata:
-        :return: String content of the file specified in the file path argument
+    def scandir(self, path: str) -> Iterator[ObjectStat]:
+        """Yields metadata of each file under given folder (recursively), taken from the listing responses
+        Paths of yielded ObjectStats are relative to the folder, google docs have no size and md5
         """
+        resolved = self._resolve(self._format_path(path))
+        if resolved is None:
+            raise FileNotFoundError(f'No such file or dictionary: {path}')
+        elif resolved[1] != self.FOLDER_MIMETYPE:
+            raise NotADirectoryError(f"Not a directory: {path}")
 
-        if isinstance(content, str):
-            content = content.encode(self._encoding)
-
-        if not metadata:
-            metadata = {}
-        if self._mode is not None and ('w' not in self._mode and
-                                       'a' not in self._mode and
-                                       'x' not in self._mode and
-                                       '+' not in self._mode):
-            raise ValueError(f"Mode '{self._mode}' does not allow writing the file")
-
-        if self._isfile:
-            # logger.info('Overwriting {} file'.format(self.path))
-            file = self.drive.CreateFile({'id': self.id})
-        else:
-            folder_id = self.get_id_from_full_path(self.path.rsplit('/', 1)[0])
-            if not folder_id:
-                self._create_folders(self.path)
-            file = self.drive.CreateFile({'title': self.path.rsplit('/')[-1], 'parents': [{"id": folder_id}]})
-
-        tmp_file_path = os.path.join(self.tmp_folder, self.path.rsplit('/')[-1])
-
-        with open(tmp_file_path, 'wb') as f:
-            f.write(content)
-
-        file.SetContentFile(tmp_file_path)
-        file.Upload()
-        os.remove(tmp_file_path)
+        folders = [(resolved[0], '')]
+        while folders:
+            folder_id, parent = folders.pop()
+            for f in self._list_children(folder_id, fields='id,title,mimeType,fileSize,modifiedDate,md5Checksum'):
+                if f['mimeType'] == self.FOLDER_MIMETYPE:
+                    folders.append((f['id'], parent + add_slash(f['title'])))
+                    continue
+                yield ObjectStat(path=parent + f['title'], type=ObjectTypeEnums.FILE,
+                                 size=int(f['fileSize']) if 'fileSize' in f else None,
+                                 mtime=self._parse_date(f['modifiedDate']),
+                                 etag=f.get('md5Checksum'), md5=f.get('md5Checksum'))
 
-    def read(self) -> Union[str, bytes]:
-        """Reads google drive file and returns the bytes
-        :return: String content of the file
+    def remove(self, path: str):
+        """Deletes file/folder"""
+        drive_path = self._format_path(path)
+        resolved = self._resolve(drive_path)
+        if resolved is None:
+            raise FileNotFoundError(f"Object with path {path} does not exists")
+
+        self.service.files().delete(fileId=resolved[0]).execute()
+        self._invalidate(drive_path)
+
+    def open(self, path: str, mode: Optional[str] = None, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+             *args, **kwargs):
+        """Opens a file from Google Drive
+        :param path: full path of the file
+        :param mode: open mode
+        :param chunk_size: size of each downloaded/uploaded chunk in bytes
+        :return: buffered (or text) DriveReader stream for reading, DriveWriter stream for writing
         """
-        if not self._isfile:
-            raise FileNotFoundError('No such file: {}'.format(self.path))
-
-        file = self.drive.CreateFile({'id': self.id})
-        tmp_file_path = os.path.join(self.tmp_folder, self.path.rsplit('/')[-1])
-
-        if file['mimeType'] in self.mimetypes_changes:
-            download_mimetype = self.mimetypes_changes[file['mimeType']]
-            file.GetContentFile(tmp_file_path, mimetype=download_mimetype)
-        else:
-            file.GetContentFile(tmp_file_path)
-        with open(tmp_file_path, 'rb') as f:
-            res = f.read()
-        os.remove(tmp_file_path)
-
-        if self._mode is not None and 'b' not in self._mode:
-            try:
-                res = res.decode(self._encoding)
-            except UnicodeDecodeError:
-                raise ValueError(f"The content cannot be decoded into a string"
-                                 f" with encoding {self._encoding}."
-                                 f" Include 'b' on read mode to return the original bytes")
-        return res
-
-    def __enter__(self):
-        self._is_open = True
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._is_open = False
-        self.path = None
+        drive_path = self._format_path(path)
+        file_id, mimetype = self._resolve(drive_path) or (None, None)
+        isfile = file_id is not None and mimetype != self.FOLDER_MIMETYPE
+        if mode is not None and set(mode) & set('wax'):
+            return DriveWriter(self, drive_path, file_id=file_id if isfile else None, chunk_size=chunk_size)
+
+        if not isfile:
+            raise FileNotFoundError('No such file: {}'.format(path))
+        raw = DriveReader(self, file_id, mimetype, chunk_size=chunk_size, name=f'{self.PREFIX}{drive_path}')
+        return open_reader(raw, mode=mode, encoding=self._encoding)
+
+    def _create_folders(self, path: str) -> str:
+        """Creates missing folders of given drive folder path, returns id of the last one"""
+        if path == '':
+            return 'root'
+        resolved = self._resolve(path)
+        if resolved is not None:
+            if resolved[1] != self.FOLDER_MIMETYPE:
+                raise NotADirectoryError(f"Not a directory: {self.PREFIX}{path}")
+            return resolved[0]
+
+        parent, _, title = path.rpartition('/')
+        parent_id = self._create_folders(parent)
+        body = {'title': title, 'mimeType': self.FOLDER_MIMETYPE, 'parents': [{'id': parent_id}]}
+        folder_id = self.service.files().insert(body=body, fields='id').execute()['id']
+        self._cache_set(path, folder_id, self.FOLDER_MIMETYPE)
+        return folder_id
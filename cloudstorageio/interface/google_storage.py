@@ -1,26 +1,197 @@
 """ Class GoogleStorageInterface handles with Google Cloud Storage files/folders
 
     Class GoogleStorageInterface has
-                                    read and write methods (can be accessed by open method)
+                                    open method, which returns seekable GoogleStorageReader stream for reading
+                                        (ranged downloads) and GoogleStorageWriter stream for writing
+                                        (chunked resumable upload)
                                     isfile and isdir methods for checking object status (file, folder)
-                                    listdir method for listing folder's content
+                                    stat method for getting object metadata with O(1) requests
+                                    listdir method for listing folder's content (server side for non-recursive listing)
                                     remove method for removing file/folder
     Google Storage API itself doesn't have any concept of a "folder".
         In GoogleStorageInterface you can differentiate file/folder like in local environment
+
+    GoogleStorageInterface keeps no path specific state, one instance (and its client) can be shared between threads
 """
 
+import base64
 import io
 import os
-from typing import Tuple, Union, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Optional, Iterator, Union
+from urllib.parse import quote
+
+import google.auth
+import requests
+from google.api_core.exceptions import GoogleAPICallError, NotFound
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
-
-from cloudstorageio.enums.enums import PrefixEnums
-from cloudstorageio.tools.ci_collections import add_slash
+from google.resumable_media import InvalidResponse
+from google.resumable_media.requests import ResumableUpload
+
+from cloudstorageio.enums.enums import PrefixEnums, ObjectTypeEnums
+from cloudstorageio.exceptions import BatchOperationError
+from cloudstorageio.tools.ci_collections import add_slash, ObjectStat
+from cloudstorageio.tools.streams import RangeReader, ChunkedWriter, open_reader, DEFAULT_BLOCK_SIZE, \
+    DEFAULT_READAHEAD, DEFAULT_CHUNK_SIZE
 from cloudstorageio.tools.logger import logger
 
 
+class GoogleStorageReader(RangeReader):
+    """Seekable raw stream of Google Cloud Storage blob, content is fetched with ranged downloads"""
+
+    def __init__(self, blob: storage.Blob, block_size: Optional[int] = DEFAULT_BLOCK_SIZE,
+                 readahead: Optional[int] = DEFAULT_READAHEAD):
+        """Initializes GoogleStorageReader instance
+        :param blob: blob with loaded metadata (its generation is used for all downloads)
+        :param block_size: size of each ranged download in bytes
+        :param readahead: amount of blocks prefetched in background on sequential reading (0 for no prefetch)
+        """
+        super().__init__(size=blob.size, name=f"{GoogleStorageInterface.PREFIX}{blob.bucket.name}/{blob.name}",
+                         block_size=block_size, readahead=readahead)
+        self._blob = blob
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        return self._blob.download_as_bytes(start=start, end=end)
+
+
+class _UploadBuffer:
+    """Readable stream of not yet committed upload content, with absolute positions of the whole upload
+    ResumableUpload reads chunks from it and seeks back to the committed offset on recovery
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._start = 0  # absolute position of the first kept byte
+        self._position = 0
+
+    def append(self, data: bytes):
+        self._data += data
+
+    def discard(self, position: int):
+        """Drops content before given (committed) position"""
+        position = min(position, self._position)
+        del self._data[:position - self._start]
+        self._start = position
+
+    def unread(self) -> int:
+        return self._start + len(self._data) - self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, position: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            position += self._start + len(self._data)
+        if not self._start <= position <= self._start + len(self._data):
+            raise ValueError(f'Position {position} is not kept in the upload buffer')
+        self._position = position
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        offset = self._position - self._start
+        data = bytes(self._data[offset:] if size < 0 else self._data[offset:offset + size])
+        self._position += len(data)
+        return data
+
+
+class GoogleStorageWriter(ChunkedWriter):
+    """Writable raw stream of Google Cloud Storage blob, returned by GoogleStorageInterface.open for writing
+    Content is sent chunk by chunk to a resumable upload session (google.resumable_media ResumableUpload),
+    which retries transient errors. A chunk, which still fails, is sent again from the offset committed by the server.
+    Content smaller than one chunk is uploaded with a single request
+    """
+    CHUNK_ALIGNMENT = 256 * 1024  # resumable upload chunks should be multiple of 256 KB
+    UPLOAD_URL = 'https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o?uploadType=resumable'
+    DEFAULT_TIMEOUT = (61, 60)  # seconds to connect and to wait for the response of each request
+
+    def __init__(self, interface: 'GoogleStorageInterface', bucket: storage.Bucket, blob_name: str,
+                 chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE, content_type: Optional[str] = None,
+                 max_retries: Optional[int] = 5, timeout: Optional[Union[float, tuple]] = DEFAULT_TIMEOUT):
+        """Initializes GoogleStorageWriter instance
+        :param interface: GoogleStorageInterface instance, which client and session are used for requests
+        :param bucket: bucket handle of the file
+        :param blob_name: blob name in the bucket
+        :param chunk_size: size of each uploaded chunk in bytes (rounded up to a multiple of 256 KB)
+        :param content_type: content type of written blob
+        :param max_retries: amount of recoveries for each chunk, after retries of ResumableUpload are exhausted
+        :param timeout: timeout of each request in seconds, or (connect, read) timeouts
+        """
+        chunk_size = max(-(-chunk_size // self.CHUNK_ALIGNMENT), 1) * self.CHUNK_ALIGNMENT
+        super().__init__(chunk_size=chunk_size, name=f"{GoogleStorageInterface.PREFIX}{bucket.name}/{blob_name}",
+                         encoding=interface.encoding)
+        self._client = interface.client
+        self._session = interface.session
+        self._blob = bucket.blob(blob_name)
+        self._content_type = content_type
+        self._max_retries = max_retries
+        self._timeout = timeout
+        self._stream = _UploadBuffer()
+        self._upload = ResumableUpload(self.UPLOAD_URL.format(bucket=quote(bucket.name, safe='')), chunk_size)
+
+    @property
+    def path(self) -> str:
+        return self.name
+
+    def _transmit(self, final: bool):
+        """Sends buffered full chunks (and the rest of content if final), recovering failed chunks
+        Not final chunks are sent only in full size, as a shorter one finishes the upload
+        """
+        retries = 0
+        while not self._upload.finished:
+            try:
+                if self._upload.invalid:
+                    # asks the server for the committed offset and seeks the stream to it
+                    self._upload.recover(self._session)
+                if not final and self._stream.unread() < self._chunk_size:
+                    break
+                self._upload.transmit_next_chunk(self._session, timeout=self._timeout)
+            except (InvalidResponse, requests.exceptions.RequestException) as e:
+                retries += 1
+                if retries > self._max_retries:
+                    raise IOError(f'Failed to upload chunk of {self.path} '
+                                  f'after {self._max_retries} retries: {e}') from e
+                logger.warning(f'Retrying chunk of {self.path} ({retries}/{self._max_retries}): {e}')
+                time.sleep(min(2 ** retries, 32))
+                if not self._upload.invalid:
+                    self._stream.seek(self._upload.bytes_uploaded)
+                continue
+            retries = 0
+            # the server could commit only a part of the chunk, the rest is sent with the next one
+            self._stream.seek(self._upload.bytes_uploaded)
+            self._stream.discard(self._upload.bytes_uploaded)
+
+    def _upload_chunk(self, chunk: bytes):
+        self._stream.append(chunk)
+        if self._upload.resumable_url is None:
+            self._upload.initiate(self._session, self._stream, metadata={'name': self._blob.name},
+                                  content_type=self._content_type or 'application/octet-stream',
+                                  stream_final=False, timeout=self._timeout)
+        self._transmit(final=False)
+
+    def _complete(self, last_chunk: bytes):
+        if self._upload.resumable_url is None:
+            self._blob.upload_from_string(last_chunk, content_type=self._content_type, client=self._client,
+                                          timeout=self._timeout)
+            return
+        self._stream.append(last_chunk)
+        self._transmit(final=True)
+
+    def _abort(self):
+        if self._upload.resumable_url is not None and not self._upload.finished:
+            # cancels the resumable upload session, server responds with 499
+            try:
+                self._session.delete(self._upload.resumable_url, timeout=self._timeout)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f'Failed to cancel upload of {self.path}: {e}')
+
+
 class GoogleStorageInterface:
     PREFIX = PrefixEnums.GOOGLE_CLOUD.value
+    DELETE_BATCH_SIZE = 100
+    DELETE_WORKERS = 8
+    DEFAULT_POOL_CONNECTIONS = 10
 
     def __init__(self, **kwargs):
         """Initializes GoogleStorageInterface instance, creates storage client
@@ -35,208 +206,258 @@ class GoogleStorageInterface:
                                          " or set google_credentials_json_path")
 
         self._encoding = 'utf8'
-        self._mode = None
-        self._current_bucket = None
-        self._current_path = None
-        self._bucket = None
-        self._blob = None
-        self.path = None
-        self._is_open = False
-        self.only_bucket = False
-        self._storage_client = storage.Client()
-
-    @property
-    def path(self):
-        if self._current_bucket is None:
-            raise ValueError("Bucket name is not set")
-        if self._current_path is None:
-            raise ValueError("Path name is not set")
-        return f"{GoogleStorageInterface.PREFIX}{self._current_bucket}/{self._current_path}"
-
-    @path.setter
-    def path(self, value):
-        if value is None:
-            self._current_path = None
-            self._current_bucket = None
-        else:
-            value = value[:-1] if value.endswith('/') else value
-            self._current_bucket, self._current_path = self._parse_bucket(value)
-            self._current_path_with_backslash = add_slash(self._current_path)
-
-    def _detect_blob_object_type(self):
-        """Hidden method for detecting given blob object type (file or folder)
-        :return:
-        """
-        if self._current_path in self._blob_key_names_list:
-            self._isfile = True
-            self._blob_key_names_list.remove(self._current_path)
-
-        if self._blob_key_names_list:
-            self._isdir = True
-
-    def _populate_listdir(self, blob_name):
-        """Appends each blob inner name to self._listdir for bucket case
-        :param blob_name: storage.blob.Blob object
-        :return:
-        """
-        split_list = blob_name.split('/', 1)
-        if len(split_list) == 2:
-            inner_object_name = add_slash(split_list[0])
-        else:
-            inner_object_name = split_list[0]
 
-        if inner_object_name not in self._listdir:
-            self._listdir.append(inner_object_name)
+        # one authorized session is used by the client and by resumable uploads of writers,
+        # its connection pool is sized to the amount of threads using it:
+        # each of max_pool_connections threads could run readahead threads of its reader
+        credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
+        self._session = AuthorizedSession(credentials)
+        threads = kwargs.pop('max_pool_connections', None) or self.DEFAULT_POOL_CONNECTIONS
+        max_pool_connections = threads * (DEFAULT_READAHEAD + 1)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_pool_connections,
+                                                pool_maxsize=max_pool_connections)
+        self._session.mount('https://', adapter)
+        self._storage_client = storage.Client(credentials=credentials, _http=self._session)
+        self._buckets = dict()
 
-    def _init_path(self, path: str):
-        """Initializes path specific fields"""
-        self._isfile = False
-        self._isdir = False
-        self._listdir = list()
-        self._object_exists = False
-        self.only_bucket = False
-
-        self.path = path
-        self._bucket = self._storage_client.get_bucket(self._current_bucket)
-
-        self._blob_objects = self._bucket.list_blobs(prefix=self._current_path)
+    @property
+    def encoding(self) -> str:
+        return self._encoding
 
-        self._blob_key_names_list = [obj.name for obj in self._blob_objects]
+    @property
+    def client(self) -> storage.Client:
+        return self._storage_client
 
-    def _analyse_path(self, path: str):
-        """From given path creates bucket, blob objects, lists and detects object type (file/folder)
+    @property
+    def session(self) -> AuthorizedSession:
+        """Authorized requests session of the client"""
+        return self._session
+
+    def _get_bucket(self, bucket_name: str) -> storage.Bucket:
+        """Returns cached bucket handle for given bucket name (without any API request)"""
+        bucket = self._buckets.get(bucket_name)
+        if bucket is None:
+            bucket = self._buckets[bucket_name] = self._storage_client.bucket(bucket_name)
+        return bucket
+
+    def _folder_exists(self, bucket: storage.Bucket, blob_name: str) -> bool:
+        """Checks whether any blob exists under given name as a folder (single max_results=1 request)"""
+        blob_iterator = bucket.list_blobs(prefix=add_slash(blob_name), delimiter='/', max_results=1)
+        blobs = list(blob_iterator)
+        return bool(blobs or blob_iterator.prefixes)
+
+    def stat(self, path: str) -> ObjectStat:
+        """Returns size, modification time, ETag and type of given file/folder
+        Costs one metadata request for files and one more listing request for folders
+        (only the listing request for folder paths ending with '/')
         :param path: full path of file/folder
-        :return:
+        :return: ObjectStat of given path
         """
-
-        self._init_path(path)
-
-        if self.only_bucket:
-            self._isdir = True
-        else:
-            self._detect_blob_object_type()
-            self._blob_key_names_list = [f.split(self._current_path_with_backslash, 1)[1] for f in self._blob_key_names_list
-                                         if len(f.split(self._current_path_with_backslash, 1)) == 2]
-
-        while '' in self._blob_key_names_list:
-            self._blob_key_names_list.remove('')
-
-        for blob in self._blob_key_names_list:
-            self._populate_listdir(blob)
-
-        if self._isdir or self._isfile:
-            self._object_exists = True
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        bucket = self._get_bucket(bucket_name)
+        if blob_name and not path.endswith('/'):
+            blob = bucket.get_blob(blob_name)
+            if blob is not None:
+                return ObjectStat(path=path, type=ObjectTypeEnums.FILE, size=blob.size, mtime=blob.updated,
+                                  etag=blob.etag)
+        if not blob_name or self._folder_exists(bucket, blob_name):
+            return ObjectStat(path=path, type=ObjectTypeEnums.FOLDER)
+
+        raise FileNotFoundError(f'No such file or dictionary: {path}')
 
     def isfile(self, path: str):
         """Checks file existence for given path"""
-        self._analyse_path(path)
-        return self._isfile
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        return bool(blob_name) and self._get_bucket(bucket_name).blob(blob_name).exists()
 
     def isdir(self, path: str):
         """Checks dictionary existence for given path"""
-        self._analyse_path(path)
-        return self._isdir
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        return not blob_name or self._folder_exists(self._get_bucket(bucket_name), blob_name)
+
+    def _iter_listing(self, path: str, recursive: bool) -> Iterator[Tuple[list, list]]:
+        """Yields (file names, new folder names) of each listing page of given folder
+        :raises FileNotFoundError/NotADirectoryError: after the last page, if the path is not a folder
+        """
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        bucket = self._get_bucket(bucket_name)
+        prefix = add_slash(blob_name) if blob_name else ''
+        object_exists = not blob_name
+        seen_folders = set()
+
+        blob_iterator = bucket.list_blobs(prefix=prefix, delimiter=None if recursive else '/')
+        for page in blob_iterator.pages:
+            files, folders = list(), list()
+            for folder_prefix in getattr(page, 'prefixes', ()):
+                object_exists = True
+                folders.append(folder_prefix[len(prefix):])
+
+            for blob in page:
+                object_exists = True
+                name = blob.name[len(prefix):]
+                if recursive:
+                    split_list = name.split('/', 1)
+                    if len(split_list) == 2 and add_slash(split_list[0]) not in seen_folders:
+                        seen_folders.add(add_slash(split_list[0]))
+                        folders.append(add_slash(split_list[0]))
+                if name and not name.endswith('/'):
+                    files.append(name)
+            if files or folders:
+                yield files, folders
+
+        if not object_exists:
+            if bucket.blob(blob_name).exists():
+                raise NotADirectoryError(f'Not a directory: {path}')
+            raise FileNotFoundError(f'No such file or dictionary: {path}')
 
     def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False) -> list:
         """Checks given dictionary's existence and lists content
+        Non-recursive listing is done on server side with '/' delimiter,
+        so its cost depends only on the amount of direct children
         :param path: full path of gs object (file/folder)
         :param recursive: list content fully
         :param exclude_folders:
         :return:
         """
-        self._analyse_path(path)
         include_folders = not exclude_folders
+        files = list()
+        folders = list()
+        for page_files, page_folders in self._iter_listing(path, recursive):
+            files += page_files
+            folders += page_folders
+
         if recursive:
-            if include_folders:
-                folders = [f for f in self._listdir if f.endswith('/')]
-                result = self._blob_key_names_list + folders
-            else:
-                result = [f for f in self._blob_key_names_list if not f.endswith('/')]
-        else:
-            if include_folders:
-                result = self._listdir
-            else:
-                result = [f for f in self._listdir if not f.endswith('/')]
-
-        if not self._object_exists:
-            raise FileNotFoundError(f'No such file or dictionary: {path}')
-        elif not self._isdir:
-            raise NotADirectoryError(f'Not a directory: {path}')
+            return files + folders if include_folders else files
+        return sorted(files + folders) if include_folders else files
 
-        return result
+    def iterdir_pages(self, path: str, recursive: Optional[bool] = False,
+                      exclude_folders: Optional[bool] = False) -> Iterator[list]:
+        """Yields content of given folder path page by page (one listing request each),
+        names are the same as of listdir, but not sorted across pages
+        """
+        for files, folders in self._iter_listing(path, recursive):
+            yield files + folders if not exclude_folders else files
+
+    def scandir(self, path: str) -> Iterator[ObjectStat]:
+        """Yields metadata of each file under given folder (recursively), taken from the listing responses
+        Paths of yielded ObjectStats are relative to the folder, md5 is not known for composite objects
+        """
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        prefix = add_slash(blob_name) if blob_name else ''
+        for blob in self._get_bucket(bucket_name).list_blobs(prefix=prefix):
+            name = blob.name[len(prefix):]
+            if not name or name.endswith('/'):
+                continue
+            md5 = base64.b64decode(blob.md5_hash).hex() if blob.md5_hash else None
+            yield ObjectStat(path=name, type=ObjectTypeEnums.FILE, size=blob.size, mtime=blob.updated,
+                             etag=blob.etag, md5=md5, crc32c=blob.crc32c)
+
+    def _delete_blobs(self, blobs: list) -> dict:
+        """Deletes given blobs with a single batch request (up to 100 blobs)
+        :return: full path -> error message of each blob, which failed to be deleted
+        """
+        try:
+            with self._storage_client.batch():
+                for blob in blobs:
+                    blob.delete()
+            return dict()
+        except GoogleAPICallError:
+            pass
+
+        # batch reports only the first failure, so blobs are deleted one by one to find all of them
+        failures = dict()
+        for blob in blobs:
+            try:
+                blob.delete()
+            except NotFound:
+                continue
+            except GoogleAPICallError as e:
+                failures[f'{self.PREFIX}{blob.bucket.name}/{blob.name}'] = str(e)
+        return failures
 
     def remove(self, path: str):
-        """Removes file/folder"""
-        self._analyse_path(path)
-        if not self._object_exists:
+        """Removes file/folder
+        Folder's blobs are deleted with batch requests (100 blobs each) in parallel with the listing
+        :raises BatchOperationError: if some of the blobs failed to be deleted
+        """
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        bucket = self._get_bucket(bucket_name)
+        object_exists = False
+
+        blob = bucket.get_blob(blob_name) if blob_name else None
+        if blob is not None:
+            blob.delete()
+            object_exists = True
+
+        with ThreadPoolExecutor(max_workers=self.DELETE_WORKERS) as executor:
+            futures = list()
+            for page in bucket.list_blobs(prefix=add_slash(blob_name) if blob_name else '').pages:
+                blobs = list(page)
+                for idx in range(0, len(blobs), self.DELETE_BATCH_SIZE):
+                    futures.append(executor.submit(self._delete_blobs, blobs[idx:idx + self.DELETE_BATCH_SIZE]))
+                    object_exists = True
+            failures = dict()
+            for future in futures:
+                failures.update(future.result())
+
+        if not object_exists and blob_name:
             raise FileNotFoundError(f'No such file or dictionary: {path}')
-
-        blob_objects = self._bucket.list_blobs(prefix=self._current_path)
-
-        for obj in blob_objects:
-            obj.delete()
-
-    def open(self, path: str, mode: Optional[str] = None, *args, **kwargs):
-        """Opens a file from gs and return the GoogleStorageInterface object"""
-        self._mode = mode
-        self._analyse_path(path)
-        return self
-
-    def read(self) -> Union[str, bytes]:
-        """ Reads gs file and return the bytes
-        :return: String content of the file
+        if failures:
+            raise BatchOperationError(f'Failed to delete blobs of {path}', failures)
+
+    def copy(self, from_path: str, to_path: str):
+        """Copies file on server side with rewrite requests, content is not transferred through the host
+        Big objects (or copies between locations/storage classes) take several requests, continued by the token
+        :param from_path: full path of source file
+        :param to_path: full path of destination file
         """
-        if not self._isfile:
-            raise FileNotFoundError('No such file: {}'.format(self.path))
-
-        self._blob = self._bucket.get_blob(self._current_path)
+        from_bucket_name, from_blob_name = self._parse_bucket(from_path)
+        to_bucket_name, to_blob_name = self._parse_bucket(to_path)
+        source = self._get_bucket(from_bucket_name).blob(from_blob_name)
+        destination = self._get_bucket(to_bucket_name).blob(to_blob_name)
 
-        res = self._blob.download_as_string()
-
-        if self._mode is not None and 'b' not in self._mode:
-            try:
-                res = res.decode(self._encoding)
-            except UnicodeDecodeError:
-                raise ValueError(f"The content cannot be decoded into a string"
-                                 f" with encoding {self._encoding}."
-                                 f" Include 'b' on read mode to return the original bytes")
-        return res
-
-    def write(self, content: Union[str, bytes, io.IOBase]):
-        """ Writes text to a file on google storage
-        :param content: The content that should be written to a file
-        :return: String content of the file specified in the file path argument
+        token = None
+        try:
+            while True:
+                token, _, _ = destination.rewrite(source, token=token)
+                if token is None:
+                    break
+        except NotFound:
+            raise FileNotFoundError('No such file: {}'.format(from_path))
+
+    def open(self, path: str, mode: Optional[str] = None, block_size: Optional[int] = DEFAULT_BLOCK_SIZE,
+             readahead: Optional[int] = DEFAULT_READAHEAD, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+             content_type: Optional[str] = None, *args, **kwargs):
+        """Opens a file from gs
+        :param path: full path of the file
+        :param mode: open mode, by default binary reading
+        :param block_size: size of each ranged download in bytes (for reading)
+        :param readahead: amount of blocks prefetched in background on sequential reading (0 for no prefetch)
+        :param chunk_size: size of each resumable upload chunk in bytes (for writing)
+        :param content_type: content type of written blob (for writing)
+        :return: buffered (or text) GoogleStorageReader stream for reading, GoogleStorageWriter stream for writing
         """
-
-        if self._isfile:
-            ...
-            # logger.info('Overwriting {} file'.format(self.path))
-        if isinstance(content, str):
-            content = content.encode('utf8')
-
-        if self._mode is not None and ('w' not in self._mode and
-                                       'a' not in self._mode and
-                                       'x' not in self._mode and
-                                       '+' not in self._mode):
-            raise ValueError(f"Mode '{self._mode}' does not allow writing the file")
-        blob = self._bucket.blob(self._current_path)
-        blob.upload_from_string(content)
-
-    def _parse_bucket(self, path: str) -> Tuple[str, str]:
+        bucket_name, blob_name = self._parse_bucket(path.rstrip('/'))
+        bucket = self._get_bucket(bucket_name)
+
+        # writing does not need the blob's state
+        if mode is not None and set(mode) & set('wax'):
+            return GoogleStorageWriter(self, bucket, blob_name, chunk_size=chunk_size, content_type=content_type)
+
+        # reading needs only a single metadata request, content is downloaded lazily by ranges
+        blob = bucket.get_blob(blob_name) if blob_name else None
+        if blob is None:
+            raise FileNotFoundError('No such file: {}'.format(path))
+        raw = GoogleStorageReader(blob, block_size=block_size, readahead=readahead)
+        return open_reader(raw, mode=mode, encoding=self._encoding)
+
+    @staticmethod
+    def _parse_bucket(path: str) -> Tuple[str, str]:
         """Given a path, return the bucket name and the file path as a tuple"""
         path = path.split(GoogleStorageInterface.PREFIX, 1)[-1]
         try:
             bucket_name, path = path.split('/', 1)
         except ValueError:
             bucket_name, path = path.split('/', 1)[0], ''
-            self.only_bucket = True
 
         return bucket_name, path
-
-    def __enter__(self):
-        self._is_open = True
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._is_open = False
-        self.path = None
@@ -1,155 +1,224 @@
 """ Class LocalStorageInterface handles with local file/folder objects
 
     Class LocalStorageInterface contains
-                                        open method, which is the same python built-in 'open' method
+                                        open method, which returns LocalFile object with read and write methods
                                         isfile and isdir methods for checking object status
                                         listdir method for listing folder's content
                                         remove method for removing file or folder
+
+    LocalStorageInterface keeps no path specific state, one instance can be shared between threads
 """
 import os
 import shutil
-from typing import Optional, Union
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Union, Iterator
 
-from cloudstorageio.tools.ci_collections import add_slash
+from cloudstorageio.enums.enums import ObjectTypeEnums
+from cloudstorageio.tools.ci_collections import add_slash, ObjectStat
+from cloudstorageio.tools.hash_index import LocalHashIndex
 from cloudstorageio.tools.logger import logger
 
 
-class LocalStorageInterface:
-
-    def __init__(self, **kwargs):
-        self._mode = None
-        self.path = None
-        self.recursive = False
-        self.include_folders = False
-        self._current_path = None
-        self._current_path_with_backslash = None
-
-    @property
-    def path(self):
-        if self._current_path is None:
-            raise ValueError("Path name is not set")
-        return self._current_path
-
-    @path.setter
-    def path(self, value):
-        if value is None:
-            self._current_path = None
-            self._current_path_with_backslash = None
-        else:
-            self._current_path = value[:-1] if (value.endswith('/') and value != '/') else value
-            self._current_path_with_backslash = add_slash(self._current_path)
-
-    def _populate_listdir(self):
-        """Appends each file.folder name to self._listdir"""
-        if self.recursive:
-            for root, dirs, files in os.walk(self.path):
-                for name in files:
-                    self._listdir.append(os.path.join(root, name).split(self._current_path_with_backslash, 1)[1])
-                if self.include_folders:
-                    for name in dirs:
-                        self._listdir.append(str(os.path.join(root, name).split(self._current_path_with_backslash, 1)[1])
-                                             + '/')
-        else:
-            for i in os.listdir(self.path):
-                if os.path.isdir(os.path.join(self.path, i)):
-                    if self.include_folders:
-                        self._listdir.append(add_slash(i))
-                else:
-                    self._listdir.append(i)
-
-    def _analyse_path(self, path: str):
-        """From given path lists and detects object type (file/folder)"""
-        self._isfile = False
-        self._isdir = False
-        self.recursive = False
-        self.include_folders = False
-        self._listdir = list()
+class LocalFile:
+    """File object of local storage, returned by LocalStorageInterface.open
+    The file is opened on first read/write and kept open till the end of `with` block,
+    so it could be read or written chunk by chunk.
+    Content written in 'w' mode goes to a temporary file of the same folder, which replaces the file on close,
+    so a failed `with` block (e.g. a failed copy) leaves no partial file
+    """
 
+    def __init__(self, path: str, mode: Optional[str] = None):
         self.path = path
-        self._isdir = os.path.isdir(self.path)
-        self._isfile = os.path.isfile(self.path)
-
-    def open(self, path: str, mode: Optional[str] = None, *args, **kwargs):
-        """Opens a file from gs and return the GoogleStorageInterface object"""
         self._mode = mode
-        self._analyse_path(path)
-        return self
+        self._file = None
+        self._tmp_path = None
+        self._is_open = False
+        self._closed = False
 
-    def read(self) -> Union[str, bytes]:
-        """ Reads gs file and return the bytes
+    def read(self, size: Optional[int] = -1) -> Union[str, bytes]:
+        """ Reads local file and return the bytes
+        :param size: amount of bytes (characters) to read, by default the rest of the file
         :return: String content of the file
         """
-        if not self._isfile:
-            raise FileNotFoundError('No such file: {}'.format(self.path))
-
-        with open(self.path, self._mode) as f:
-            res = f.read()
-        return res
-
-    def write(self, content: Union[str, bytes]):
-        """ Writes text to a file on google storage
-        :param content: The content that should be written to a file
-        :return: String content of the file specified in the file path argument
-        """
+        if self._file is None:
+            if not os.path.isfile(self.path):
+                raise FileNotFoundError('No such file: {}'.format(self.path))
+            self._file = open(self.path, self._mode)
+        return self._file.read(size)
+
+    def _open_for_write(self) -> bool:
+        """Opens the file (a temporary one in 'w' mode) for writing, returns False on file/folder conflict"""
         try:
             os.makedirs(os.path.dirname(self.path), exist_ok=True)
         except FileExistsError:
             logger.info(f'File/folder conflict for {os.path.dirname(self.path)} path')
-            return None
+            return False
+        if os.path.isdir(self.path):
+            logger.info(f'File/folder conflict for {os.path.dirname(self.path)} path')
+            return False
+        if 'w' in self._mode:
+            self._tmp_path = os.path.join(os.path.dirname(self.path),
+                                          f'.{os.path.basename(self.path)}.{uuid.uuid4().hex}.tmp')
+            self._file = open(self._tmp_path, self._mode.replace('w', 'x'))
+        else:
+            self._file = open(self.path, self._mode)
+        return True
 
-        if self.isfile(self.path):
-            ...
-            # logger.info('Overwriting {} file'.format(self.path))
+    def write(self, content: Union[str, bytes]):
+        """ Writes text to a local file
+        :param content: The content that should be written to a file
+        :return: String content of the file specified in the file path argument
+        """
+        if self._file is None:
+            if not self._open_for_write():
+                return None
+            self._closed = False
 
         if isinstance(content, str):
             content = content.encode('utf8')
-        try:
-            with open(self.path, self._mode) as f:
-                f.write(content)
-        except IsADirectoryError:
-            logger.info(f'File/folder conflict for {os.path.dirname(self.path)} path')
+        self._file.write(content)
+
+    def close(self):
+        """Closes the file, in 'w' mode it is created even if nothing was written (e.g. copy of an empty file)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is None and self._mode is not None and 'w' in self._mode and not self._open_for_write():
+            return
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self._tmp_path is not None:
+                os.replace(self._tmp_path, self.path)
+                self._tmp_path = None
+
+    def abort(self):
+        """Closes the file, content written in 'w' mode is dropped"""
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self._tmp_path is not None:
+                os.remove(self._tmp_path)
+                self._tmp_path = None
+
+    def __enter__(self):
+        self._is_open = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        self._is_open = False
+
+
+class LocalStorageInterface:
+
+    def __init__(self, **kwargs):
+        """Initializes LocalStorageInterface instance
+        :param kwargs: local_hash_index - if True, scandir returns digests of files, kept in LocalHashIndex
+                       (in cache_dir) so unchanged files are not read again
+        """
+        self._hash_index = None
+        if kwargs.pop('local_hash_index', False):
+            self._hash_index = LocalHashIndex(cache_dir=kwargs.pop('cache_dir', None))
+
+    @staticmethod
+    def _format_path(path: str) -> str:
+        """Returns given path without slash at the end"""
+        return path[:-1] if (path.endswith('/') and path != '/') else path
+
+    @staticmethod
+    def _list_folder(path: str, recursive: bool, include_folders: bool) -> list:
+        """Returns names of each file/folder in given folder"""
+        listdir = list()
+        path_with_backslash = add_slash(path)
+        if recursive:
+            for root, dirs, files in os.walk(path):
+                for name in files:
+                    listdir.append(os.path.join(root, name).split(path_with_backslash, 1)[1])
+                if include_folders:
+                    for name in dirs:
+                        listdir.append(str(os.path.join(root, name).split(path_with_backslash, 1)[1]) + '/')
+        else:
+            for i in os.listdir(path):
+                if os.path.isdir(os.path.join(path, i)):
+                    if include_folders:
+                        listdir.append(add_slash(i))
+                else:
+                    listdir.append(i)
+        return listdir
+
+    def open(self, path: str, mode: Optional[str] = None, *args, **kwargs):
+        """Opens a local file and return the LocalFile object"""
+        return LocalFile(self._format_path(path), mode=mode)
 
     def isfile(self, path: str):
         """Checks file existence for given path"""
-        self._analyse_path(path)
-        return self._isfile
+        return os.path.isfile(self._format_path(path))
 
     def isdir(self, path: str):
         """Checks dictionary existence for given path"""
-        self._analyse_path(path)
-        return self._isdir
+        return os.path.isdir(self._format_path(path))
+
+    def stat(self, path: str) -> ObjectStat:
+        """Returns size, modification time and type of given file/folder"""
+        st = os.stat(path)
+        mtime = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+        if os.path.isdir(path):
+            return ObjectStat(path=path, type=ObjectTypeEnums.FOLDER, mtime=mtime)
+        return ObjectStat(path=path, type=ObjectTypeEnums.FILE, size=st.st_size, mtime=mtime)
+
+    def scandir(self, path: str) -> Iterator[ObjectStat]:
+        """Yields metadata of each file under given folder (recursively)
+        Paths of yielded ObjectStats are relative to the folder, digests are filled if local_hash_index is enabled
+        """
+        path = self._format_path(path)
+        file_stats = dict()  # absolute path -> os.stat_result
+        for root, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.abspath(os.path.join(root, name))
+                file_stats[file_path] = os.stat(file_path)
+
+        # stats are passed to the index, so files are not stat-ed twice
+        hashes = self._hash_index.get_hashes(file_stats, stats=file_stats) if self._hash_index is not None else {}
+        for file_path, st in file_stats.items():
+            obj = ObjectStat(path=os.path.relpath(file_path, os.path.abspath(path)), type=ObjectTypeEnums.FILE,
+                             size=st.st_size, mtime=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc))
+            yield obj._replace(**hashes[file_path]._asdict()) if file_path in hashes else obj
 
     def remove(self, path: str):
         """Removes file/folder"""
-
-        self._analyse_path(path)
-        if self._isfile:
-            os.remove(self.path)
-        elif self._isdir:
-            shutil.rmtree(self.path)
+        path = self._format_path(path)
+        if os.path.isfile(path):
+            os.remove(path)
+        elif os.path.isdir(path):
+            shutil.rmtree(path)
         else:
             raise FileNotFoundError(f'No such file or dictionary: {path}')
 
-    def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False):
-        """Lists all files/folders of dictionary"""
+    def copy(self, from_path: str, to_path: str):
+        """Copies file with the operating system, content is not read into memory"""
+        from_path = self._format_path(from_path)
+        to_path = self._format_path(to_path)
+        if not os.path.isfile(from_path):
+            raise FileNotFoundError('No such file: {}'.format(from_path))
 
-        self._analyse_path(path)
-        self.recursive = recursive
-        self.include_folders = not exclude_folders
+        if os.path.dirname(to_path):
+            os.makedirs(os.path.dirname(to_path), exist_ok=True)
+        shutil.copyfile(from_path, to_path)
 
-        if not self._isdir and not self._isfile:
-            raise FileNotFoundError(f'No such file or dictionary: {self.path}')
-
-        elif not self._isdir:
-            raise NotADirectoryError(f"Not a directory: {self.path}")
+    def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False):
+        """Lists all files/folders of dictionary"""
+        path = self._format_path(path)
 
-        self._populate_listdir()
-        return self._listdir
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No such file or dictionary: {path}')
 
-    def __enter__(self):
-        self._is_open = True
-        return self
+        elif not os.path.isdir(path):
+            raise NotADirectoryError(f"Not a directory: {path}")
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._is_open = False
-        self.path = None
\ No newline at end of file
+        return self._list_folder(path, recursive=recursive, include_folders=not exclude_folders)
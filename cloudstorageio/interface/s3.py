@@ -1,31 +1,197 @@
 """ Class S3Interface handles with S3 Storage files/folders
     S3Interface has
-                        read and write methods (can be accessed by open method)
+                        open method, which returns seekable S3Reader stream for reading (Range requests)
+                            and S3Writer stream for writing (background multipart upload)
                         isfile and isdir methods for checking object status (file, folder)
-                        listdir method for listing folder's content
+                        stat method for getting object metadata with O(1) requests
+                        listdir method for listing folder's content (server side for non-recursive listing)
                         remove method for removing file/folder
 
     Boto3 API itself doesn't have any concept of a "folder".
         In S3Interface you can differentiate file/folder like in local environment
 
+    S3Interface keeps no path specific state, one instance (and its boto3 client) can be shared between threads
+
 """
 
 import io
 import os
-from typing import Tuple, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Optional, Union, Iterator
 
 import boto3
 from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from cloudstorageio.enums.enums import PrefixEnums, ObjectTypeEnums
+from cloudstorageio.exceptions import BatchOperationError
+from cloudstorageio.tools.ci_collections import add_slash, ObjectStat
+from cloudstorageio.tools.streams import RangeReader, ChunkedWriter, open_reader, DEFAULT_BLOCK_SIZE, \
+    DEFAULT_READAHEAD, DEFAULT_CHUNK_SIZE
+
+
+class S3Reader(RangeReader):
+    """Seekable raw stream of S3 object, content is fetched with HTTP Range GET requests"""
+
+    def __init__(self, client, bucket_name: str, key: str, head: dict, block_size: Optional[int] = DEFAULT_BLOCK_SIZE,
+                 readahead: Optional[int] = DEFAULT_READAHEAD):
+        """Initializes S3Reader instance
+        :param client: boto3 s3 client
+        :param bucket_name: name of S3 bucket
+        :param key: object key in the bucket
+        :param head: HEAD response of the object
+        :param block_size: size of each Range request in bytes
+        :param readahead: amount of blocks prefetched in background on sequential reading
+        """
+        super().__init__(size=head['ContentLength'], name=f"{S3Interface.PREFIX}{bucket_name}/{key}",
+                         block_size=block_size, readahead=readahead)
+        self._client = client
+        self._bucket_name = bucket_name
+        self._key = key
+        # fails the reading if the object is changed after opening
+        self._etag = head['ETag']
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        response = self._client.get_object(Bucket=self._bucket_name, Key=self._key, Range=f'bytes={start}-{end}',
+                                           IfMatch=self._etag)
+        return response['Body'].read()
+
+
+class S3Writer(ChunkedWriter):
+    """Writable raw stream of S3 object, returned by S3Interface.open for writing
+    Full parts are uploaded with multipart upload on a bounded thread pool while the caller keeps writing,
+    content smaller than one part is uploaded with a single put_object request on close
+    """
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    MAX_PARTS = 10000
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(self, interface: 'S3Interface', bucket_name: str, key: str,
+                 part_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+                 max_concurrency: Optional[int] = DEFAULT_MAX_CONCURRENCY,
+                 acl: Optional[str] = 'private', metadata: Optional[dict] = None):
+        """Initializes S3Writer instance
+        :param interface: S3Interface instance, which client is used for requests
+        :param bucket_name: name of S3 bucket
+        :param key: object key in the bucket
+        :param part_size: size of each uploaded part in bytes (at least 5 MB)
+        :param max_concurrency: maximum amount of parts uploaded (and kept in memory) at the same time
+        :param acl: access control permission for written file ('private' by default)
+        :param metadata: Metadata for file
+        """
+        super().__init__(chunk_size=max(part_size, self.MIN_PART_SIZE),
+                         name=f"{S3Interface.PREFIX}{bucket_name}/{key}", encoding=interface.encoding)
+        self._interface = interface
+        self._client = interface.client
+        self._bucket_name = bucket_name
+        self._key = key
+        self._acl = acl
+        self._metadata = metadata or {}
+        self._max_concurrency = max(max_concurrency, 1)
+
+        self._upload_id = None
+        self._executor = None
+        self._parts = list()  # futures of uploaded parts
+        self._slots = threading.BoundedSemaphore(self._max_concurrency)
+        self._uploaded = False
 
-from cloudstorageio.enums.enums import PrefixEnums
-from cloudstorageio.tools.ci_collections import add_slash
+    @property
+    def path(self) -> str:
+        return self.name
+
+    def write(self, content: Union[str, bytes, io.IOBase], metadata: Optional[dict] = None,
+              acl: Optional[str] = None) -> int:
+        """Writes content to a file on s3, full parts are uploaded in background
+        :param content: The content that should be written to a file
+        :param metadata: Metadata for file (has effect before the first part is uploaded)
+        :param acl: access control permission for written file (has effect before the first part is uploaded)
+        :return: amount of written bytes
+        """
+        if metadata is not None:
+            self._metadata = metadata
+        if acl is not None:
+            self._acl = acl
+        return super().write(content)
+
+    def _upload_part(self, part_number: int, chunk: bytes) -> dict:
+        try:
+            response = self._client.upload_part(Bucket=self._bucket_name, Key=self._key, UploadId=self._upload_id,
+                                                PartNumber=part_number, Body=chunk)
+            return {'PartNumber': part_number, 'ETag': response['ETag']}
+        finally:
+            self._slots.release()
+
+    def _upload_chunk(self, chunk: bytes):
+        # fails fast if some part is already failed
+        for future in self._parts:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(Bucket=self._bucket_name, Key=self._key,
+                                                                   ACL=self._acl, Metadata=self._metadata)['UploadId']
+            self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency)
+
+        part_number = len(self._parts) + 1
+        if part_number > self.MAX_PARTS:
+            raise ValueError(f'S3 multipart upload supports at most {self.MAX_PARTS} parts')
+
+        # blocks writing while max_concurrency parts are being uploaded, so memory stays bounded
+        self._slots.acquire()
+        self._parts.append(self._executor.submit(self._upload_part, part_number, chunk))
+
+        # parts could have different sizes, growing part size keeps very large uploads under the parts limit
+        if part_number % 1000 == 0:
+            self._chunk_size *= 2
+
+    def _complete(self, last_chunk: bytes):
+        if self._uploaded:
+            return
+        if self._upload_id is None:
+            self._client.put_object(Bucket=self._bucket_name, Key=self._key, ACL=self._acl, Body=last_chunk,
+                                    Metadata=self._metadata)
+            return
+
+        if last_chunk:
+            self._upload_chunk(last_chunk)
+        parts = [future.result() for future in self._parts]
+        self._executor.shutdown()
+        self._client.complete_multipart_upload(Bucket=self._bucket_name, Key=self._key, UploadId=self._upload_id,
+                                               MultipartUpload={'Parts': parts})
+
+    def _abort(self):
+        if self._upload_id is None:
+            return
+        for future in self._parts:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        self._client.abort_multipart_upload(Bucket=self._bucket_name, Key=self._key, UploadId=self._upload_id)
+
+    def upload(self, path,
+               acl: Optional[str] = 'private'):
+        """
+        Used for uploading files from local to S3.
+        Using S3Interface multipart config for configuring multipart upload
+        """
+        if self._position:
+            raise ValueError('Cannot upload a file after writing to the stream')
+        self._client.upload_file(
+            path, self._bucket_name, self._key,
+            ExtraArgs={'ACL': acl},
+            Config=self._interface.multipart_config)
+        self._uploaded = True
 
 
 class S3Interface:
     PREFIX = PrefixEnums.S3.value
+    MAX_COPY_OBJECT_SIZE = 5 * 1024 ** 3  # 5 GB
+    DELETE_WORKERS = 8
+    DEFAULT_POOL_CONNECTIONS = 10
 
     def __init__(self, **kwargs):
-        """Initializes S3Interface instance, creates session and resources for given credentials
+        """Initializes S3Interface instance, creates session and client for given credentials
         :param kwargs:
         """
 
@@ -49,15 +215,11 @@ class S3Interface:
                                               region_name=self._region)
 
         self._encoding = 'utf8'
-        self._s3 = self._session.resource('s3')
-        self._mode = None
-        self._current_bucket = None
-        self._current_path = None
-        self._bucket = None
-        self._object = None
-        self.path = None
-        self._is_open = False
-        self.only_bucket = False
+        # boto3 clients (unlike resources) are thread safe, connection pool is sized to the amount of threads using it:
+        # each of max_pool_connections threads could run upload threads of its writer and readahead ones of its reader
+        threads = kwargs.pop('max_pool_connections', None) or self.DEFAULT_POOL_CONNECTIONS
+        max_pool_connections = threads * (S3Writer.DEFAULT_MAX_CONCURRENCY + DEFAULT_READAHEAD + 1)
+        self._client = self._session.client('s3', config=Config(max_pool_connections=max_pool_connections))
 
         self._multipart_threshold = 100  # in MBs
 
@@ -68,22 +230,16 @@ class S3Interface:
             use_threads=True)
 
     @property
-    def path(self):
-        if self._current_bucket is None:
-            raise ValueError("Bucket name is not set")
-        if self._current_path is None:
-            raise ValueError("Path name is not set")
-        return f"{S3Interface.PREFIX}{self._current_bucket}/{self._current_path}"
-
-    @path.setter
-    def path(self, value):
-        if value is None:
-            self._current_path = None
-            self._current_bucket = None
-        else:
-            value = value[:-1] if value.endswith('/') else value
-            self._current_bucket, self._current_path = self._parse_bucket(value)
-            self._current_path_with_backslash = add_slash(self._current_path)
+    def client(self):
+        return self._client
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    @property
+    def multipart_config(self) -> TransferConfig:
+        return self._multipart_config
 
     @staticmethod
     def get_bucket_region(bucket_name):
@@ -93,184 +249,226 @@ class S3Interface:
         """
         return boto3.client('s3').get_bucket_location(Bucket=bucket_name)['LocationConstraint']
 
-    def _detect_blob_object_type(self):
-        """Hidden method for detecting given blob object type (file or folder)
-        :return:
-        """
-        if self._current_path in self._object_key_list:
-            self._isfile = True
-            self._object_key_list.remove(self._current_path)
-
-        if self._object_key_list:
-            self._isdir = True
-
-    def _populate_listdir(self, blob_name):
-        """Appends each blob inner name to self._listdir for bucket case
-        :param blob_name: storage.blob.Blob object
-        :return:
-        """
-        split_list = blob_name.split('/', 1)
-        if len(split_list) == 2:
-            inner_object_name = add_slash(split_list[0])
-        else:
-            inner_object_name = split_list[0]
-
-        if inner_object_name not in self._listdir:
-            self._listdir.append(inner_object_name)
-
-    def _init_path(self, path):
-        """Initializes path specific fields"""
-        self._isfile = False
-        self._isdir = False
-        self._listdir = list()
-        self._object_exists = False
-
-        self.path = path
-
-        self._bucket = self._s3.Bucket(self._current_bucket)
-        self._object = self._bucket.Object(self._current_path)
-        self._object_summary_list = self._bucket.objects.filter(Prefix=self._current_path)
-
-        self._object_key_list = [obj.key for obj in self._object_summary_list]
-
-    def _analyse_path(self, path: str):
-        """From given path create bucket, object, object_summaries, list and identify object type (file/folder)
+    def _head_object(self, bucket_name: str, key: str) -> Optional[dict]:
+        """Returns HEAD response of given object, None if it does not exist (single request)"""
+        try:
+            return self._client.head_object(Bucket=bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def _folder_exists(self, bucket_name: str, key: str) -> bool:
+        """Checks whether any object exists under given key as a folder (single MaxKeys=1 request)"""
+        response = self._client.list_objects_v2(Bucket=bucket_name, Prefix=add_slash(key),
+                                                Delimiter='/', MaxKeys=1)
+        return response.get('KeyCount', 0) > 0
+
+    def stat(self, path: str) -> ObjectStat:
+        """Returns size, modification time, ETag and type of given file/folder
+        Costs one HEAD request for files and one more listing request for folders
+        (only the listing request for folder paths ending with '/')
         :param path: full path of file/folder
-        :return:
+        :return: ObjectStat of given path
         """
-        self._init_path(path)
-
-        if self.only_bucket:
-            self._isdir = True
-        else:
-            self._object_key_list = [f.split(self._current_path_with_backslash, 1)[-1] for f in
-                                     self._object_key_list]
-            self._detect_blob_object_type()
-
-        while '' in self._object_key_list:
-            self._object_key_list.remove('')
-
-        for key_name in self._object_key_list:
-            self._populate_listdir(key_name)
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
+        if key and not path.endswith('/'):
+            head = self._head_object(bucket_name, key)
+            if head is not None:
+                return ObjectStat(path=path, type=ObjectTypeEnums.FILE, size=head['ContentLength'],
+                                  mtime=head['LastModified'], etag=head['ETag'].strip('"'))
+        if not key or self._folder_exists(bucket_name, key):
+            return ObjectStat(path=path, type=ObjectTypeEnums.FOLDER)
 
-        if self._isdir or self._isfile:
-            self._object_exists = True
+        raise FileNotFoundError(f'No such file or dictionary: {path}')
 
     def isfile(self, path: str) -> bool:
         """Checks file existence for given path"""
-        self._analyse_path(path)
-        return self._isfile
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
+        return bool(key) and self._head_object(bucket_name, key) is not None
 
     def isdir(self, path: str) -> bool:
         """Checks dictionary existence for given path"""
-        self._analyse_path(path)
-        return self._isdir
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
+        return not key or self._folder_exists(bucket_name, key)
+
+    def _list_pages(self, bucket_name: str, prefix: str, delimiter: Optional[str] = None):
+        """Yields list_objects_v2 response pages for given prefix
+        With '/' delimiter only direct children of the prefix are listed (as Contents and CommonPrefixes)
+        """
+        paginate_kwargs = {'Bucket': bucket_name, 'Prefix': prefix}
+        if delimiter:
+            paginate_kwargs['Delimiter'] = delimiter
+        yield from self._client.get_paginator('list_objects_v2').paginate(**paginate_kwargs)
+
+    def _iter_listing(self, path: str, recursive: bool) -> Iterator[Tuple[list, list]]:
+        """Yields (file names, new folder names) of each listing page of given folder
+        :raises FileNotFoundError/NotADirectoryError: before the first yield, if the path is not a folder
+        """
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
+        prefix = add_slash(key) if key else ''
+        object_exists = not key
+        seen_folders = set()
+
+        for page in self._list_pages(bucket_name, prefix, delimiter=None if recursive else '/'):
+            contents = page.get('Contents', [])
+            common_prefixes = page.get('CommonPrefixes', [])
+            if contents or common_prefixes:
+                object_exists = True
+            elif not object_exists:
+                break  # S3 returns an empty first page only if nothing is under the prefix
+
+            files, folders = list(), list()
+            for common_prefix in common_prefixes:
+                folders.append(common_prefix['Prefix'][len(prefix):])
+
+            for obj in contents:
+                name = obj['Key'][len(prefix):]
+                if recursive:
+                    split_list = name.split('/', 1)
+                    if len(split_list) == 2 and add_slash(split_list[0]) not in seen_folders:
+                        seen_folders.add(add_slash(split_list[0]))
+                        folders.append(add_slash(split_list[0]))
+                if name and not name.endswith('/'):
+                    files.append(name)
+            yield files, folders
+
+        if not object_exists:
+            if self._head_object(bucket_name, key) is not None:
+                raise NotADirectoryError(f"Not a directory: {path}")
+            raise FileNotFoundError(f'No such file or dictionary: {path}')
 
     def listdir(self, path: str, recursive: Optional[bool] = False, exclude_folders: Optional[bool] = False) -> list:
-        """Lists content for given folder path"""
-        self._analyse_path(path)
+        """Lists content for given folder path
+        Non-recursive listing is done on server side with '/' delimiter,
+        so its cost depends only on the amount of direct children
+        """
         include_folders = not exclude_folders
-        if recursive:
-            if include_folders:
-                folders_list = [f for f in self._listdir if f.endswith('/')]
-                result = self._object_key_list + folders_list
-            else:
-                result = [f for f in self._object_key_list if not f.endswith('/')]
+        files = list()
+        folders = list()
+        for page_files, page_folders in self._iter_listing(path, recursive):
+            files += page_files
+            folders += page_folders
 
-        else:
-            if include_folders:
-                result = self._listdir
-            else:
-                result = [f for f in self._listdir if not f.endswith('/')]
+        if recursive:
+            return files + folders if include_folders else files
+        return sorted(files + folders) if include_folders else files
 
-        if not self._object_exists:
-            raise FileNotFoundError(f'No such file or dictionary: {path}')
-        elif not self._isdir:
-            raise NotADirectoryError(f"Not a directory: {path}")
+    def iterdir_pages(self, path: str, recursive: Optional[bool] = False,
+                      exclude_folders: Optional[bool] = False) -> Iterator[list]:
+        """Yields content of given folder path page by page (one listing request each),
+        names are the same as of listdir, but not sorted across pages
+        """
+        for files, folders in self._iter_listing(path, recursive):
+            yield files + folders if not exclude_folders else files
 
-        return result
+    def scandir(self, path: str) -> Iterator[ObjectStat]:
+        """Yields metadata of each file under given folder (recursively), taken from the listing responses
+        Paths of yielded ObjectStats are relative to the folder, md5 is known only for not multipart objects
+        """
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
+        prefix = add_slash(key) if key else ''
+        for page in self._list_pages(bucket_name, prefix):
+            for obj in page.get('Contents', []):
+                name = obj['Key'][len(prefix):]
+                if not name or name.endswith('/'):
+                    continue
+                etag = obj['ETag'].strip('"')
+                yield ObjectStat(path=name, type=ObjectTypeEnums.FILE, size=obj['Size'], mtime=obj['LastModified'],
+                                 etag=etag, md5=None if '-' in etag else etag)
+
+    def _delete_keys(self, bucket_name: str, keys: list) -> dict:
+        """Deletes given keys with a single DeleteObjects request (up to 1000 keys)
+        :return: full path -> error message of each key, which failed to be deleted
+        """
+        response = self._client.delete_objects(Bucket=bucket_name,
+                                               Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True})
+        return {f"{self.PREFIX}{bucket_name}/{error['Key']}": f"{error.get('Code')}: {error.get('Message')}"
+                for error in response.get('Errors', [])}
 
     def remove(self, path: str) -> None:
-        """Deletes file/folder"""
-        self._analyse_path(path)
-        if not self._object_exists:
+        """Deletes file/folder
+        Folder's objects are deleted with DeleteObjects requests (1000 keys each) in parallel with the listing
+        :raises BatchOperationError: if some of the objects failed to be deleted
+        """
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
+        prefix = add_slash(key) if key else ''
+        object_exists = False
+
+        if key and self._head_object(bucket_name, key) is not None:
+            self._client.delete_object(Bucket=bucket_name, Key=key)
+            object_exists = True
+
+        with ThreadPoolExecutor(max_workers=self.DELETE_WORKERS) as executor:
+            futures = list()
+            for page in self._list_pages(bucket_name, prefix):
+                keys = [obj['Key'] for obj in page.get('Contents', [])]
+                if keys:
+                    futures.append(executor.submit(self._delete_keys, bucket_name, keys))
+                    object_exists = True
+            failures = dict()
+            for future in futures:
+                failures.update(future.result())
+
+        if not object_exists and key:
             raise FileNotFoundError(f"Object with path {path} does not exists")
-
-        for obj in self._object_summary_list:
-            obj.delete()
-
-    def open(self, path: str, mode: Optional[str] = None):
-        """Opens a file from s3 and return the S3Interface object"""
-        self._mode = mode
-        self._analyse_path(path)
-        return self
-
-    def read(self) -> Union[str, bytes]:
-        """Reads S3 file and return the bytes
-        :return: String content of the file
+        if failures:
+            raise BatchOperationError(f'Failed to delete objects of {path}', failures)
+
+    def copy(self, from_path: str, to_path: str):
+        """Copies file on server side, content is not transferred through the host
+        Objects up to 5 GB are copied with a single copy_object request, bigger ones with UploadPartCopy parts
+        :param from_path: full path of source file
+        :param to_path: full path of destination file
         """
-        if not self._isfile:
-            raise FileNotFoundError('No such file: {}'.format(self.path))
-
-        res = self._object.get()['Body'].read()
-        if self._mode is not None and 'b' not in self._mode:
-            try:
-                res = res.decode(self._encoding)
-            except UnicodeDecodeError:
-                raise ValueError(f"The content cannot be decoded into a string"
-                                 f" with encoding {self._encoding}."
-                                 f" Include 'b' on read mode to return the original bytes")
-        return res
-
-    def write(self, content: Union[str, bytes, io.IOBase], metadata: Optional[dict] = None,
-              acl: Optional[str] = 'private'):
-
-        """Writes text to a file on s3
-        :param content: The content that should be written to a file
-        :param metadata: Metadata for file
-        :param acl: access control permission for written file ('private' by default)
-        :return: String content of the file specified in the file path argument
+        from_bucket, from_key = self._parse_bucket(from_path)
+        to_bucket, to_key = self._parse_bucket(to_path)
+        head = self._head_object(from_bucket, from_key) if from_key else None
+        if head is None:
+            raise FileNotFoundError('No such file: {}'.format(from_path))
+
+        copy_source = {'Bucket': from_bucket, 'Key': from_key}
+        if head['ContentLength'] <= self.MAX_COPY_OBJECT_SIZE:
+            self._client.copy_object(Bucket=to_bucket, Key=to_key, CopySource=copy_source)
+        else:
+            self._client.copy(copy_source, to_bucket, to_key, Config=self.multipart_config)
+
+    def open(self, path: str, mode: Optional[str] = None, block_size: Optional[int] = DEFAULT_BLOCK_SIZE,
+             readahead: Optional[int] = DEFAULT_READAHEAD, part_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+             max_concurrency: Optional[int] = S3Writer.DEFAULT_MAX_CONCURRENCY, acl: Optional[str] = 'private',
+             metadata: Optional[dict] = None):
+        """Opens a file from s3
+        :param path: full path of the file
+        :param mode: open mode, by default binary reading
+        :param block_size: size of each Range request in bytes (for reading)
+        :param readahead: amount of blocks prefetched in background on sequential reading
+        :param part_size: size of each uploaded part in bytes (for writing)
+        :param max_concurrency: maximum amount of parts uploaded at the same time (for writing),
+                                the connection pool is sized for the default one
+        :param acl: access control permission for written file (for writing)
+        :param metadata: Metadata for written file (for writing)
+        :return: buffered (or text) S3Reader stream for reading, S3Writer stream for writing
         """
-        if self._isfile:
-            ...
-            # logger.info('Overwriting {} file'.format(self.path))
-        if isinstance(content, str):
-            content = content.encode('utf8')
-        if not metadata:
-            metadata = {}
-        if self._mode is not None and ('w' not in self._mode and
-                                       'a' not in self._mode and
-                                       'x' not in self._mode and
-                                       '+' not in self._mode):
-            raise ValueError(f"Mode '{self._mode}' does not allow writing the file")
-
-        self._object.put(ACL=acl, Body=content, Metadata=metadata)
+        bucket_name, key = self._parse_bucket(path.rstrip('/'))
 
-    def upload(self, path,
-               acl: Optional[str] = 'private'):
-        """
-        Used for uploading files from local to S3.
-        Using self._multipart_config for configuring multipart upload
-        """
-        self._object.upload_file(
-            path,
-            ExtraArgs={'ACL': acl},
-            Config=self._multipart_config)
+        # writing does not need the object's state
+        if mode is not None and set(mode) & set('wax'):
+            return S3Writer(self, bucket_name, key, part_size=part_size, max_concurrency=max_concurrency, acl=acl,
+                            metadata=metadata)
 
-    def _parse_bucket(self, path: str) -> Tuple[str, str]:
+        # reading needs only a single HEAD request, content is fetched lazily by ranges
+        head = self._head_object(bucket_name, key) if key else None
+        if head is None:
+            raise FileNotFoundError('No such file: {}'.format(path))
+        raw = S3Reader(self._client, bucket_name, key, head, block_size=block_size, readahead=readahead)
+        return open_reader(raw, mode=mode, encoding=self._encoding)
+
+    @staticmethod
+    def _parse_bucket(path: str) -> Tuple[str, str]:
         """Given a path, return the bucket name and the file path as a tuple"""
         path = path.split(S3Interface.PREFIX, 1)[-1]
         try:
             bucket_name, path = path.split('/', 1)
         except ValueError:
             bucket_name, path = path.split('/', 1)[0], ''
-            self.only_bucket = True
         return bucket_name, path
-
-    def __enter__(self):
-        self._is_open = True
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._is_open = False
-        self.path = None
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from cloudstorageio.interface.async_cloud import AsyncCloudInterface
+
+
+class TestAsyncCloudInterface(unittest.TestCase):
+    """Tests AsyncCloudInterface with local paths"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, 'source')
+        self.files = {'a.txt': b'a' * 10, 'sub/b.txt': b'b' * 3000, 'sub/c.txt': b''}
+        for name, content in self.files.items():
+            os.makedirs(os.path.dirname(os.path.join(self.source, name)), exist_ok=True)
+            with open(os.path.join(self.source, name), 'wb') as f:
+                f.write(content)
+        self.aci = AsyncCloudInterface(max_concurrency=4)
+
+    def tearDown(self):
+        self.aci.close()
+        shutil.rmtree(self.folder)
+
+    def test_iterdir(self):
+        """Test iterdir yields the same names as listdir"""
+        async def main():
+            names = [name async for name in self.aci.iterdir(self.source, recursive=True, exclude_folders=True)]
+            listdir = await self.aci.listdir(self.source, recursive=True, exclude_folders=True)
+            return names, listdir
+
+        names, listdir = asyncio.run(main())
+        self.assertEqual(sorted(names), sorted(self.files))
+        self.assertEqual(sorted(names), sorted(listdir))
+
+    def test_iter_content(self):
+        """Test iter_content yields content chunk by chunk"""
+        async def main():
+            return [chunk async for chunk in self.aci.iter_content(os.path.join(self.source, 'sub/b.txt'),
+                                                                     chunk_size=1024)]
+
+        chunks = asyncio.run(main())
+        self.assertEqual([len(chunk) for chunk in chunks], [1024, 1024, 952])
+        self.assertEqual(b''.join(chunks), self.files['sub/b.txt'])
+
+    def test_stat(self):
+        """Test stat of file and folder"""
+        async def main():
+            return await asyncio.gather(self.aci.stat(os.path.join(self.source, 'a.txt')), self.aci.stat(self.source))
+
+        file_stat, folder_stat = asyncio.run(main())
+        self.assertTrue(file_stat.isfile)
+        self.assertEqual(file_stat.size, 10)
+        self.assertTrue(folder_stat.isdir)
+
+    def test_several_loops(self):
+        """Test the instance could be used in several event loops"""
+        path = os.path.join(self.source, 'a.txt')
+        for _ in range(2):
+            self.assertTrue(asyncio.run(self.aci.isfile(path)))
+
+    def test_copy_batch(self):
+        """Test copy_batch copies all files (including empty ones) without blocking the event loop"""
+        destination = os.path.join(self.folder, 'destination')
+
+        async def main():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.ensure_future(tick())
+            await self.aci.copy_batch(self.source, destination, process_amount=2)
+            ticker.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), 0)
+        for name, content in self.files.items():
+            with open(os.path.join(destination, name), 'rb') as f:
+                self.assertEqual(f.read(), content)
+
+    def test_context_manager(self):
+        """Test worker threads are stopped at the end of `async with` block"""
+        async def main():
+            async with AsyncCloudInterface(max_concurrency=2) as aci:
+                self.assertTrue(await aci.isdir(self.source))
+            return aci
+
+        aci = asyncio.run(main())
+        with self.assertRaises(RuntimeError):
+            aci._executor.submit(print)
@@ -138,6 +138,20 @@ class TestCloudInterface(unittest.TestCase):
         res = self.ci.isdir(path=self.remote_folder_path)
         self.assertEqual(res, True)
 
+    def test_stat(self):
+        """Test stat method"""
+        # Test on existing file
+        res = self.ci.stat(path=self.remote_lorem)
+        self.assertEqual(res.isfile, True)
+        self.assertEqual(res.size, len(self.ci.fetch(self.remote_lorem)))
+
+        # Test on existing folder
+        res = self.ci.stat(path=self.remote_folder_path)
+        self.assertEqual(res.isdir, True)
+
+        # Test on not existing file
+        self.assertRaises(FileNotFoundError, self.ci.stat, self.not_existing_file)
+
     def test_listdir(self):
         """ Tests listdir method with various params"""
         # Tests recursive param
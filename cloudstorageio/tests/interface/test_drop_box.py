@@ -0,0 +1,159 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+from dropbox.common import PathRoot
+from dropbox.exceptions import ApiError
+from dropbox.files import FileMetadata, WriteMode
+from requests.structures import CaseInsensitiveDict
+
+from cloudstorageio.interface.drop_box import DropBoxInterface, DropBoxReader, DropBoxWriter
+
+MB = 1024 * 1024
+
+
+class FakeResponse(requests.Response):
+    """Streamed download response with the requested part of the content"""
+
+    def __init__(self, content: bytes, metadata: dict):
+        super().__init__()
+        self.status_code = 200
+        self.headers = CaseInsensitiveDict({'dropbox-api-result': json.dumps(metadata)})
+        self._content = content
+        self.closed = False
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        for idx in range(0, len(self._content), chunk_size):
+            yield self._content[idx:idx + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession(requests.Session):
+    """Requests session of the dbx client, serves download requests and records their headers"""
+
+    def __init__(self, content: bytes):
+        super().__init__()
+        self.content = content
+        self.requests = list()
+
+    def post(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers))
+        start = 0
+        if 'Range' in headers:
+            start = int(headers['Range'][len('bytes='):].rstrip('-'))
+        metadata = {'.tag': 'file', 'name': 'file.txt', 'id': 'id:1', 'rev': '015a1b2c3d4e5', 'size': len(self.content),
+                    'client_modified': '2020-01-01T00:00:00Z', 'server_modified': '2020-01-01T00:00:00Z'}
+        return FakeResponse(self.content[start:], metadata)
+
+
+class TestDropBoxReader(unittest.TestCase):
+    """Tests download requests of DropBoxReader with fake session"""
+
+    def setUp(self):
+        self.content = b'0123456789' * 10
+        self.session = FakeSession(self.content)
+        self.dbx = DropBoxInterface(dropbox_token='token')
+        self.dbx._user_dbx = self.dbx._user_dbx.clone(session=self.session)
+        self.dbx.dbx = self.dbx._user_dbx
+        self.metadata = FileMetadata(name='file.txt', rev='015a1b2c3d4e5', size=len(self.content))
+
+    def _reader(self) -> DropBoxReader:
+        return DropBoxReader(self.dbx, '/file.txt', metadata=self.metadata, chunk_size=7)
+
+    def test_read(self):
+        """Test reading from the start sends no Range header"""
+        with self._reader() as reader:
+            self.assertEqual(reader.readall(), self.content)
+        self.assertEqual(len(self.session.requests), 1)
+        self.assertNotIn('Range', self.session.requests[0])
+        self.assertEqual(self.session.requests[0]['Authorization'], 'Bearer token')
+
+    def test_seek(self):
+        """Test reading after seek downloads from the position with a Range header"""
+        with self._reader() as reader:
+            self.assertEqual(reader.read(3), self.content[:3])
+            reader.seek(42)
+            self.assertEqual(reader.read(20), self.content[42:62])
+            self.assertEqual(reader.read(), self.content[62:])
+        self.assertEqual(len(self.session.requests), 2)
+        self.assertEqual(self.session.requests[1]['Range'], 'bytes=42-')
+        self.assertEqual(self.session.requests[1]['Authorization'], 'Bearer token')
+
+    def test_seek_path_root(self):
+        """Test Range requests keep the path root header of root namespace"""
+        self.dbx._path_root = PathRoot.namespace_id('123')
+        self.dbx.dbx = self.dbx._user_dbx.with_path_root(self.dbx._path_root)
+        with self._reader() as reader:
+            reader.read(1)
+            reader.seek(10)
+            self.assertEqual(reader.read(5), self.content[10:15])
+        path_roots = [request.get('Dropbox-API-Path-Root') for request in self.session.requests]
+        self.assertEqual(len(set(path_roots)), 1)
+        self.assertIn('123', path_roots[0])
+
+
+class TestDropBoxWriter(unittest.TestCase):
+    """Tests upload requests of DropBoxWriter with fake dbx client"""
+
+    def setUp(self):
+        self.dbx = DropBoxInterface(dropbox_token='token')
+        self.dbx.dbx = mock.Mock()
+        self.dbx.dbx.files_upload_session_start.return_value = mock.Mock(session_id='session')
+        result = mock.Mock(path_display='/file.bin', path_lower='/file.bin')
+        self.dbx.dbx.files_upload.return_value = result
+        self.dbx.dbx.files_upload_session_finish.return_value = result
+
+    def test_chunk_size(self):
+        """Test chunk size is rounded up to a multiple of 4 MB and limited to 148 MB"""
+        self.assertEqual(DropBoxWriter(self.dbx, '/file.bin', chunk_size=1)._chunk_size, 4 * MB)
+        self.assertEqual(DropBoxWriter(self.dbx, '/file.bin', chunk_size=5 * MB)._chunk_size, 8 * MB)
+        self.assertEqual(DropBoxWriter(self.dbx, '/file.bin', chunk_size=500 * MB)._chunk_size, 148 * MB)
+
+    def test_session(self):
+        """Test full chunks are sent to the upload session, the rest is sent with the finish request"""
+        content = bytes(range(256)) * (4 * 5 * MB // 256 + 1)
+        metadata = FileMetadata(name='file.bin', rev='015a1b2c3d4e5', size=1)
+        with DropBoxWriter(self.dbx, '/file.bin', metadata=metadata, chunk_size=4 * MB) as writer:
+            writer.write(content[:3 * MB])
+            writer.write(content[3 * MB:])
+
+        dbx = self.dbx.dbx
+        dbx.files_upload_session_start.assert_called_once_with(content[:4 * MB])
+        appended = dbx.files_upload_session_append_v2.call_args_list
+        self.assertEqual([call[0][0] for call in appended],
+                         [content[idx * MB:(idx + 4) * MB] for idx in range(4, 20, 4)])
+        self.assertEqual([call[0][1].offset for call in appended], [4 * MB, 8 * MB, 12 * MB, 16 * MB])
+
+        dbx.files_upload_session_finish.assert_called_once()
+        last_chunk, cursor, commit = dbx.files_upload_session_finish.call_args[0]
+        self.assertEqual(last_chunk, content[20 * MB:])
+        self.assertEqual((cursor.session_id, cursor.offset), ('session', 20 * MB))
+        self.assertEqual((commit.path, commit.mode), ('/file.bin', WriteMode.overwrite))
+        dbx.files_upload.assert_not_called()
+
+    def test_small(self):
+        """Test content smaller than one chunk is uploaded with a single request"""
+        with DropBoxWriter(self.dbx, '/file.bin') as writer:
+            writer.write(b'content')
+        self.dbx.dbx.files_upload.assert_called_once_with(f=b'content', path='/file.bin', mode=None)
+        self.dbx.dbx.files_upload_session_start.assert_not_called()
+
+    def test_api_error(self):
+        """Test ApiError of upload requests is raised as IOError"""
+        error = ApiError('request_id', 'error', None, None)
+        self.dbx.dbx.files_upload_session_append_v2.side_effect = error
+        writer = DropBoxWriter(self.dbx, '/file.bin', chunk_size=4 * MB)
+        writer.write(bytes(4 * MB))
+        with self.assertRaises(IOError):
+            writer.write(bytes(4 * MB))
+        writer.abort()
+
+        self.dbx.dbx.files_upload.side_effect = error
+        writer = DropBoxWriter(self.dbx, '/file.bin')
+        writer.write(b'content')
+        with self.assertRaises(IOError):
+            writer.close()
+        self.assertTrue(writer.closed)
@@ -0,0 +1,201 @@
+import json
+import threading
+import unittest
+from collections import OrderedDict
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import httplib2
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+
+from cloudstorageio.interface.google_drive import DriveWriter, GoogleDriveInterface
+
+CHUNK_SIZE = DriveWriter.CHUNK_ALIGNMENT
+SESSION_URL = 'https://www.googleapis.com/upload/drive/v2/files?upload_id=session'
+
+
+class FakeHttp:
+    """Drive upload endpoints, which could commit only a part of a chunk"""
+
+    def __init__(self, partial_chunks: tuple = ()):
+        self.content = bytearray()
+        self.requests = []  # (method, uploadType or Content-Range) of each request
+        self._partial_chunks = set(partial_chunks)
+        self._chunk_idx = 0
+
+    @staticmethod
+    def _response(status: int, headers: dict = None, content: bytes = b''):
+        return httplib2.Response(dict(headers or {}, status=status)), content
+
+    def _file_response(self):
+        return self._response(200, content=json.dumps({'id': 'file-id', 'mimeType': 'text/plain'}).encode())
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        headers = headers or {}
+        if uri != SESSION_URL:
+            self.requests.append((method, uri.split('uploadType=')[1].split('&')[0]))
+            if 'uploadType=resumable' in uri:
+                return self._response(200, {'location': SESSION_URL})
+            return self._file_response()
+
+        content_range = headers.get('Content-Range')
+        self.requests.append((method, content_range))
+        byte_range, total = content_range.split(' ')[1].split('/')
+        start, end = map(int, byte_range.split('-'))
+        assert start == len(self.content) and end - start + 1 == len(body) <= CHUNK_SIZE
+        self._chunk_idx += 1
+        self.content += body[:len(body) // 2] if self._chunk_idx in self._partial_chunks else body
+        if total != '*' and len(self.content) == int(total):
+            return self._file_response()
+        return self._response(308, {'range': f'bytes=0-{len(self.content) - 1}'})
+
+
+class TestDriveWriter(unittest.TestCase):
+    """Tests chunked resumable uploads of DriveWriter with a fake http"""
+
+    def _writer(self, http: FakeHttp, file_id: str = None) -> DriveWriter:
+        interface = mock.MagicMock(encoding='utf8')
+        interface.service = build('drive', 'v2', http=http, static_discovery=True)
+        interface._create_folders.return_value = 'root'
+        return DriveWriter(interface, 'folder/file.txt', file_id=file_id, chunk_size=CHUNK_SIZE)
+
+    def test_chunks(self):
+        """Test full chunks are sent while writing (the last full one is kept for close)"""
+        content = bytes(range(256)) * (CHUNK_SIZE * 5 // 2 // 256)
+        http = FakeHttp()
+        writer = self._writer(http)
+        with writer:
+            writer.write(content[:CHUNK_SIZE * 2 + 1])
+            self.assertEqual(bytes(http.content), content[:CHUNK_SIZE])
+            writer.write(content[CHUNK_SIZE * 2 + 1:])
+        self.assertEqual(bytes(http.content), content)
+        self.assertEqual(http.requests, [('POST', 'resumable'),
+                                         ('PUT', f'bytes 0-{CHUNK_SIZE - 1}/*'),
+                                         ('PUT', f'bytes {CHUNK_SIZE}-{2 * CHUNK_SIZE - 1}/{len(content)}'),
+                                         ('PUT', f'bytes {2 * CHUNK_SIZE}-{len(content) - 1}/{len(content)}')])
+        self.assertEqual(writer.id, 'file-id')
+        writer._interface._cache_set.assert_called_once_with('folder/file.txt', 'file-id', 'text/plain')
+
+    def test_exact_chunks(self):
+        """Test content of exact chunk size finishes the upload with its last chunk"""
+        content = b'x' * CHUNK_SIZE * 2
+        http = FakeHttp()
+        with self._writer(http, file_id='file-id') as writer:
+            writer.write(content)
+        self.assertEqual(bytes(http.content), content)
+        self.assertEqual(http.requests[0], ('PUT', 'resumable'))
+        self.assertEqual(http.requests[-1], ('PUT', f'bytes {CHUNK_SIZE}-{2 * CHUNK_SIZE - 1}/{len(content)}'))
+
+    def test_partial_chunk(self):
+        """Test not committed part of a chunk is sent with the next one"""
+        content = bytes(range(256)) * (CHUNK_SIZE * 7 // 2 // 256)
+        http = FakeHttp(partial_chunks=(1,))
+        with self._writer(http) as writer:
+            writer.write(content)
+        self.assertEqual(bytes(http.content), content)
+        self.assertEqual(http.requests[2][1].split('-')[0], f'bytes {CHUNK_SIZE // 2}')
+
+    def test_small_content(self):
+        """Test content smaller than one chunk is uploaded with a single request"""
+        http = FakeHttp()
+        with self._writer(http) as writer:
+            writer.write('content')
+        self.assertEqual(http.requests, [('POST', 'multipart')])
+
+    def test_abort(self):
+        """Test failed `with` block does not finish the upload"""
+        http = FakeHttp()
+        with self.assertRaises(RuntimeError):
+            with self._writer(http) as writer:
+                writer.write(b'x' * CHUNK_SIZE * 3)
+                raise RuntimeError
+        self.assertEqual(len(http.content), CHUNK_SIZE * 2)
+        self.assertTrue(all(r[1].endswith('/*') for r in http.requests[1:]))
+
+
+class FakeListHttp:
+    """Drive files list endpoint of a folder tree, which could fail on given page"""
+
+    def __init__(self, tree: dict, failing_page: int = None):
+        self.tree = tree  # folder id -> list of children (id, title, mimeType)
+        self.pages = 0
+        self._failing_page = failing_page
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        query = parse_qs(urlparse(uri).query)
+        folder_id = query['q'][0].split("'")[1]
+        offset = int(query.get('pageToken', ['0'])[0])
+        page_size = int(query['maxResults'][0])
+        self.pages += 1
+        if self.pages == self._failing_page:
+            return httplib2.Response({'status': 503}), b'{"error": {"message": "Backend Error"}}'
+
+        children = self.tree.get(folder_id, [])
+        response = {'items': children[offset:offset + page_size]}
+        if offset + page_size < len(children):
+            response['nextPageToken'] = str(offset + page_size)
+        return httplib2.Response({'status': 200}), json.dumps(response).encode()
+
+
+class TestGoogleDriveListing(unittest.TestCase):
+    """Tests listdir, stat and path cache of GoogleDriveInterface with a fake http"""
+    FOLDER = GoogleDriveInterface.FOLDER_MIMETYPE
+
+    def setUp(self):
+        tree = {'root': [{'id': 'folder', 'title': 'folder', 'mimeType': self.FOLDER}]}
+        tree['folder'] = [{'id': f'file-{i}', 'title': f'file-{i}.txt', 'mimeType': 'text/plain'} for i in range(5)]
+        tree['folder'].append({'id': 'sub', 'title': 'sub', 'mimeType': self.FOLDER})
+        tree['sub'] = [{'id': 'sub-file', 'title': 'file.txt', 'mimeType': 'text/plain'}]
+        self.tree = tree
+
+    def _interface(self, http, cache_size: int = GoogleDriveInterface.DEFAULT_CACHE_SIZE) -> GoogleDriveInterface:
+        interface = GoogleDriveInterface.__new__(GoogleDriveInterface)
+        interface._cache_ttl = GoogleDriveInterface.DEFAULT_CACHE_TTL
+        interface._cache_size = cache_size
+        interface._id_cache = OrderedDict()
+        interface._id_cache_lock = threading.Lock()
+        interface._thread_local = threading.local()
+        interface._thread_local.service = build('drive', 'v2', http=http, static_discovery=True)
+        interface._cache_set('folder', 'folder', self.FOLDER)
+        return interface
+
+    def test_listdir(self):
+        """Test recursive listing through pages caches only listed folders"""
+        interface = self._interface(FakeListHttp(self.tree))
+        with mock.patch.object(GoogleDriveInterface, 'LIST_PAGE_SIZE', 2):
+            listdir = interface.listdir('gdrive://folder', recursive=True)
+        self.assertEqual(sorted(listdir), [f'file-{i}.txt' for i in range(5)] + ['sub/', 'sub/file.txt'])
+        self.assertEqual(list(interface._id_cache), ['folder', 'folder/sub'])
+
+    def test_failed_page(self):
+        """Test failed page request is raised instead of returning a partial listing"""
+        interface = self._interface(FakeListHttp(self.tree, failing_page=2))
+        with mock.patch.object(GoogleDriveInterface, 'LIST_PAGE_SIZE', 2):
+            with self.assertRaises(HttpError):
+                interface.listdir('gdrive://folder')
+
+    def test_cache_size(self):
+        """Test least recently used paths are dropped above the cache size"""
+        interface = self._interface(FakeListHttp(self.tree), cache_size=2)
+        interface._cache_set('a', 'a', self.FOLDER)
+        self.assertEqual(interface._cache_get('folder'), ('folder', self.FOLDER))
+        interface._cache_set('b', 'b', self.FOLDER)
+        self.assertEqual(list(interface._id_cache), ['folder', 'b'])
+        self.assertIsNone(interface._cache_get('a'))
+
+    def test_stat(self):
+        """Test stat of resolved file costs a single metadata request, folders need no request"""
+        metadata = {'fileSize': '5', 'modifiedDate': '2020-01-01T00:00:00.000Z', 'md5Checksum': 'md5',
+                    'mimeType': 'text/plain'}
+        http = HttpMockSequence([({'status': '200'}, json.dumps(metadata))])
+        interface = self._interface(http)
+        interface._cache_set('folder/file.txt', 'file-id', 'text/plain')
+
+        self.assertTrue(interface.stat('gdrive://folder').isdir)
+        stat = interface.stat('gdrive://folder/file.txt')
+        self.assertTrue(stat.isfile)
+        self.assertEqual((stat.size, stat.md5, stat.mtime.year), (5, 'md5', 2020))
+        self.assertEqual(len(http.request_sequence), 1)
+        self.assertIn('files/file-id', http.request_sequence[0][0])
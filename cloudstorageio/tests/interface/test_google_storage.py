@@ -0,0 +1,136 @@
+import json
+import unittest
+from unittest import mock
+
+from requests.structures import CaseInsensitiveDict
+
+from cloudstorageio.interface.google_storage import GoogleStorageWriter
+
+CHUNK_SIZE = GoogleStorageWriter.CHUNK_ALIGNMENT
+SESSION_URL = 'https://storage.googleapis.com/upload/session'
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict = None, content: bytes = b''):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+        self.text = content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    """Resumable upload session of the server, which could fail a chunk after committing a part of it"""
+
+    def __init__(self, fail_chunks: tuple = ()):
+        self.content = bytearray()
+        self.requests = []  # (method, Content-Range header) of each request
+        self.finished = False
+        self.deleted = False
+        self._fail_chunks = set(fail_chunks)
+        self._chunk_idx = 0
+
+    def _committed_response(self) -> FakeResponse:
+        headers = {'Range': f'bytes=0-{len(self.content) - 1}'} if self.content else {}
+        return FakeResponse(308, headers)
+
+    def request(self, method: str, url: str, data=None, headers=None, timeout=None):
+        assert timeout is not None
+        content_range = (headers or {}).get('content-range')
+        self.requests.append((method, content_range))
+        if method == 'POST':
+            return FakeResponse(200, {'Location': SESSION_URL})
+
+        byte_range, total = content_range.split(' ')[1].split('/')
+        if byte_range == '*':
+            if total != '*':
+                self.finished = True
+                return FakeResponse(200, content=b'{}')
+            return self._committed_response()
+
+        start = int(byte_range.split('-')[0])
+        assert start <= len(self.content)
+        data = data[len(self.content) - start:]
+        self._chunk_idx += 1
+        if self._chunk_idx in self._fail_chunks:
+            # only a part of the chunk is persisted before the failure
+            self.content += data[:len(data) // 3]
+            return FakeResponse(400, content=b'Bad request')
+
+        self.content += data
+        if total != '*' and len(self.content) == int(total):
+            self.finished = True
+            return FakeResponse(200, content=b'{}')
+        return self._committed_response()
+
+    def delete(self, url: str, timeout=None):
+        self.deleted = True
+        return FakeResponse(499)
+
+
+class TestGoogleStorageWriter(unittest.TestCase):
+    """Tests chunked resumable uploads of GoogleStorageWriter with a fake session"""
+
+    def _writer(self, session: FakeSession) -> GoogleStorageWriter:
+        bucket = mock.MagicMock()
+        bucket.name = 'bucket'
+        bucket.blob.return_value.name = 'file.bin'
+        interface = mock.MagicMock(encoding='utf8', session=session)
+        return GoogleStorageWriter(interface, bucket, 'file.bin', chunk_size=CHUNK_SIZE)
+
+    def test_chunks(self):
+        """Test content is sent in full chunks and finished with the rest"""
+        content = bytes(range(256)) * (CHUNK_SIZE * 5 // 2 // 256)
+        session = FakeSession()
+        with self._writer(session) as writer:
+            writer.write(content)
+        self.assertTrue(session.finished)
+        self.assertEqual(bytes(session.content), content)
+        self.assertEqual([r for r in session.requests if r[0] == 'PUT'],
+                         [('PUT', f'bytes 0-{CHUNK_SIZE - 1}/*'),
+                          ('PUT', f'bytes {CHUNK_SIZE}-{2 * CHUNK_SIZE - 1}/*'),
+                          ('PUT', f'bytes {2 * CHUNK_SIZE}-{len(content) - 1}/{len(content)}')])
+
+    def test_exact_chunks(self):
+        """Test content of exact chunk size is finished with an empty request"""
+        content = b'x' * CHUNK_SIZE * 2
+        session = FakeSession()
+        with self._writer(session) as writer:
+            writer.write(content)
+        self.assertEqual(bytes(session.content), content)
+        self.assertEqual(session.requests[-1], ('PUT', f'bytes */{len(content)}'))
+
+    @mock.patch('cloudstorageio.interface.google_storage.time.sleep')
+    def test_failed_chunk(self, _):
+        """Test failed chunk is sent again from the offset committed by the server"""
+        content = bytes(range(256)) * (CHUNK_SIZE * 5 // 2 // 256)
+        session = FakeSession(fail_chunks=(2,))
+        with self._writer(session) as writer:
+            writer.write(content)
+        self.assertTrue(session.finished)
+        self.assertEqual(bytes(session.content), content)
+
+        committed = CHUNK_SIZE + CHUNK_SIZE // 3
+        recover_idx = session.requests.index(('PUT', 'bytes */*'))
+        self.assertEqual(session.requests[recover_idx + 1][1].split(' ')[1].split('-')[0], str(committed))
+
+    @mock.patch('cloudstorageio.interface.google_storage.time.sleep')
+    def test_failed_upload(self, _):
+        """Test chunk failing after all retries raises IOError and cancels the session"""
+        session = FakeSession(fail_chunks=range(1, 10))
+        with self.assertRaises(IOError):
+            with self._writer(session) as writer:
+                writer.write(b'x' * CHUNK_SIZE)
+        self.assertTrue(session.deleted)
+        self.assertFalse(session.finished)
+
+    def test_small_content(self):
+        """Test content smaller than one chunk is uploaded with a single request"""
+        session = FakeSession()
+        writer = self._writer(session)
+        with writer:
+            writer.write(b'content')
+        writer._blob.upload_from_string.assert_called_once()
+        self.assertEqual(session.requests, [])
@@ -0,0 +1,65 @@
+import datetime
+import unittest
+
+from botocore.stub import Stubber
+
+from cloudstorageio.interface.s3 import S3Interface
+
+
+class TestS3Stat(unittest.TestCase):
+    """Tests requests of S3Interface stat, isfile and isdir with stubbed client"""
+
+    def setUp(self):
+        self.s3 = S3Interface(aws_access_key_id='key', aws_secret_access_key='secret', aws_region_name='us-east-1')
+        self.stubber = Stubber(self.s3.client)
+        self.stubber.activate()
+
+    def tearDown(self):
+        self.stubber.deactivate()
+
+    def _head(self, key: str, found: bool = True):
+        if found:
+            response = {'ContentLength': 5, 'ETag': '"etag"', 'LastModified': datetime.datetime(2020, 1, 1)}
+            self.stubber.add_response('head_object', response, {'Bucket': 'bucket', 'Key': key})
+        else:
+            self.stubber.add_client_error('head_object', service_error_code='404', http_status_code=404,
+                                          expected_params={'Bucket': 'bucket', 'Key': key})
+
+    def _list(self, key: str, count: int):
+        self.stubber.add_response('list_objects_v2', {'KeyCount': count},
+                                  {'Bucket': 'bucket', 'Prefix': f'{key}/', 'Delimiter': '/', 'MaxKeys': 1})
+
+    def test_file(self):
+        """Test file stat costs a single HEAD request"""
+        self._head('folder/file.txt')
+        stat = self.s3.stat('s3://bucket/folder/file.txt')
+        self.stubber.assert_no_pending_responses()
+        self.assertTrue(stat.isfile)
+        self.assertEqual((stat.size, stat.etag), (5, 'etag'))
+
+    def test_folder(self):
+        """Test folder stat costs a single MaxKeys=1 listing (and a HEAD without trailing slash)"""
+        self._list('folder', 1)
+        self.assertTrue(self.s3.stat('s3://bucket/folder/').isdir)
+        self.stubber.assert_no_pending_responses()
+
+        self._head('folder', found=False)
+        self._list('folder', 1)
+        self.assertTrue(self.s3.stat('s3://bucket/folder').isdir)
+        self.stubber.assert_no_pending_responses()
+
+    def test_missing(self):
+        """Test missing path raises FileNotFoundError"""
+        self._head('missing', found=False)
+        self._list('missing', 0)
+        with self.assertRaises(FileNotFoundError):
+            self.s3.stat('s3://bucket/missing')
+        self.stubber.assert_no_pending_responses()
+
+    def test_isfile_isdir(self):
+        """Test isfile and isdir cost a single request each"""
+        self._head('folder/file.txt')
+        self.assertTrue(self.s3.isfile('s3://bucket/folder/file.txt'))
+        self._list('folder', 1)
+        self.assertTrue(self.s3.isdir('s3://bucket/folder'))
+        self.stubber.assert_no_pending_responses()
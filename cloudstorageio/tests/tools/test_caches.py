@@ -0,0 +1,250 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from cloudstorageio.tools.disk_cache import COMPRESS_MIN_SIZE, DiskCache
+from cloudstorageio.tools.metadata_cache import ClosingWriter, MetadataCache
+from cloudstorageio.tools.read_cache import ReadCache
+
+
+class TestDiskCache(unittest.TestCase):
+    """Tests DiskCache in a temporary folder"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = DiskCache(self.folder, max_size=1000)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.folder)
+
+    def _value_files(self) -> list:
+        return [f for f in os.listdir(self.folder) if f.endswith('.bin')]
+
+    def test_set_get(self):
+        """Test set, get, replace and delete of values"""
+        self.cache.set('a', b'first')
+        self.assertEqual(self.cache.get('a'), b'first')
+        self.assertIn('a', self.cache)
+
+        self.cache.set('a', b'second value')
+        self.assertEqual(self.cache.get('a'), b'second value')
+        self.assertEqual(self.cache.size, len(b'second value'))
+        self.assertEqual(len(self._value_files()), 1)
+
+        self.cache.delete('a')
+        self.assertNotIn('a', self.cache)
+        with self.assertRaises(KeyError):
+            self.cache.get('a')
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(self._value_files(), [])
+
+    def test_eviction(self):
+        """Test total size stays at most max_size and least recently used values are evicted"""
+        for i in range(5):
+            self.cache.set(str(i), bytes(300))
+            self.assertLessEqual(self.cache.size, self.cache.max_size)
+        self.assertEqual(self.cache.size, 900)
+        self.assertEqual(len(self._value_files()), 3)
+        for key in ('0', '1'):
+            self.assertNotIn(key, self.cache)
+
+        self.cache.get('2')
+        self.cache.set('5', bytes(300))
+        self.assertIn('2', self.cache)
+        self.assertNotIn('3', self.cache)
+
+        self.cache.set('big', bytes(2000))
+        self.assertNotIn('big', self.cache)
+        self.assertLessEqual(self.cache.size, self.cache.max_size)
+
+    def test_ttl(self):
+        """Test expired values raise KeyError and are removed"""
+        self.cache.set('short', b'value', ttl=0.05)
+        self.cache.set('long', b'value', ttl=60)
+        self.assertEqual(self.cache.get('short'), b'value')
+        time.sleep(0.1)
+        with self.assertRaises(KeyError):
+            self.cache.get('short')
+        self.assertNotIn('short', self.cache)
+        self.assertEqual(self.cache.get('long'), b'value')
+        self.assertEqual(self.cache.size, len(b'value'))
+
+    def test_compression(self):
+        """Test compressed values round trip and are not exposed as files"""
+        cache = DiskCache(self.folder, compress=True)
+        value = b'lorem ipsum ' * COMPRESS_MIN_SIZE
+        cache.set('big', value)
+        cache.set('small', b'small')
+        self.assertEqual(cache.get('big'), value)
+        self.assertLess(cache.size, len(value))
+        self.assertIsNone(cache.get_file_path('big'))
+        with open(cache.get_file_path('small'), 'rb') as f:
+            self.assertEqual(f.read(), b'small')
+        cache.close()
+
+    def test_shared_folder(self):
+        """Test values set by one instance are visible to another one of the same folder"""
+        other = DiskCache(self.folder, max_size=1000)
+        self.cache.set('a', b'value')
+        self.assertEqual(other.get('a'), b'value')
+        other.delete('a')
+        self.assertNotIn('a', self.cache)
+        other.close()
+
+    def test_set_file(self):
+        """Test temporary files are moved into the cache"""
+        tmp_path = self.cache.create_temp_file()
+        with open(tmp_path, 'wb') as f:
+            f.write(b'file content')
+        self.cache.set_file('a', tmp_path)
+        self.assertFalse(os.path.exists(tmp_path))
+        with open(self.cache.get_file_path('a'), 'rb') as f:
+            self.assertEqual(f.read(), b'file content')
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get_file_path('a'))
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(self._value_files(), [])
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Tests MetadataCache"""
+
+    def test_get_set(self):
+        """Test cached results and errors"""
+        cache = MetadataCache()
+        cache.set('s3://bucket/file.txt', 'isfile', True)
+        cache.set('s3://bucket/missing.txt', 'stat', FileNotFoundError('No such file'))
+        self.assertTrue(cache.get('s3://bucket/file.txt', 'isfile'))
+        with self.assertRaises(KeyError):
+            cache.get('s3://bucket/file.txt', 'isdir')
+        with self.assertRaises(FileNotFoundError):
+            cache.get('s3://bucket/missing.txt', 'stat')
+
+    def test_ttl(self):
+        """Test expired results raise KeyError and local paths are not cached"""
+        cache = MetadataCache(ttl={'s3://': 0.05})
+        cache.set('s3://bucket/file.txt', 'isfile', True)
+        cache.set('/tmp/file.txt', 'isfile', True)
+        self.assertTrue(cache.get('s3://bucket/file.txt', 'isfile'))
+        with self.assertRaises(KeyError):
+            cache.get('/tmp/file.txt', 'isfile')
+        time.sleep(0.1)
+        with self.assertRaises(KeyError):
+            cache.get('s3://bucket/file.txt', 'isfile')
+        self.assertEqual(len(cache), 0)
+
+    def test_max_entries(self):
+        """Test least recently used results are dropped above max_entries"""
+        cache = MetadataCache(max_entries=2)
+        cache.set('s3://bucket/a', 'isfile', True)
+        cache.set('s3://bucket/b', 'isfile', True)
+        cache.get('s3://bucket/a', 'isfile')
+        cache.set('s3://bucket/c', 'isfile', True)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get('s3://bucket/a', 'isfile'))
+        with self.assertRaises(KeyError):
+            cache.get('s3://bucket/b', 'isfile')
+
+    def test_invalidate(self):
+        """Test invalidation of path, its parent folders and (recursively) its children"""
+        cache = MetadataCache()
+        paths = ['s3://bucket', 's3://bucket/folder', 's3://bucket/folder/file.txt',
+                 's3://bucket/folder/sub/file.txt', 's3://bucket/other.txt', 's3://bucket/folder2']
+        for path in paths:
+            cache.set(path, 'isdir', False)
+
+        cache.invalidate('s3://bucket/folder/file.txt')
+        for path in paths[:3]:
+            with self.assertRaises(KeyError):
+                cache.get(path, 'isdir')
+        for path in paths[3:]:
+            self.assertFalse(cache.get(path, 'isdir'))
+
+        cache.invalidate('s3://bucket/folder/', recursive=True)
+        with self.assertRaises(KeyError):
+            cache.get('s3://bucket/folder/sub/file.txt', 'isdir')
+        self.assertFalse(cache.get('s3://bucket/folder2', 'isdir'))
+        self.assertFalse(cache.get('s3://bucket/other.txt', 'isdir'))
+
+    def test_closing_writer(self):
+        """Test on_close is called after the writer is closed, also if its `with` block fails"""
+        calls = []
+
+        class Writer:
+            closed = False
+
+            def write(self, content):
+                return len(content)
+
+            def close(self):
+                self.closed = True
+                calls.append('close')
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, exc_type, exc_val, exc_tb):
+                self.close()
+
+        with ClosingWriter(Writer(), on_close=lambda: calls.append('on_close')) as writer:
+            self.assertEqual(writer.write('content'), 7)
+        self.assertEqual(calls, ['close', 'on_close'])
+        self.assertTrue(writer.closed)
+
+        calls.clear()
+        with self.assertRaises(RuntimeError):
+            with ClosingWriter(Writer(), on_close=lambda: calls.append('on_close')):
+                raise RuntimeError
+        self.assertEqual(calls, ['close', 'on_close'])
+
+
+class TestReadCache(unittest.TestCase):
+    """Tests ReadCache in a temporary folder"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _add(self, cache: ReadCache, path: str, etag: str, content: bytes) -> str:
+        tmp_path = cache.create_temp_file()
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        return cache.add_file(path, etag, tmp_path)
+
+    def test_etag(self):
+        """Test cached content is found by path and ETag only, a changed ETag misses the cache"""
+        cache = ReadCache(self.folder)
+        local_path = self._add(cache, 's3://bucket/file.txt', '"etag1"', b'first version')
+        self.assertEqual(cache.get_file_path('s3://bucket/file.txt', '"etag1"'), local_path)
+        with open(local_path, 'rb') as f:
+            self.assertEqual(f.read(), b'first version')
+        self.assertIsNone(cache.get_file_path('s3://bucket/file.txt', '"etag2"'))
+        self.assertIsNone(cache.get_file_path('s3://bucket/other.txt', '"etag1"'))
+
+    def test_validation_ttl(self):
+        """Test validated ETags are kept for validation_ttl and dropped by forget"""
+        cache = ReadCache(self.folder)
+        cache.set_validated_etag('s3://bucket/file.txt', '"etag1"')
+        self.assertIsNone(cache.get_validated_etag('s3://bucket/file.txt'))
+
+        cache = ReadCache(self.folder, validation_ttl=0.05)
+        cache.set_validated_etag('s3://bucket/file.txt', '"etag1"')
+        self.assertEqual(cache.get_validated_etag('s3://bucket/file.txt'), '"etag1"')
+        cache.forget('s3://bucket/file.txt')
+        self.assertIsNone(cache.get_validated_etag('s3://bucket/file.txt'))
+
+        cache.set_validated_etag('s3://bucket/file.txt', '"etag1"')
+        time.sleep(0.1)
+        self.assertIsNone(cache.get_validated_etag('s3://bucket/file.txt'))
+
+    def test_max_size(self):
+        """Test objects bigger than the cache are not kept"""
+        cache = ReadCache(self.folder, max_size=10)
+        self.assertIsNone(self._add(cache, 's3://bucket/file.txt', '"etag1"', b'content bigger than cache'))
+        self.assertIsNotNone(self._add(cache, 's3://bucket/small.txt', '"etag1"', b'small'))
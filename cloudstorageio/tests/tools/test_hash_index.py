@@ -0,0 +1,86 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from cloudstorageio.interface.local_storage import LocalStorageInterface
+from cloudstorageio.tools import hash_index
+from cloudstorageio.tools.hash_index import LocalHashIndex, compute_hashes
+
+
+class TestLocalHashIndex(unittest.TestCase):
+    """Tests LocalHashIndex in a temporary folder"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.folder, 'cache')
+        self.files = list()
+        for i in range(3):
+            path = os.path.join(self.folder, 'files', f'file-{i}.txt')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(f'content {i}'.encode())
+            self.files.append(path)
+        self.index = LocalHashIndex(cache_dir=self.cache_dir, max_workers=2)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.folder)
+
+    def _get_hashes(self, index: LocalHashIndex, paths: list) -> tuple:
+        """Returns hashes of given paths and paths which were read"""
+        with mock.patch.object(hash_index, 'compute_hashes', side_effect=compute_hashes) as compute:
+            hashes = index.get_hashes(paths)
+        return hashes, sorted(call.args[0] for call in compute.call_args_list)
+
+    def test_hashes(self):
+        """Test digests of files"""
+        hashes, _ = self._get_hashes(self.index, self.files)
+        self.assertEqual(sorted(hashes), sorted(self.files))
+        for path in self.files:
+            with open(path, 'rb') as f:
+                content = f.read()
+            self.assertEqual(hashes[path].md5, hashlib.md5(content).hexdigest())
+            self.assertEqual(hashes[path].content_hash,
+                             hashlib.sha256(hashlib.sha256(content).digest()).hexdigest())
+
+    def test_index_hits(self):
+        """Test unchanged files are not read again, also by another instance of the same folder"""
+        hashes, read = self._get_hashes(self.index, self.files)
+        self.assertEqual(read, sorted(self.files))
+
+        self.assertEqual(self._get_hashes(self.index, self.files), (hashes, []))
+        other = LocalHashIndex(cache_dir=self.cache_dir)
+        self.assertEqual(self._get_hashes(other, self.files), (hashes, []))
+        other.close()
+
+    def test_changed_files(self):
+        """Test only changed (content, size or mtime) and new files are read again"""
+        hashes, _ = self._get_hashes(self.index, self.files[:2])
+        with open(self.files[0], 'wb') as f:
+            f.write(b'changed content')
+        st = os.stat(self.files[1])
+        os.utime(self.files[1], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+        new_hashes, read = self._get_hashes(self.index, self.files)
+        self.assertEqual(read, sorted(self.files))
+        self.assertNotEqual(new_hashes[self.files[0]], hashes[self.files[0]])
+        self.assertEqual(new_hashes[self.files[1]], hashes[self.files[1]])
+
+    def test_given_stats(self):
+        """Test given stats are used instead of stat-ing files again"""
+        stats = {path: os.stat(path) for path in self.files}
+        with mock.patch.object(hash_index.os, 'stat') as stat:
+            hashes = self.index.get_hashes(self.files, stats=stats)
+        stat.assert_not_called()
+        self.assertEqual(sorted(hashes), sorted(self.files))
+
+    def test_scandir(self):
+        """Test scandir of LocalStorageInterface fills digests from the index"""
+        local = LocalStorageInterface(local_hash_index=True, cache_dir=self.cache_dir)
+        objects = {obj.path: obj for obj in local.scandir(os.path.join(self.folder, 'files'))}
+        self.assertEqual(sorted(objects), ['file-0.txt', 'file-1.txt', 'file-2.txt'])
+        self.assertEqual(objects['file-0.txt'].md5, hashlib.md5(b'content 0').hexdigest())
+        self.assertEqual(objects['file-0.txt'].size, len(b'content 0'))
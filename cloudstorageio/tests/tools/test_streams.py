@@ -0,0 +1,306 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from cloudstorageio.interface.cloud_interface import CloudInterface
+from cloudstorageio.interface.local_storage import LocalFile
+from cloudstorageio.tools.streams import ChunkedWriter, RangeReader, copy_stream
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+class MemoryReader(RangeReader):
+    """RangeReader over bytes in memory, records fetched ranges"""
+
+    def __init__(self, content: bytes, **kwargs):
+        super().__init__(len(content), **kwargs)
+        self.content = content
+        self.fetched = []
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        self.fetched.append((start, end))
+        return self.content[start:end + 1]
+
+
+class MemoryWriter(ChunkedWriter):
+    """ChunkedWriter into memory, records uploaded chunks"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.chunks = []
+        self.completed = None
+        self.aborted = False
+
+    def _upload_chunk(self, chunk: bytes):
+        self.chunks.append(chunk)
+
+    def _complete(self, last_chunk: bytes):
+        self.completed = b''.join(self.chunks) + last_chunk
+
+    def _abort(self):
+        self.aborted = True
+
+
+class FailingStream(io.RawIOBase):
+    """Stream failing on read/write after given amount of calls"""
+
+    def __init__(self, calls: int):
+        super().__init__()
+        self.calls = calls
+
+    def _call(self, size: int) -> bytes:
+        if self.calls <= 0:
+            raise IOError('Stream failed')
+        self.calls -= 1
+        return b'x' * size
+
+    def read(self, size: int = -1) -> bytes:
+        return self._call(size)
+
+    def write(self, content: bytes) -> int:
+        return len(self._call(len(content)))
+
+
+class TestRangeReader(unittest.TestCase):
+    """Tests RangeReader with in-memory ranges"""
+
+    def test_read(self):
+        """Test reading whole content and chunks across block boundaries"""
+        for readahead in (0, 2):
+            with MemoryReader(CONTENT, block_size=1000, readahead=readahead) as reader:
+                self.assertEqual(reader.read(), CONTENT)
+                self.assertEqual(reader.read(), b'')
+
+            with MemoryReader(CONTENT, block_size=1000, readahead=readahead) as reader:
+                parts = iter(lambda: reader.read(333), b'')
+                self.assertEqual(b''.join(parts), CONTENT)
+
+    def test_seek(self):
+        """Test seek and tell"""
+        with MemoryReader(CONTENT, block_size=1000, readahead=0) as reader:
+            self.assertEqual(reader.seek(2500), 2500)
+            self.assertEqual(reader.read(1000), CONTENT[2500:3500])
+            self.assertEqual(reader.seek(-500, io.SEEK_CUR), 3000)
+            self.assertEqual(reader.read(10), CONTENT[3000:3010])
+            self.assertEqual(reader.seek(-10, io.SEEK_END), len(CONTENT) - 10)
+            self.assertEqual(reader.read(), CONTENT[-10:])
+            self.assertEqual(reader.tell(), len(CONTENT))
+
+            reader.seek(len(CONTENT) + 100)
+            self.assertEqual(reader.read(), b'')
+            with self.assertRaises(ValueError):
+                reader.seek(-1)
+
+    def test_readinto(self):
+        """Test readinto of bytearray and memoryview"""
+        with MemoryReader(CONTENT, block_size=1000, readahead=0) as reader:
+            reader.seek(900)
+            buffer = bytearray(300)
+            self.assertEqual(reader.readinto(buffer), 300)
+            self.assertEqual(bytes(buffer), CONTENT[900:1200])
+
+            reader.seek(len(CONTENT) - 100)
+            buffer = bytearray(300)
+            self.assertEqual(reader.readinto(memoryview(buffer)), 100)
+            self.assertEqual(bytes(buffer[:100]), CONTENT[-100:])
+
+    def test_block_cache(self):
+        """Test blocks are fetched once and evicted above the cache limit"""
+        with MemoryReader(CONTENT, block_size=1000, readahead=0, cache_blocks=2) as reader:
+            reader.read(100)
+            reader.seek(0)
+            reader.read(100)
+            self.assertEqual(reader.fetched, [(0, 999)])
+
+            reader.seek(1000)
+            reader.read(100)
+            reader.seek(2000)
+            reader.read(100)
+            self.assertLessEqual(len(reader._blocks), 2)
+            self.assertNotIn(0, reader._blocks)
+
+            reader.seek(0)
+            self.assertEqual(reader.read(100), CONTENT[:100])
+            self.assertEqual(reader.fetched.count((0, 999)), 2)
+
+    def test_readahead(self):
+        """Test sequential reading prefetches next blocks and keeps bounded amount of them"""
+        with MemoryReader(CONTENT, block_size=1000, readahead=2) as reader:
+            reader.read(100)
+            self.assertEqual(sorted(reader._blocks), [0, 1, 2])
+            for _ in range(8):
+                reader.read(1000)
+                self.assertLessEqual(len(reader._blocks), reader._cache_blocks)
+            self.assertEqual(reader.fetched, sorted(set(reader.fetched)))
+
+    def test_text_reading(self):
+        """Test reading through buffered text stream"""
+        content = 'lorem ipsum\n' * 1000
+        raw = MemoryReader(content.encode('utf8'), block_size=1000)
+        with io.TextIOWrapper(io.BufferedReader(raw), encoding='utf8') as reader:
+            self.assertEqual(reader.readline(), 'lorem ipsum\n')
+            self.assertEqual(reader.read(), content[12:])
+
+
+class TestChunkedWriter(unittest.TestCase):
+    """Tests ChunkedWriter with in-memory uploads"""
+
+    def test_chunks(self):
+        """Test content is uploaded in full chunks and the rest is completed on close"""
+        writer = MemoryWriter(chunk_size=1000)
+        with writer:
+            self.assertEqual(writer.write(CONTENT[:999]), 999)
+            self.assertEqual(writer.chunks, [])
+            writer.write(CONTENT[999:2500])
+            self.assertEqual(writer.chunks, [CONTENT[:1000], CONTENT[1000:2000]])
+            writer.write(CONTENT[2500:])
+            self.assertEqual(writer.tell(), len(CONTENT))
+        self.assertTrue(all(len(chunk) == 1000 for chunk in writer.chunks))
+        self.assertEqual(writer.completed, CONTENT)
+        self.assertTrue(writer.closed)
+
+    def test_exact_chunks(self):
+        """Test content of exact chunk size completes with empty last chunk"""
+        writer = MemoryWriter(chunk_size=1024)
+        with writer:
+            writer.write(CONTENT)
+        self.assertEqual(len(writer.chunks), 10)
+        self.assertEqual(writer.completed, CONTENT)
+
+    def test_file_objects(self):
+        """Test writing of binary and text file objects (text ones used to hang)"""
+        writer = MemoryWriter(chunk_size=1000)
+        with writer:
+            self.assertEqual(writer.write(io.BytesIO(CONTENT)), len(CONTENT))
+        self.assertEqual(writer.completed, CONTENT)
+
+        text = 'lorem ipsum ' * 1000
+        writer = MemoryWriter(chunk_size=1000)
+        with writer:
+            self.assertEqual(writer.write(io.StringIO(text)), len(text))
+            writer.write('dolor')
+        self.assertEqual(writer.completed, (text + 'dolor').encode('utf8'))
+
+    def test_abort(self):
+        """Test failed `with` block aborts the upload"""
+        writer = MemoryWriter(chunk_size=1000)
+        with self.assertRaises(RuntimeError):
+            with writer:
+                writer.write(CONTENT)
+                raise RuntimeError
+        self.assertTrue(writer.aborted)
+        self.assertIsNone(writer.completed)
+        self.assertTrue(writer.closed)
+        with self.assertRaises(ValueError):
+            writer.write(b'content')
+
+    def test_failed_complete(self):
+        """Test failed completion aborts the upload"""
+        class FailingWriter(MemoryWriter):
+            def _complete(self, last_chunk: bytes):
+                raise IOError('Upload failed')
+
+        writer = FailingWriter(chunk_size=1000)
+        with self.assertRaises(IOError):
+            with writer:
+                writer.write(CONTENT)
+        self.assertTrue(writer.aborted)
+        self.assertTrue(writer.closed)
+
+
+class TestCopyStream(unittest.TestCase):
+    """Tests copy_stream function"""
+
+    def test_copy(self):
+        """Test content is copied in order"""
+        writer = MemoryWriter(chunk_size=1000)
+        with writer:
+            self.assertEqual(copy_stream(io.BytesIO(CONTENT), writer, chunk_size=100, buffers=2), len(CONTENT))
+        self.assertEqual(writer.completed, CONTENT)
+
+        with MemoryReader(CONTENT, block_size=1000) as reader:
+            output = io.BytesIO()
+            self.assertEqual(copy_stream(reader, output, chunk_size=333), len(CONTENT))
+        self.assertEqual(output.getvalue(), CONTENT)
+
+    def test_empty(self):
+        """Test copying of empty stream"""
+        output = io.BytesIO()
+        self.assertEqual(copy_stream(io.BytesIO(), output), 0)
+        self.assertEqual(output.getvalue(), b'')
+
+    def test_reader_error(self):
+        """Test error of reader is raised in calling thread"""
+        with self.assertRaises(IOError):
+            copy_stream(FailingStream(calls=3), io.BytesIO(), chunk_size=10, buffers=1)
+
+    def test_writer_error(self):
+        """Test error of writer is raised and stops the reading thread"""
+        reader = MemoryReader(CONTENT, block_size=100, readahead=0)
+        with self.assertRaises(IOError):
+            copy_stream(reader, FailingStream(calls=3), chunk_size=10, buffers=1)
+        self.assertLess(reader.tell(), len(CONTENT))
+
+    def test_abort_on_error(self):
+        """Test failed copy into ChunkedWriter aborts the upload"""
+        writer = MemoryWriter(chunk_size=10)
+        with self.assertRaises(IOError):
+            with writer:
+                copy_stream(FailingStream(calls=3), writer, chunk_size=10)
+        self.assertTrue(writer.aborted)
+        self.assertIsNone(writer.completed)
+
+
+class TestLocalFile(unittest.TestCase):
+    """Tests writing of LocalFile"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'file.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_write(self):
+        """Test written content replaces the file on close"""
+        with open(self.path, 'wb') as f:
+            f.write(b'old content')
+        with LocalFile(self.path, 'wb') as f:
+            f.write(b'new ')
+            f.write('content')
+            with open(self.path, 'rb') as old:
+                self.assertEqual(old.read(), b'old content')
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'new content')
+        self.assertEqual(os.listdir(self.folder), ['file.txt'])
+
+    def test_failed_write(self):
+        """Test failed `with` block leaves neither partial nor temporary file"""
+        with self.assertRaises(IOError):
+            with LocalFile(self.path, 'wb') as f:
+                copy_stream(FailingStream(calls=3), f, chunk_size=10)
+        self.assertEqual(os.listdir(self.folder), [])
+
+    def test_empty_write(self):
+        """Test copying or saving empty content creates an empty file"""
+        with LocalFile(self.path, 'wb') as f:
+            self.assertEqual(copy_stream(io.BytesIO(b''), f), 0)
+        self.assertTrue(os.path.isfile(self.path))
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        empty_path = os.path.join(self.folder, 'folder', 'empty.txt')
+        CloudInterface().save(empty_path, b'')
+        self.assertEqual(os.path.getsize(empty_path), 0)
+        self.assertEqual(sorted(os.listdir(self.folder)), ['file.txt', 'folder'])
+        self.assertEqual(os.listdir(os.path.dirname(empty_path)), ['empty.txt'])
+
+    def test_close_twice(self):
+        """Test closing the file again keeps its content"""
+        f = LocalFile(self.path, 'wb')
+        f.write(b'content')
+        f.close()
+        f.close()
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'content')
@@ -1,3 +1,41 @@
+import os
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from cloudstorageio.enums.enums import ObjectTypeEnums
+
+
+class ObjectStat(NamedTuple):
+    """Metadata of file/folder object, returned by interfaces' stat and scandir methods
+    etag is comparable only within the same storage, digests (md5 hex, base64 crc32c and dropBox content hash)
+    are comparable between storages
+    """
+    path: str
+    type: ObjectTypeEnums
+    size: Optional[int] = None
+    mtime: Optional[datetime] = None
+    etag: Optional[str] = None
+    md5: Optional[str] = None
+    crc32c: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    @property
+    def isfile(self) -> bool:
+        return self.type == ObjectTypeEnums.FILE
+
+    @property
+    def isdir(self) -> bool:
+        return self.type == ObjectTypeEnums.FOLDER
+
+
+def get_cache_dir(cache_dir: Optional[str] = None) -> str:
+    """Returns given cache folder, or CLOUDSTORAGEIO_CACHE_DIR environment variable, or ~/.cache/cloudstorageio"""
+    if cache_dir:
+        return cache_dir
+    return os.environ.get('CLOUDSTORAGEIO_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache',
+                                                                       'cloudstorageio')
+
+
 def add_slash(text: str):
     """returns the same text with slash at the end"""
     return text + '/'
@@ -0,0 +1,37 @@
+""" Thread pool helpers for I/O bound batch operations (copy, remove)
+
+    run_concurrently calls a function for each item in a bounded pool of threads.
+        Storage interfaces are thread safe, so all threads share the same clients and connection pools
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+DEFAULT_MAX_WORKERS = 16
+
+
+def run_concurrently(func: Callable, items: Iterable, max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
+    """Calls func for each item in a pool of threads, at most 2 * max_workers items are queued at once
+    :param func: function of a single item
+    :param items: items to process (could be a generator, it is consumed lazily)
+    :param max_workers: amount of threads
+    :return: item -> exception of each failed call
+    """
+    failures = dict()
+    failures_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max(max_workers, 1) * 2)
+
+    def _call(item):
+        try:
+            func(item)
+        except Exception as e:
+            with failures_lock:
+                failures[item] = e
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        for item in items:
+            slots.acquire()
+            executor.submit(_call, item)
+    return failures
@@ -1,15 +1,18 @@
-import copy
 import functools
 import hashlib
 import inspect
 import os
 import pickle
-import shutil
+import threading
 import time
 from typing import Callable, Optional
 
+from cloudstorageio.tools.ci_collections import get_cache_dir
+from cloudstorageio.tools.disk_cache import DiskCache, DEFAULT_MAX_SIZE
 from cloudstorageio.tools.logger import logger
 
+DEFAULT_FUNCTION_CACHE_TTL = 10 * 60  # seconds
+
 
 def timer(func) -> Callable:
     """A decorator which prints execution time of the decorated function"""
@@ -24,59 +27,47 @@ def timer(func) -> Callable:
     return wrapper
 
 
-def storage_cache_factory(path: str = '/tmp/cache') -> Callable:
+def storage_cache_factory(path: Optional[str] = None, ttl: Optional[float] = DEFAULT_FUNCTION_CACHE_TTL,
+                          max_size: Optional[int] = DEFAULT_MAX_SIZE, compress: Optional[bool] = True) -> Callable:
     """Factory decorator for modifying the decorated function to cache
-       and reuse results in a predefined path on the local storage
-    :param path: Path to the local cache location
+       and reuse results in a predefined path on the local storage (see DiskCache)
+    :param path: Path to the local cache location (by default `functions` folder in get_cache_dir())
+    :param ttl: seconds each result is reused, None - till it is evicted
+    :param max_size: maximum total size of cached results in bytes, least recently used ones are evicted
+    :param compress: compress big results (e.g. listings of large folders)
     :return: Decorator
     """
     def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            copy_args = copy.deepcopy(list(args))
-
-            all_args = {}
-            function_class_type = ''
+        signature = inspect.signature(func)
+        cache = None
+        cache_lock = threading.Lock()
 
-            # finding name of args and map name to value for having key value pair in the end
-            arg_specs = inspect.getfullargspec(func)
+        def get_cache() -> DiskCache:
+            # created on first call, so importing decorated functions does not touch the file system
+            nonlocal cache
+            with cache_lock:
+                if cache is None:
+                    cache = DiskCache(path or os.path.join(get_cache_dir(), 'functions'), max_size=max_size,
+                                      ttl=ttl, compress=compress)
+            return cache
 
-            # takes care of default arguments
-            if arg_specs.defaults:
-                start_idx = len(arg_specs.defaults)
-                default_arg_list = list(arg_specs.defaults)
-                for i, arg_name in enumerate(arg_specs.args[-start_idx:]):
-                    all_args[arg_name] = default_arg_list.pop(0)
-
-            for arg_name in arg_specs.args:
-                # avoids instance 'self' param
-                if arg_name == 'self':
-                    inst = copy_args.pop(0)
-                    function_class_type = inst.__class__
-                    continue
-
-                if copy_args:
-                    all_args[arg_name] = copy_args.pop(0)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # key of the call is made of argument names and values (with defaults), instance 'self' is skipped
+            bound_args = signature.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            all_args = sorted((k, v) for k, v in bound_args.arguments.items() if k != 'self')
+            idx = str([func.__module__, func.__qualname__, all_args])
+            key = hashlib.sha256(idx.encode('utf8')).hexdigest()
 
-            all_args.update(kwargs)
-            all_args = ([(k, v) for k, v in all_args.items()])
-            all_args = sorted(all_args)
-            os.makedirs(path, exist_ok=True)
-            hash_ = hashlib.sha256()
-            idx = str([func.__module__, func.__name__, function_class_type,  all_args])
-            hash_.update(idx.encode('utf8'))
-            key = hash_.hexdigest()
-            filename = key + '.p'
-            if filename in os.listdir(path):
+            try:
+                res = pickle.loads(get_cache().get(key))
                 logger.info('Reading from cache')
-                logger.warning("The output might be changed after being cached")
-                with open(os.path.join(path, filename), 'rb') as f:
-                    res = pickle.load(f)
-            else:
-                res = func(*args, **kwargs)
-                # print('Writing to cache')
-                with open(os.path.join(path, filename), 'wb') as f:
-                    pickle.dump(res, f)
+                return res
+            except KeyError:
+                pass
+            res = func(*args, **kwargs)
+            get_cache().set(key, pickle.dumps(res))
             return res
         return wrapper
     return decorator
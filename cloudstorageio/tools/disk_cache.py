@@ -0,0 +1,223 @@
+""" Bounded on-disk cache of bytes values, shared between threads and processes
+
+    DiskCache keeps each value in its own file and an index of them in a SQLite database (in the same folder).
+        Lookup is a primary key query, values are written to temporary files and renamed, so readers never see
+        partial files. Entries expire after their TTL, least recently used ones are evicted when the total size
+        exceeds max_size. SQLite transactions keep the index consistent between processes
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from typing import Optional
+
+from cloudstorageio.tools.ci_collections import get_cache_dir
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024  # 1 GB
+COMPRESS_MIN_SIZE = 64 * 1024  # smaller values are not worth compressing
+
+
+class DiskCache:
+    """Key-value cache of bytes in a local folder, with TTL and LRU eviction by total size"""
+    INDEX_FILE_NAME = 'index.sqlite'
+    EVICTION_BATCH_SIZE = 100
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = DEFAULT_MAX_SIZE,
+                 ttl: Optional[float] = None, compress: Optional[bool] = False):
+        """Initializes DiskCache instance, creates the folder and its index if they do not exist
+        :param cache_dir: folder of the cache (by default get_cache_dir())
+        :param max_size: maximum total size of values in bytes
+        :param ttl: seconds each value is kept by default (None - till it is evicted)
+        :param compress: compress values bigger than COMPRESS_MIN_SIZE with zlib
+        """
+        self.cache_dir = get_cache_dir(cache_dir)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.compress = compress
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(self.cache_dir, self.INDEX_FILE_NAME), timeout=30,
+                                           check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, file_name TEXT, '
+                                     'size INTEGER, expires REAL, accessed REAL, compressed INTEGER)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS total (size INTEGER)')
+            self._connection.execute('INSERT INTO total SELECT 0 WHERE NOT EXISTS (SELECT * FROM total)')
+
+    def _execute(self, *queries: tuple) -> list:
+        """Runs given (query, params) pairs in one write transaction, returns rows of the first one"""
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                rows = [self._connection.execute(query, params).fetchall() for query, params in queries][0]
+                self._connection.execute('COMMIT')
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+        return rows
+
+    def _file_path(self, file_name: str) -> str:
+        return os.path.join(self.cache_dir, file_name)
+
+    def _remove_files(self, file_names: list):
+        for file_name in file_names:
+            try:
+                os.remove(self._file_path(file_name))
+            except OSError:  # already removed by another process, or still open on Windows
+                pass
+
+    def _lookup(self, key: str) -> Optional[tuple]:
+        """Returns (file_name, compressed) of given key and marks it as recently used, None if it is missing"""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute('SELECT file_name, expires, compressed FROM entries WHERE key = ?',
+                                           (key,)).fetchone()
+        if row is None:
+            return None
+        file_name, expires, compressed = row
+        if expires is not None and expires < now:
+            self._delete(key, file_name)
+            return None
+        with self._lock:
+            self._connection.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        return file_name, compressed
+
+    def get(self, key: str) -> bytes:
+        """Returns value of given key
+        :raises KeyError: if the key is missing or expired
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            raise KeyError(key)
+        file_name, compressed = entry
+        try:
+            with open(self._file_path(file_name), 'rb') as f:
+                value = f.read()
+        except FileNotFoundError:  # evicted by another process meanwhile
+            raise KeyError(key)
+        return zlib.decompress(value) if compressed else value
+
+    def get_file_path(self, key: str) -> Optional[str]:
+        """Returns path of the file keeping uncompressed value of given key, None if it is missing
+        The file is never changed in place, it could be read (or memory mapped) while it exists
+        """
+        entry = self._lookup(key)
+        if entry is None or entry[1]:
+            return None
+        return self._file_path(entry[0])
+
+    def _commit_file(self, key: str, tmp_path: str, size: int, compressed: bool, ttl: Optional[float]):
+        """Renames written temporary file to its final name and adds it to the index"""
+        file_name = f'{uuid.uuid4().hex}.bin'
+        os.replace(tmp_path, self._file_path(file_name))
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires = now + ttl if ttl is not None else None
+        try:
+            rows = self._execute(
+                ('SELECT file_name FROM entries WHERE key = ?', (key,)),
+                ('UPDATE total SET size = size - IFNULL((SELECT size FROM entries WHERE key = ?), 0) + ?', (key, size)),
+                ('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                 (key, file_name, size, expires, now, int(compressed))))
+        except BaseException:
+            self._remove_files([file_name])
+            raise
+        self._remove_files([row[0] for row in rows])
+        self._evict()
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """Keeps given value, replacing the old one
+        :param ttl: seconds the value is kept (by default ttl of DiskCache)
+        """
+        compressed = self.compress and len(value) >= COMPRESS_MIN_SIZE
+        if compressed:
+            value = zlib.compress(value)
+        tmp_path = self.create_temp_file()
+        with open(tmp_path, 'wb') as f:
+            f.write(value)
+        self._commit_file(key, tmp_path, len(value), compressed, ttl)
+
+    def create_temp_file(self) -> str:
+        """Creates a temporary file in cache folder, to be filled and passed to set_file"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        return tmp_path
+
+    def set_file(self, key: str, tmp_path: str, ttl: Optional[float] = None):
+        """Moves given temporary file (see create_temp_file) into the cache as uncompressed value of given key"""
+        self._commit_file(key, tmp_path, os.path.getsize(tmp_path), False, ttl)
+
+    def _delete(self, key: str, file_name: Optional[str] = None):
+        """Removes given key, only if its value is kept in given file (not replaced by another process meanwhile)"""
+        condition = 'key = ? AND file_name = ?' if file_name else 'key = ?'
+        params = (key, file_name) if file_name else (key,)
+        rows = self._execute((f'SELECT file_name FROM entries WHERE {condition}', params),
+                             (f'UPDATE total SET size = size - IFNULL((SELECT size FROM entries WHERE {condition}), 0)',
+                              params),
+                             (f'DELETE FROM entries WHERE {condition}', params))
+        self._remove_files([row[0] for row in rows])
+
+    def delete(self, key: str):
+        """Removes given key if it exists"""
+        self._delete(key)
+
+    def _evict(self):
+        """Removes expired entries and least recently used ones, till total size is at most max_size"""
+        now = time.time()
+        rows = self._execute(
+            ('SELECT file_name FROM entries WHERE expires < ?', (now,)),
+            ('UPDATE total SET size = size - IFNULL((SELECT SUM(size) FROM entries WHERE expires < ?), 0)', (now,)),
+            ('DELETE FROM entries WHERE expires < ?', (now,)))
+        self._remove_files([row[0] for row in rows])
+        while True:
+            with self._lock:
+                # entries are selected and removed in one transaction, so concurrent processes do not evict twice
+                self._connection.execute('BEGIN IMMEDIATE')
+                try:
+                    excess = self._connection.execute('SELECT size FROM total').fetchone()[0] - self.max_size
+                    rows = list()
+                    if excess > 0:
+                        for row in self._connection.execute('SELECT key, file_name, size FROM entries '
+                                                            'ORDER BY accessed LIMIT ?',
+                                                            (self.EVICTION_BATCH_SIZE,)).fetchall():
+                            if excess <= 0:
+                                break
+                            rows.append(row)
+                            excess -= row[2]
+                    self._connection.executemany('DELETE FROM entries WHERE key = ?', [row[:1] for row in rows])
+                    self._connection.execute('UPDATE total SET size = size - ?', (sum(row[2] for row in rows),))
+                    self._connection.execute('COMMIT')
+                except BaseException:
+                    self._connection.execute('ROLLBACK')
+                    raise
+            if not rows:
+                break
+            self._remove_files([row[1] for row in rows])
+
+    @property
+    def size(self) -> int:
+        """Total size of kept values in bytes"""
+        with self._lock:
+            return self._connection.execute('SELECT size FROM total').fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._connection.execute('SELECT expires FROM entries WHERE key = ?', (key,)).fetchone()
+        return row is not None and (row[0] is None or row[0] >= time.time())
+
+    def clear(self):
+        """Removes all entries"""
+        rows = self._execute(('SELECT file_name FROM entries', ()),
+                             ('UPDATE total SET size = 0', ()),
+                             ('DELETE FROM entries', ()))
+        self._remove_files([row[0] for row in rows])
+
+    def close(self):
+        self._connection.close()
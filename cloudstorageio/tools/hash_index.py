@@ -0,0 +1,127 @@
+""" Persistent index of local files' digests
+
+    LocalHashIndex keeps md5, crc32c and dropBox content hash of local files in a SQLite database.
+        Each row is keyed by the file path and valid while the file's inode, size and modification time are the same,
+        so unchanged files are never read again. Changed files are hashed on a thread pool
+        (hashlib releases the GIL while hashing big blocks, so threads read and hash files in parallel)
+"""
+import base64
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, NamedTuple, Optional
+
+from cloudstorageio.tools.ci_collections import get_cache_dir
+
+try:
+    import google_crc32c
+except ImportError:  # crc32c is optional, it is installed with google-cloud-storage
+    google_crc32c = None
+
+DROPBOX_HASH_BLOCK_SIZE = 4 * 1024 * 1024  # dropBox content hash is computed over 4 MB blocks
+
+
+class FileHashes(NamedTuple):
+    """Digests of a file in the formats used by storages"""
+    md5: str  # hex digest
+    content_hash: str  # dropBox content hash
+    crc32c: Optional[str] = None  # base64 of big-endian crc32c (google cloud storage format), None if not installed
+
+
+def compute_hashes(path: str) -> FileHashes:
+    """Reads given file once and computes all of its digests"""
+    md5 = hashlib.md5()
+    block_hashes = hashlib.sha256()
+    crc = google_crc32c.Checksum() if google_crc32c is not None else None
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(DROPBOX_HASH_BLOCK_SIZE), b''):
+            md5.update(block)
+            block_hashes.update(hashlib.sha256(block).digest())
+            if crc is not None:
+                crc.update(block)
+    crc32c = base64.b64encode(crc.digest()).decode() if crc is not None else None
+    return FileHashes(md5=md5.hexdigest(), content_hash=block_hashes.hexdigest(), crc32c=crc32c)
+
+
+class LocalHashIndex:
+    """SQLite index of local files' digests, shared between threads and processes using the same cache folder"""
+    FILE_NAME = 'local_hashes.sqlite'
+    QUERY_BATCH_SIZE = 500  # sqlite limits amount of query parameters
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        """Initializes LocalHashIndex instance, creates database if it does not exist
+        :param cache_dir: folder of the database (see get_cache_dir)
+        :param max_workers: amount of hashing threads (by default cpu count)
+        """
+        cache_dir = get_cache_dir(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, self.FILE_NAME)
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None  # created on the first call with several changed files and reused
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, inode INTEGER, '
+                                     'size INTEGER, mtime_ns INTEGER, md5 TEXT, content_hash TEXT, crc32c TEXT)')
+
+    def _lookup(self, paths: list) -> dict:
+        """Returns path -> (inode, size, mtime_ns, md5, content_hash, crc32c) of indexed paths"""
+        rows = dict()
+        with self._lock:
+            for idx in range(0, len(paths), self.QUERY_BATCH_SIZE):
+                batch = paths[idx:idx + self.QUERY_BATCH_SIZE]
+                query = 'SELECT * FROM hashes WHERE path IN ({})'.format(','.join('?' * len(batch)))
+                for row in self._connection.execute(query, batch):
+                    rows[row[0]] = row[1:]
+        return rows
+
+    def _store(self, rows: list):
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+            return self._executor
+
+    def get_hashes(self, paths: Iterable[str], stats: Optional[dict] = None) -> dict:
+        """Returns digests of given local files, only new or changed files are read
+        :param paths: local file paths
+        :param stats: absolute path -> os.stat_result of given files, if they are already known (not stat-ed again)
+        :return: absolute path -> FileHashes
+        """
+        stats = stats or dict()
+        stats = {path: stats.get(path) or os.stat(path) for path in map(os.path.abspath, paths)}
+        indexed = self._lookup(list(stats))
+
+        result = dict()
+        changed = list()
+        for path, st in stats.items():
+            row = indexed.get(path)
+            if row is not None and tuple(row[:3]) == (st.st_ino, st.st_size, st.st_mtime_ns) and \
+                    (row[5] is not None or google_crc32c is None):
+                result[path] = FileHashes(*row[3:])
+            else:
+                changed.append(path)
+
+        if len(changed) > 1:
+            hashes = list(self._get_executor().map(compute_hashes, changed))
+        else:
+            hashes = [compute_hashes(path) for path in changed]
+
+        rows = list()
+        for path, file_hashes in zip(changed, hashes):
+            st = stats[path]
+            result[path] = file_hashes
+            rows.append((path, st.st_ino, st.st_size, st.st_mtime_ns) + tuple(file_hashes))
+        if rows:
+            self._store(rows)
+        return result
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._connection.close()
@@ -0,0 +1,153 @@
+""" In-memory cache of storage metadata (isfile, isdir, stat, listdir results)
+
+    MetadataCache is a bounded LRU cache shared by threads of one CloudInterface.
+        Each entry expires after the TTL of its storage, missing paths are cached too (negative caching).
+        Entries of written, copied or removed paths and of their parent folders are dropped by CloudInterface,
+        changes made by other processes are visible only after the TTL
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from cloudstorageio.enums import PrefixEnums
+
+# seconds, local paths are not cached (their metadata calls are cheap and do not go over network)
+DEFAULT_TTL = {
+    PrefixEnums.S3.value: 60,
+    PrefixEnums.GOOGLE_CLOUD.value: 60,
+    PrefixEnums.DROPBOX.value: 60,
+    PrefixEnums.GOOGLE_DRIVE.value: 60,
+}
+
+
+class MetadataCache:
+    """LRU cache of metadata call results, keyed by path, method name and its arguments"""
+    DEFAULT_MAX_ENTRIES = 10000
+
+    def __init__(self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES, ttl: Optional[dict] = None):
+        """Initializes MetadataCache instance
+        :param max_entries: maximum amount of kept results, least recently used ones are dropped first
+        :param ttl: storage prefix (e.g. 's3://') -> seconds, overrides DEFAULT_TTL, 0 disables caching of storage
+        """
+        self.max_entries = max_entries
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self._entries = OrderedDict()  # (path, name, args) -> (value, expiration time)
+        self._path_keys = dict()  # path -> keys of its entries
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _format_path(path: str) -> str:
+        return path.strip().rstrip('/')
+
+    def get_ttl(self, path: str) -> float:
+        """Returns TTL of given path's storage"""
+        for prefix, ttl in self.ttl.items():
+            if path.strip().startswith(prefix):
+                return ttl
+        return 0
+
+    def get(self, path: str, name: str, args: Optional[tuple] = ()):
+        """Returns cached result of given call
+        :raises KeyError: if the result is not cached or expired
+        :raises FileNotFoundError/NotADirectoryError: if the call failed with it (copy of cached error)
+        """
+        key = (self._format_path(path), name, args)
+        with self._lock:
+            value, expires = self._entries[key]
+            if expires < time.monotonic():
+                self._remove_key(key)
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+        if isinstance(value, Exception):
+            raise type(value)(*value.args)
+        return value
+
+    def set(self, path: str, name: str, value, args: Optional[tuple] = ()):
+        """Keeps result (or missing path error) of given call till TTL of the path's storage"""
+        ttl = self.get_ttl(path)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        path = self._format_path(path)
+        key = (path, name, args)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            self._path_keys.setdefault(path, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove_key(next(iter(self._entries)))
+
+    def _remove_key(self, key: tuple):
+        self._entries.pop(key, None)
+        keys = self._path_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._path_keys[key[0]]
+
+    def _remove_path(self, path: str):
+        for key in list(self._path_keys.get(path, ())):
+            self._remove_key(key)
+
+    def invalidate(self, path: str, recursive: Optional[bool] = False):
+        """Drops entries of given path and its parent folders
+        :param path: written, copied or removed path
+        :param recursive: drop entries of paths under given one too (path was a removed folder)
+        """
+        path = self._format_path(path)
+        with self._lock:
+            self._remove_path(path)
+            child, parent = path, os.path.dirname(path)
+            while parent and parent != child:
+                self._remove_path(parent)
+                child, parent = parent, os.path.dirname(parent)
+            if recursive:
+                prefix = path + '/'
+                for child in [p for p in self._path_keys if p.startswith(prefix)]:
+                    self._remove_path(child)
+
+    def clear(self):
+        """Drops all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._path_keys.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        """Entries and lock are not copied to other processes"""
+        return {'max_entries': self.max_entries, 'ttl': self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(max_entries=state['max_entries'], ttl=state['ttl'])
+
+
+class ClosingWriter:
+    """Proxy of a writable file object, which calls on_close after the file is closed (or its `with` block exits)
+    All other attributes (write, upload, abort, ...) are taken from the file object
+    """
+
+    def __init__(self, writer, on_close: Callable):
+        self._writer = writer
+        self._on_close = on_close
+
+    def __getattr__(self, name: str):
+        return getattr(self._writer, name)
+
+    def close(self):
+        try:
+            self._writer.close()
+        finally:
+            self._on_close()
+
+    def __enter__(self):
+        self._writer.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            return self._writer.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._on_close()
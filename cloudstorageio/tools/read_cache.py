@@ -0,0 +1,81 @@
+""" Content-addressed local disk cache of remote objects
+
+    ReadCache keeps downloaded objects in a DiskCache, keyed by the object path and its ETag (or generation),
+        so a changed object never matches an old copy. The ETag of each path is remembered for the validation TTL,
+        during which cached content is served without any request. Files are populated through temporary files
+        and renamed, so processes sharing the cache folder only see complete objects
+"""
+import hashlib
+import os
+from typing import Optional
+
+from cloudstorageio.tools.ci_collections import get_cache_dir
+from cloudstorageio.tools.disk_cache import DiskCache
+
+DEFAULT_READ_CACHE_SIZE = 10 * 1024 * 1024 * 1024  # 10 GB
+DEFAULT_VALIDATION_TTL = 0  # seconds, by default ETag is checked on each read
+
+
+class ReadCache:
+    """Read-through cache of remote objects' content in a local folder"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = DEFAULT_READ_CACHE_SIZE,
+                 validation_ttl: Optional[float] = DEFAULT_VALIDATION_TTL):
+        """Initializes ReadCache instance
+        :param cache_dir: parent folder of the cache (see get_cache_dir), objects are kept in its `objects` folder
+        :param max_size: maximum total size of cached objects in bytes, least recently used ones are evicted
+        :param validation_ttl: seconds a validated ETag is trusted without requests to the storage
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.validation_ttl = validation_ttl
+        self._disk_cache = DiskCache(os.path.join(get_cache_dir(cache_dir), 'objects'), max_size=max_size)
+
+    @staticmethod
+    def _content_key(path: str, etag: str) -> str:
+        return hashlib.sha256(f'{path}\0{etag}'.encode('utf8')).hexdigest()
+
+    @staticmethod
+    def _etag_key(path: str) -> str:
+        return 'etag:' + hashlib.sha256(path.encode('utf8')).hexdigest()
+
+    def get_validated_etag(self, path: str) -> Optional[str]:
+        """Returns ETag of given path validated within validation_ttl, None if there is no such"""
+        if self.validation_ttl <= 0:
+            return None
+        try:
+            return self._disk_cache.get(self._etag_key(path)).decode('utf8')
+        except KeyError:
+            return None
+
+    def set_validated_etag(self, path: str, etag: str):
+        """Remembers ETag of given path for validation_ttl"""
+        if self.validation_ttl > 0:
+            self._disk_cache.set(self._etag_key(path), etag.encode('utf8'), ttl=self.validation_ttl)
+
+    def get_file_path(self, path: str, etag: str) -> Optional[str]:
+        """Returns local file keeping content of given object version, None if it is not cached"""
+        return self._disk_cache.get_file_path(self._content_key(path, etag))
+
+    def create_temp_file(self) -> str:
+        """Creates a temporary file in cache folder, to be filled with object content and passed to add_file"""
+        return self._disk_cache.create_temp_file()
+
+    def add_file(self, path: str, etag: str, tmp_path: str) -> Optional[str]:
+        """Moves given filled temporary file into the cache as content of given object version
+        :return: local file keeping the content, None if it is already evicted (object is bigger than the cache)
+        """
+        self._disk_cache.set_file(self._content_key(path, etag), tmp_path)
+        return self.get_file_path(path, etag)
+
+    def forget(self, path: str):
+        """Drops validated ETag of given path (it is written or removed by this process)"""
+        if self.validation_ttl > 0:
+            self._disk_cache.delete(self._etag_key(path))
+
+    def __getstate__(self):
+        """Index connection is not copied to other processes, each process opens its own one"""
+        return {'cache_dir': self.cache_dir, 'max_size': self.max_size, 'validation_ttl': self.validation_ttl}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
@@ -0,0 +1,373 @@
+""" Stream classes shared by storage interfaces
+
+    RangeReader is a seekable raw stream, which fetches object content by byte ranges.
+        Content is fetched in blocks, blocks are kept in a bounded cache
+        and on sequential reading the next blocks are prefetched in background
+
+    ChunkedWriter is a writable raw stream, which buffers written content into fixed size chunks.
+        Each full chunk is uploaded while the caller keeps writing,
+        the upload is completed on close and aborted if the `with` block fails
+
+    MmapReader is a seekable raw stream over a memory mapped local file
+
+    copy_stream copies one stream into another, the next chunks are read in background while the current one is written
+"""
+import io
+import mmap
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Union
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024  # 8 MB
+DEFAULT_READAHEAD = 2  # blocks
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB
+DEFAULT_COPY_BUFFERS = 4  # chunks
+
+
+class RangeReader(io.RawIOBase):
+    """Seekable, readable raw stream over a remote object of known size
+    Subclasses implement _fetch_range, which returns bytes of the given (inclusive) range
+    """
+
+    def __init__(self, size: int, name: Optional[str] = None, block_size: Optional[int] = DEFAULT_BLOCK_SIZE,
+                 readahead: Optional[int] = DEFAULT_READAHEAD, cache_blocks: Optional[int] = None):
+        """Initializes RangeReader instance
+        :param size: size of the object in bytes
+        :param name: name (full path) of the object
+        :param block_size: size of each fetched range in bytes
+        :param readahead: amount of blocks prefetched in background on sequential reading (0 for no prefetch)
+        :param cache_blocks: amount of blocks kept in memory (by default readahead + 2)
+        """
+        super().__init__()
+        if block_size <= 0:
+            raise ValueError('block_size should be positive')
+
+        self.name = name
+        self._size = size
+        self._block_size = block_size
+        self._readahead = max(readahead or 0, 0)
+        self._cache_blocks = max(cache_blocks or self._readahead + 2, 1)
+        self._position = 0
+        self._last_block_idx = None
+        self._blocks = OrderedDict()  # block index -> bytes or Future of bytes
+        self._executor = ThreadPoolExecutor(max_workers=self._readahead) if self._readahead else None
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        """Returns content of the object from start to end (both inclusive)"""
+        raise NotImplementedError
+
+    def _fetch_block(self, block_idx: int) -> bytes:
+        start = block_idx * self._block_size
+        end = min(start + self._block_size, self._size) - 1
+        return self._fetch_range(start, end)
+
+    def _block_count(self) -> int:
+        return (self._size + self._block_size - 1) // self._block_size
+
+    def _prefetch(self, block_idx: int):
+        """Schedules background fetching of the blocks after given one"""
+        for idx in range(block_idx + 1, min(block_idx + 1 + self._readahead, self._block_count())):
+            if idx not in self._blocks:
+                self._blocks[idx] = self._executor.submit(self._fetch_block, idx)
+
+    def _evict(self, keep_idx: int):
+        """Drops the least recently used blocks above the cache limit"""
+        while len(self._blocks) > max(self._cache_blocks, self._readahead + 1):
+            idx, block = next(iter(self._blocks.items()))
+            if idx == keep_idx:
+                self._blocks.move_to_end(idx)
+                continue
+            del self._blocks[idx]
+            if isinstance(block, Future):
+                block.cancel()
+
+    def _get_block(self, block_idx: int) -> bytes:
+        block = self._blocks.get(block_idx)
+        if block is None:
+            block = self._fetch_block(block_idx)
+        elif isinstance(block, Future):
+            block = block.result()
+        self._blocks[block_idx] = block
+        self._blocks.move_to_end(block_idx)
+
+        sequential = self._last_block_idx is None or block_idx == self._last_block_idx + 1
+        if self._executor is not None and sequential:
+            self._prefetch(block_idx)
+        self._last_block_idx = block_idx
+        self._evict(keep_idx=block_idx)
+        return block
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f'Invalid whence ({whence})')
+        if position < 0:
+            raise ValueError(f'Negative seek position {position}')
+        self._position = position
+        return self._position
+
+    def readinto(self, b: Union[bytearray, memoryview]) -> int:
+        self._checkClosed()
+        view = memoryview(b).cast('B')
+        written = 0
+        while written < len(view) and self._position < self._size:
+            block_idx = self._position // self._block_size
+            block = self._get_block(block_idx)
+            offset = self._position - block_idx * self._block_size
+            n = min(len(view) - written, len(block) - offset)
+            if n <= 0:
+                break
+            view[written:written + n] = block[offset:offset + n]
+            written += n
+            self._position += n
+        return written
+
+    def readall(self) -> bytes:
+        self._checkClosed()
+        res = bytearray(max(self._size - self._position, 0))
+        n = self.readinto(res)
+        return bytes(res[:n])
+
+    def close(self):
+        if not self.closed:
+            for block in self._blocks.values():
+                if isinstance(block, Future):
+                    block.cancel()
+            self._blocks.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+        super().close()
+
+
+class MmapReader(io.RawIOBase):
+    """Seekable, readable raw stream over a memory mapped local file (e.g. a file of the read cache)
+    Pages are read by the operating system on access and shared between processes mapping the same file
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.name = path
+        self._size = os.path.getsize(path)
+        self._mmap = None
+        if self._size:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._size + offset
+        else:
+            raise ValueError(f'Invalid whence ({whence})')
+        self._pos = max(self._pos, 0)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        end = min(self._pos + len(buffer), self._size)
+        if end <= self._pos:
+            return 0
+        buffer[:end - self._pos] = self._mmap[self._pos:end]
+        read_size = end - self._pos
+        self._pos = end
+        return read_size
+
+    def readall(self) -> bytes:
+        content = self._mmap[self._pos:] if self._mmap is not None else b''
+        self._pos = self._size
+        return content
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        super().close()
+
+
+class ChunkedWriter(io.RawIOBase):
+    """Writable raw stream, which uploads written content chunk by chunk
+    Subclasses implement _upload_chunk for each full chunk, _complete for the rest of content and _abort
+    """
+
+    def __init__(self, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE, name: Optional[str] = None,
+                 encoding: Optional[str] = 'utf8'):
+        """Initializes ChunkedWriter instance
+        :param chunk_size: size of each uploaded chunk in bytes
+        :param name: name (full path) of the object
+        :param encoding: encoding of written strings
+        """
+        super().__init__()
+        if chunk_size <= 0:
+            raise ValueError('chunk_size should be positive')
+
+        self.name = name
+        self._chunk_size = chunk_size
+        self._encoding = encoding
+        self._buffer = bytearray()
+        self._position = 0
+        self._aborted = False
+
+    def _upload_chunk(self, chunk: bytes):
+        """Uploads next full chunk of the content"""
+        raise NotImplementedError
+
+    def _complete(self, last_chunk: bytes):
+        """Uploads the rest of the content (could be empty) and finishes the upload"""
+        raise NotImplementedError
+
+    def _abort(self):
+        """Cancels the started upload"""
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def write(self, content: Union[str, bytes, bytearray, memoryview, io.IOBase]) -> int:
+        """Buffers given content and uploads each filled chunk
+        :param content: string (encoded with stream encoding), bytes-like or readable file object
+        :return: amount of written bytes
+        """
+        self._checkClosed()
+        if isinstance(content, str):
+            content = content.encode(self._encoding)
+        if hasattr(content, 'read'):
+            # text streams return '' at the end, their chunks are encoded by the recursive call
+            written = 0
+            while True:
+                data = content.read(self._chunk_size)
+                if not data:
+                    return written
+                written += self.write(data)
+
+        content = memoryview(content).cast('B')
+        self._buffer += content
+        self._position += len(content)
+        while len(self._buffer) >= self._chunk_size:
+            chunk = bytes(self._buffer[:self._chunk_size])
+            del self._buffer[:self._chunk_size]
+            self._upload_chunk(chunk)
+        return len(content)
+
+    def abort(self):
+        """Cancels the upload, nothing is written to the storage"""
+        if not self.closed:
+            self._aborted = True
+            try:
+                self._abort()
+            finally:
+                self._buffer = bytearray()
+                super().close()
+
+    def close(self):
+        """Uploads the rest of the content and finishes the upload"""
+        if not self.closed:
+            try:
+                self._complete(bytes(self._buffer))
+            except BaseException:
+                self.abort()
+                raise
+            self._buffer = bytearray()
+            super().close()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def open_reader(raw: io.RawIOBase, mode: Optional[str] = None, encoding: Optional[str] = 'utf8') -> io.IOBase:
+    """Wraps given raw stream into buffered (binary) or text stream, depending on mode"""
+    buffered = io.BufferedReader(raw)
+    if mode is not None and 'b' not in mode:
+        return io.TextIOWrapper(buffered, encoding=encoding)
+    return buffered
+
+
+def copy_stream(reader: io.IOBase, writer: io.IOBase, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+                buffers: Optional[int] = DEFAULT_COPY_BUFFERS) -> int:
+    """Copies content of readable stream into writable stream
+    A background thread reads chunks into a bounded queue, while the calling thread writes them,
+    so download and upload overlap and at most `buffers` chunks wait in memory
+    :param reader: readable stream (read(size) is called)
+    :param writer: writable stream (write(chunk) is called)
+    :param chunk_size: size of each read chunk in bytes
+    :param buffers: amount of read chunks, which could wait for writing
+    :return: amount of copied bytes
+    """
+    chunks = queue.Queue(maxsize=max(buffers, 1))
+    stop = threading.Event()
+
+    def _put(item):
+        # waits for a free buffer, unless the writing side has stopped
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _read():
+        try:
+            for chunk in iter(lambda: reader.read(chunk_size), b''):
+                if stop.is_set():
+                    return
+                _put(chunk)
+            _put(None)
+        except BaseException as e:
+            _put(e)
+
+    thread = threading.Thread(target=_read, daemon=True)
+    thread.start()
+    written = 0
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            writer.write(chunk)
+            written += len(chunk)
+    finally:
+        stop.set()
+        thread.join()
+    return written
@@ -25,9 +25,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/VahagnGhaz/cloudstorageio",
-    packages=find_packages(exclude=['contrib', 'docs', 'cloudstorageio.log', 'venv', 'cloudstorageio.tests',
-                                    'cloudstorageio.tests.resources', 'cloudstorageio.tests.interface',
-                                    'cloudstorageio.log']),
+    packages=find_packages(exclude=['contrib', 'docs', 'cloudstorageio.log', 'venv', '*.tests', '*.tests.*']),
     classifiers=[
         # Indicate who your project is intended for
         'Intended Audience :: Developers',